@@ -5,28 +5,36 @@ Handles all API routes with Clerk JWT authentication
 
 import os
 import json
+import asyncio
 import logging
+from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from decimal import Decimal
 import uuid
 
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, status, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field, ValidationError
 import boto3
 from mangum import Mangum
 from dotenv import load_dotenv
 from fastapi_clerk_auth import ClerkConfig, ClerkHTTPBearer, HTTPAuthorizationCredentials
 
-from src import Database
+from src import AsyncDatabase, QueryCache
+from src.events import TERMINAL_EVENTS
+from src.keepwarm import start_from_env
+from src.pagination import InvalidCursor
+from src.responses import CachedResponse, ResponseCache, etag_matches, make_etag
 from src.schemas import (
     UserCreate,
     AccountCreate,
     PositionCreate,
     JobCreate, JobUpdate,
-    JobType, JobStatus
+    JobType, JobStatus,
+    JOB_COMPLETED, FINISHED_JOB_STATUSES
 )
 
 # Load environment variables
@@ -52,6 +60,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # The accounts list is a bare array, so its next-page cursor travels in a header
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Custom exception handlers for better error messages
@@ -91,8 +101,57 @@ async def general_exception_handler(request: Request, exc: Exception):
         content={"detail": "An unexpected error occurred. Our team has been notified."}
     )
 
-# Initialize services
-db = Database()
+# Initialize services (async wrapper so Aurora calls never block the event loop)
+# Profiles are cached briefly across requests; writes through this process drop them at once
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+db = AsyncDatabase(user_cache=QueryCache(maxsize=1024, ttl=USER_CACHE_TTL_SECONDS))
+# Optional keep-warm thread for long-running deployments (DB_KEEP_WARM_SECONDS)
+keep_warm = start_from_env(db.sync.client)
+DB_REQUEST_DEADLINE_SECONDS = float(os.getenv("DB_REQUEST_DEADLINE_SECONDS", "20"))
+
+# Serialized, precompressed bodies of versioned responses (the instrument list, finished jobs)
+response_cache = ResponseCache()
+INSTRUMENTS_CACHE_CONTROL = "private, max-age=60"
+COMPLETED_JOB_CACHE_CONTROL = "private, max-age=3600"
+REVALIDATE_JOB_CACHE_CONTROL = "private, no-cache"
+
+
+def serialize_json(content: Any) -> bytes:
+    """Encode content exactly as a JSON response returned from a route would be"""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"})
+
+
+def cached_json_response(request: Request, cached: CachedResponse, cache_control: str) -> Response:
+    """Serve a precomputed response: 304 when the client's copy is current, else the best encoding it accepts"""
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return not_modified(cached.etag, cache_control)
+    body, encoding = cached.encoded(request.headers.get("accept-encoding"))
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=cached.media_type, headers=headers)
+
+@app.middleware("http")
+async def database_stats_middleware(request: Request, call_next):
+    """Report Aurora time per request and flag repeated statements (likely N+1 queries)"""
+    # Stop waiting on a resuming cluster before API Gateway's 29s timeout does
+    with db.instrumentation.scope() as stats, db.sync.client.deadline(DB_REQUEST_DEADLINE_SECONDS):
+        response = await call_next(request)
+    summary = stats.summary(top=0)
+    if summary["statements"]:
+        response.headers["Server-Timing"] = (
+            f'db;dur={summary["total_ms"]:.1f};desc="{summary["statements"]} statements"'
+        )
+    for hotspot in summary["hotspots"]:
+        logger.info(
+            f"{request.method} {request.url.path}: statement ran {hotspot['calls']} times "
+            f"({hotspot['total_ms']:.0f}ms): {hotspot['fingerprint'][:200]}"
+        )
+    return response
 
 # SQS client for job queueing
 sqs_client = boto3.client('sqs', region_name=os.getenv('DEFAULT_AWS_REGION', 'us-east-1'))
@@ -110,6 +169,48 @@ async def get_current_user_id(creds: HTTPAuthorizationCredentials = Depends(cler
     logger.info(f"Authenticated user: {user_id}")
     return user_id
 
+@dataclass
+class Identity:
+    """The caller of one request: Clerk ID, token claims and user row (None until created)"""
+    clerk_user_id: str
+    claims: Dict[str, Any]
+    user: Optional[Dict[str, Any]]
+
+async def get_identity(
+    request: Request,
+    clerk_user_id: str = Depends(get_current_user_id),
+    creds: HTTPAuthorizationCredentials = Depends(clerk_guard)
+) -> Identity:
+    """Resolve the caller's user once per request (kept on request.state)"""
+    identity = getattr(request.state, "identity", None)
+    if identity is None:
+        user = await db.users.find_by_clerk_id(clerk_user_id)
+        identity = Identity(clerk_user_id, creds.decoded, user)
+        request.state.identity = identity
+    return identity
+
+async def get_current_user(identity: Identity = Depends(get_identity)) -> Dict[str, Any]:
+    """The caller's user row; 404 if they haven't been created via GET /api/user yet"""
+    if not identity.user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return identity.user
+
+async def require_account(account_id: str, clerk_user_id: str) -> Dict[str, Any]:
+    """
+    The user's account, else 404 / 403
+
+    Writes scoped to the caller's accounts call this only when they matched
+    nothing, to tell the client why.
+    """
+    account = await db.accounts.find_by_id(account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    # Verify ownership - accounts table stores clerk_user_id directly
+    if account.get('clerk_user_id') != clerk_user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return account
+
 # Request/Response models
 class UserResponse(BaseModel):
     user: Dict[str, Any]
@@ -149,21 +250,17 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 @app.get("/api/user", response_model=UserResponse)
-async def get_or_create_user(
-    clerk_user_id: str = Depends(get_current_user_id),
-    creds: HTTPAuthorizationCredentials = Depends(clerk_guard)
-):
+async def get_or_create_user(identity: Identity = Depends(get_identity)):
     """Get user or create if first time"""
 
+    clerk_user_id = identity.clerk_user_id
     try:
         # Check if user exists
-        user = db.users.find_by_clerk_id(clerk_user_id)
-
-        if user:
-            return UserResponse(user=user, created=False)
+        if identity.user:
+            return UserResponse(user=identity.user, created=False)
 
         # Create new user with defaults from JWT token
-        token_data = creds.decoded
+        token_data = identity.claims
         display_name = token_data.get('name') or token_data.get('email', '').split('@')[0] or "New User"
 
         # Create user with ALL defaults in one operation
@@ -176,11 +273,10 @@ async def get_or_create_user(
             'region_targets': {"north_america": 50, "international": 50}
         }
 
-        # Insert directly with all data
-        created_clerk_id = db.users.db.insert('users', user_data, returning='clerk_user_id')
-
-        # Fetch the created user
-        created_user = db.users.find_by_clerk_id(clerk_user_id)
+        # Insert and read back in one statement; None means a concurrent request created it first
+        created_user = await db.users.create_if_missing(user_data)
+        if created_user is None:
+            return UserResponse(user=await db.users.find_by_clerk_id(clerk_user_id), created=False)
         logger.info(f"Created new user: {clerk_user_id}")
 
         return UserResponse(user=created_user, created=True)
@@ -194,66 +290,58 @@ async def update_user(user_update: UserUpdate, clerk_user_id: str = Depends(get_
     """Update user settings"""
 
     try:
-        # Get user
-        user = db.users.find_by_clerk_id(clerk_user_id)
-
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Update user - users table uses clerk_user_id as primary key
+        # Update user and return the stored row - users table uses clerk_user_id as primary key
         update_data = user_update.model_dump(exclude_unset=True)
-
-        # Use the database client directly since users table has clerk_user_id as PK
-        db.users.db.update(
-            'users',
-            update_data,
-            "clerk_user_id = :clerk_user_id",
-            {'clerk_user_id': clerk_user_id}
-        )
-
-        # Return updated user
-        updated_user = db.users.find_by_clerk_id(clerk_user_id)
+        updated_user = await db.users.update_by_clerk_id(clerk_user_id, update_data)
+        if not updated_user:
+            raise HTTPException(status_code=404, detail="User not found")
         return updated_user
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating user: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/accounts")
-async def list_accounts(clerk_user_id: str = Depends(get_current_user_id)):
-    """List user's accounts"""
+async def list_accounts(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    clerk_user_id: str = Depends(get_current_user_id)
+):
+    """List user's accounts, newest first (all of them unless limit or cursor asks for a page)"""
 
     try:
-        # Get accounts for user
-        accounts = db.accounts.find_by_user(clerk_user_id)
+        if limit is None and cursor is None:
+            return await db.accounts.find_by_user(clerk_user_id)
+
+        # Get one page of accounts for user
+        accounts, next_cursor = await db.accounts.find_page_by_user(clerk_user_id, limit=limit or 100, cursor=cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return accounts
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing accounts: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/accounts")
-async def create_account(account: AccountCreate, clerk_user_id: str = Depends(get_current_user_id)):
+async def create_account(account: AccountCreate, clerk_user_id: str = Depends(get_current_user_id), user: Dict[str, Any] = Depends(get_current_user)):
     """Create new account"""
 
     try:
-        # Verify user exists
-        user = db.users.find_by_clerk_id(clerk_user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Create account
-        account_id = db.accounts.create_account(
+        # Create account, returning the stored row
+        return await db.accounts.create_account(
             clerk_user_id=clerk_user_id,
             account_name=account.account_name,
             account_purpose=account.account_purpose,
-            cash_balance=getattr(account, 'cash_balance', Decimal('0'))
+            cash_balance=getattr(account, 'cash_balance', Decimal('0')),
+            returning='*'
         )
 
-        # Return created account
-        created_account = db.accounts.find_by_id(account_id)
-        return created_account
-
     except Exception as e:
         logger.error(f"Error creating account: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -263,21 +351,11 @@ async def update_account(account_id: str, account_update: AccountUpdate, clerk_u
     """Update account"""
 
     try:
-        # Verify account belongs to user
-        account = db.accounts.find_by_id(account_id)
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-
-        # Verify ownership - accounts table stores clerk_user_id directly
-        if account.get('clerk_user_id') != clerk_user_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-
-        # Update account
+        # Update only if the account belongs to the user, returning the stored row
         update_data = account_update.model_dump(exclude_unset=True)
-        db.accounts.update(account_id, update_data)
-
-        # Return updated account
-        updated_account = db.accounts.find_by_id(account_id)
+        updated_account = await db.accounts.update_for_user(account_id, clerk_user_id, update_data)
+        if not updated_account:
+            await require_account(account_id, clerk_user_id)
         return updated_account
 
     except HTTPException:
@@ -292,7 +370,7 @@ async def delete_account(account_id: str, clerk_user_id: str = Depends(get_curre
 
     try:
         # Verify account belongs to user
-        account = db.accounts.find_by_id(account_id)
+        account = await db.accounts.find_by_id(account_id)
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
 
@@ -300,13 +378,10 @@ async def delete_account(account_id: str, clerk_user_id: str = Depends(get_curre
         if account.get('clerk_user_id') != clerk_user_id:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        # Delete all positions first (due to foreign key constraint)
-        positions = db.positions.find_by_account(account_id)
-        for position in positions:
-            db.positions.delete(position['id'])
-
-        # Delete the account
-        db.accounts.delete(account_id)
+        # Delete positions and the account atomically in one transaction
+        async with db.transaction() as tx:
+            await tx.positions.delete_by_account(account_id)
+            await tx.accounts.delete(account_id)
 
         return {"message": "Account deleted successfully"}
 
@@ -317,12 +392,25 @@ async def delete_account(account_id: str, clerk_user_id: str = Depends(get_curre
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/accounts/{account_id}/positions")
-async def list_positions(account_id: str, clerk_user_id: str = Depends(get_current_user_id)):
-    """Get positions for account"""
+async def list_positions(
+    account_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    clerk_user_id: str = Depends(get_current_user_id)
+):
+    """Get positions for account, by symbol (all of them unless limit or cursor asks for a page)"""
+
+    async def load_positions():
+        if limit is None and cursor is None:
+            return await db.positions.find_by_account(account_id), None
+        return await db.positions.find_page_by_account(account_id, limit=limit or 500, cursor=cursor)
 
     try:
-        # Verify account belongs to user
-        account = db.accounts.find_by_id(account_id)
+        # Load account and positions concurrently; nothing is returned until ownership is verified
+        account, (positions, next_cursor) = await asyncio.gather(
+            db.accounts.find_by_id(account_id),
+            load_positions()
+        )
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
 
@@ -330,22 +418,21 @@ async def list_positions(account_id: str, clerk_user_id: str = Depends(get_curre
         if account.get('clerk_user_id') != clerk_user_id:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        positions = db.positions.find_by_account(account_id)
+        # Get full instrument data for all positions in one lookup
+        instruments = await db.instruments.find_by_symbols([pos['symbol'] for pos in positions])
 
         # Format positions with instrument data for frontend
-        formatted_positions = []
-        for pos in positions:
-            # Get full instrument data
-            instrument = db.instruments.find_by_symbol(pos['symbol'])
-            formatted_positions.append({
-                **pos,
-                'instrument': instrument
-            })
+        formatted_positions = [
+            {**pos, 'instrument': instruments.get(pos['symbol'])}
+            for pos in positions
+        ]
 
-        return {"positions": formatted_positions}
+        return {"positions": formatted_positions, "next_cursor": next_cursor}
 
     except HTTPException:
         raise
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing positions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -355,18 +442,11 @@ async def create_position(position: PositionCreate, clerk_user_id: str = Depends
     """Create position"""
 
     try:
-        # Verify account belongs to user
-        account = db.accounts.find_by_id(position.account_id)
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-
-        # Verify ownership - accounts table stores clerk_user_id directly
-        if account.get('clerk_user_id') != clerk_user_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-
-        # Check if instrument exists, if not create it
-        instrument = db.instruments.find_by_symbol(position.symbol.upper())
+        # Check if instrument exists (from the instrument cache), if not create it
+        instrument = await db.instruments.find_by_symbol(position.symbol.upper())
         if not instrument:
+            # Only a user's own account may add instruments
+            await require_account(position.account_id, clerk_user_id)
             logger.info(f"Creating new instrument: {position.symbol.upper()}")
             # Create a basic instrument entry with default allocations
             # Import the schema from database
@@ -391,17 +471,18 @@ async def create_position(position: PositionCreate, clerk_user_id: str = Depends
                 allocation_asset_class={"equity": 100.0} if instrument_type == "stock" else {"fixed_income": 100.0}
             )
 
-            db.instruments.create_instrument(new_instrument)
+            await db.instruments.create_instrument(new_instrument)
 
-        # Add position
-        position_id = db.positions.add_position(
+        # Add position if the account belongs to the user, returning the stored row
+        created_position = await db.positions.upsert_for_user(
             account_id=position.account_id,
+            clerk_user_id=clerk_user_id,
             symbol=position.symbol.upper(),
             quantity=position.quantity
         )
-
-        # Return created position
-        created_position = db.positions.find_by_id(position_id)
+        if not created_position:
+            await require_account(position.account_id, clerk_user_id)
+            raise HTTPException(status_code=404, detail="Instrument not found")
         return created_position
 
     except HTTPException:
@@ -415,25 +496,14 @@ async def update_position(position_id: str, position_update: PositionUpdate, cle
     """Update position"""
 
     try:
-        # Get position and verify ownership
-        position = db.positions.find_by_id(position_id)
-        if not position:
-            raise HTTPException(status_code=404, detail="Position not found")
-
-        account = db.accounts.find_by_id(position['account_id'])
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-
-        # Verify ownership - accounts table stores clerk_user_id directly
-        if account.get('clerk_user_id') != clerk_user_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-
-        # Update position
+        # Update only if the position's account belongs to the user, returning the stored row
         update_data = position_update.model_dump(exclude_unset=True)
-        db.positions.update(position_id, update_data)
-
-        # Return updated position
-        updated_position = db.positions.find_by_id(position_id)
+        updated_position = await db.positions.update_for_user(position_id, clerk_user_id, update_data)
+        if not updated_position:
+            position = await db.positions.find_by_id(position_id)
+            if not position:
+                raise HTTPException(status_code=404, detail="Position not found")
+            await require_account(position['account_id'], clerk_user_id)
         return updated_position
 
     except HTTPException:
@@ -448,11 +518,11 @@ async def delete_position(position_id: str, clerk_user_id: str = Depends(get_cur
 
     try:
         # Get position and verify ownership
-        position = db.positions.find_by_id(position_id)
+        position = await db.positions.find_by_id(position_id)
         if not position:
             raise HTTPException(status_code=404, detail="Position not found")
 
-        account = db.accounts.find_by_id(position['account_id'])
+        account = await db.accounts.find_by_id(position['account_id'])
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
 
@@ -460,7 +530,7 @@ async def delete_position(position_id: str, clerk_user_id: str = Depends(get_cur
         if account.get('clerk_user_id') != clerk_user_id:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        db.positions.delete(position_id)
+        await db.positions.delete(position_id)
         return {"message": "Position deleted"}
 
     except HTTPException:
@@ -469,47 +539,98 @@ async def delete_position(position_id: str, clerk_user_id: str = Depends(get_cur
         logger.error(f"Error deleting position: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/portfolio/valuation")
+async def get_portfolio_valuation(clerk_user_id: str = Depends(get_current_user_id)):
+    """Current value of the user's portfolio, in total and per account"""
+
+    try:
+        user_valuation, account_valuations = await asyncio.gather(
+            db.valuations.find_by_user(clerk_user_id),
+            db.valuations.find_accounts_by_user(clerk_user_id)
+        )
+        if not user_valuation:
+            raise HTTPException(status_code=404, detail="User not found")
+        return {**user_valuation, "accounts": account_valuations}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting portfolio valuation: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/instruments")
-async def list_instruments(clerk_user_id: str = Depends(get_current_user_id)):
+async def list_instruments(request: Request, clerk_user_id: str = Depends(get_current_user_id)):
     """Get all available instruments for autocomplete"""
 
     try:
-        instruments = db.instruments.find_all()
-        # Return simplified list for autocomplete
-        return [
-            {
-                "symbol": inst["symbol"],
-                "name": inst["name"],
-                "instrument_type": inst["instrument_type"],
-                "current_price": float(inst["current_price"]) if inst.get("current_price") else None
-            }
-            for inst in instruments
-        ]
+        # The body only changes with the instrument table, so it is built once per version
+        version = await db.instruments.version()
+        etag = make_etag("instruments", version)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag, INSTRUMENTS_CACHE_CONTROL)
+
+        async def build() -> CachedResponse:
+            instruments = await db.instruments.find_all()
+            # Return simplified list for autocomplete
+            content = [
+                {
+                    "symbol": inst["symbol"],
+                    "name": inst["name"],
+                    "instrument_type": inst["instrument_type"],
+                    "current_price": float(inst["current_price"]) if inst.get("current_price") else None
+                }
+                for inst in instruments
+            ]
+            return await asyncio.to_thread(lambda: CachedResponse.build(serialize_json(content), etag))
+
+        cached = await response_cache.get_or_build(("instruments", version), build)
+        return cached_json_response(request, cached, INSTRUMENTS_CACHE_CONTROL)
     except Exception as e:
         logger.error(f"Error fetching instruments: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/analyze", response_model=AnalyzeResponse)
-async def trigger_analysis(request: AnalyzeRequest, clerk_user_id: str = Depends(get_current_user_id)):
-    """Trigger portfolio analysis"""
+@app.get("/api/instruments/search")
+async def search_instruments(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    clerk_user_id: str = Depends(get_current_user_id)
+):
+    """Search instruments by symbol or name for autocomplete, one page at a time"""
 
     try:
-        # Get user
-        user = db.users.find_by_clerk_id(clerk_user_id)
+        # One extra row tells us whether there is another page
+        instruments = await db.instruments.search(q, limit=limit + 1, offset=offset)
+        return {
+            "items": [
+                {
+                    "symbol": inst["symbol"],
+                    "name": inst["name"],
+                    "instrument_type": inst["instrument_type"],
+                    "current_price": float(inst["current_price"]) if inst.get("current_price") else None
+                }
+                for inst in instruments[:limit]
+            ],
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if len(instruments) > limit else None
+        }
+    except Exception as e:
+        logger.error(f"Error searching instruments: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+@app.post("/api/analyze", response_model=AnalyzeResponse)
+async def trigger_analysis(request: AnalyzeRequest, clerk_user_id: str = Depends(get_current_user_id), user: Dict[str, Any] = Depends(get_current_user)):
+    """Trigger portfolio analysis"""
 
+    try:
         # Create job
-        job_id = db.jobs.create_job(
+        job_id = await db.jobs.create_job(
             clerk_user_id=clerk_user_id,
             job_type="portfolio_analysis",
             request_payload=request.model_dump()
         )
 
-        # Get the created job
-        job = db.jobs.find_by_id(job_id)
-
         # Send to SQS
         if SQS_QUEUE_URL:
             message = {
@@ -519,7 +640,8 @@ async def trigger_analysis(request: AnalyzeRequest, clerk_user_id: str = Depends
                 'options': request.options
             }
 
-            sqs_client.send_message(
+            await asyncio.to_thread(
+                sqs_client.send_message,
                 QueueUrl=SQS_QUEUE_URL,
                 MessageBody=json.dumps(message)
             )
@@ -537,20 +659,44 @@ async def trigger_analysis(request: AnalyzeRequest, clerk_user_id: str = Depends
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/jobs/{job_id}")
-async def get_job_status(job_id: str, clerk_user_id: str = Depends(get_current_user_id)):
+async def get_job_status(job_id: str, request: Request, clerk_user_id: str = Depends(get_current_user_id)):
     """Get job status and results"""
 
-    try:
-        # Get job
-        job = db.jobs.find_by_id(job_id)
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+    async def render() -> CachedResponse:
+        job = await db.jobs.find_by_id(job_id)
+        # Large payloads live in the payload store; fetch them only for this view
+        job = await db.jobs.resolve_payloads(job)
+        etag = make_etag("job", job_id, job['updated_at'])
+        return await asyncio.to_thread(
+            lambda: CachedResponse.build(serialize_json(job), etag, meta={"owner": job['clerk_user_id']})
+        )
 
-        # Verify job belongs to user - jobs table stores clerk_user_id directly
-        if job.get('clerk_user_id') != clerk_user_id:
+    try:
+        # Completed jobs never change, so once built their response is served from memory
+        cached = response_cache.get(("job", job_id))
+        if cached is None:
+            # Status, owner and updated_at only: enough to answer a revalidation
+            job = await db.jobs.find_summary(job_id)
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+
+            # Verify job belongs to user - jobs table stores clerk_user_id directly
+            if job.get('clerk_user_id') != clerk_user_id:
+                raise HTTPException(status_code=403, detail="Not authorized")
+
+            # Only completed jobs are final; anything else is revalidated on every request
+            completed = job['status'] == JOB_COMPLETED
+            cache_control = COMPLETED_JOB_CACHE_CONTROL if completed else REVALIDATE_JOB_CACHE_CONTROL
+            etag = make_etag("job", job_id, job['updated_at'])
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified(etag, cache_control)
+            if not completed:
+                return cached_json_response(request, await render(), cache_control)
+            cached = await response_cache.get_or_build(("job", job_id), render)
+
+        if cached.meta.get("owner") != clerk_user_id:
             raise HTTPException(status_code=403, detail="Not authorized")
-
-        return job
+        return cached_json_response(request, cached, COMPLETED_JOB_CACHE_CONTROL)
 
     except HTTPException:
         raise
@@ -558,43 +704,131 @@ async def get_job_status(job_id: str, clerk_user_id: str = Depends(get_current_u
         logger.error(f"Error getting job status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Job event streams: how often to look for new events, and how long one
+# response stays open before the browser reconnects with Last-Event-ID
+JOB_EVENTS_POLL_SECONDS = float(os.getenv("JOB_EVENTS_POLL_SECONDS", "1"))
+JOB_EVENTS_STREAM_SECONDS = float(os.getenv("JOB_EVENTS_STREAM_SECONDS", "25"))
+JOB_EVENTS_KEEPALIVE_SECONDS = 15
+# Behind API Gateway + Mangum the response is delivered only once it ends, so
+# there each response ends as soon as it has new events (long polling)
+JOB_EVENTS_BUFFERED = os.getenv("JOB_EVENTS_BUFFERED", str(bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME")))).lower() in ("1", "true", "yes")
+
+
+def format_sse(data: Dict[str, Any], event: str = None, event_id: int = None) -> str:
+    """One server-sent event"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def job_event_stream(job: Dict[str, Any], after: int, request: Request):
+    """Server-sent events for a job's progress, each sent once, ending when the job does"""
+    job_id = str(job['id'])
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + JOB_EVENTS_STREAM_SECONDS
+    last_write = loop.time()
+    yield f"retry: {int(JOB_EVENTS_POLL_SECONDS * 1000)}\n\n"
+
+    while True:
+        events = await db.jobs.events_since(job_id, after)
+        if not events and db.sync.events is None and job['status'] not in FINISHED_JOB_STATUSES:
+            # No event broker configured: watch the job row for its final status instead
+            job = await db.jobs.find_summary(job_id) or job
+        if not events and after == 0 and job['status'] in FINISHED_JOB_STATUSES:
+            # Finished before it published events: report the final status once
+            yield format_sse({"job_id": job_id, "status": job['status'], "error": job.get('error_message')}, job['status'])
+            return
+
+        for event in events:
+            data = {"job_id": job_id, "seq": event.seq, "created_at": event.created_at, **(event.data or {})}
+            if event.data and event.data.get('column'):
+                # The agent's result goes out with the event announcing it
+                data["payload"] = await db.jobs.find_payload(job_id, event.data['column'])
+            yield format_sse(data, event.event, event.seq)
+            after = event.seq
+            last_write = loop.time()
+            if event.event in TERMINAL_EVENTS:
+                return
+
+        if events and JOB_EVENTS_BUFFERED:
+            return
+        if loop.time() >= deadline or await request.is_disconnected():
+            return
+        if loop.time() - last_write >= JOB_EVENTS_KEEPALIVE_SECONDS:
+            yield ": keepalive\n\n"
+            last_write = loop.time()
+        await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    after: int = Query(0, ge=0),
+    last_event_id: Optional[str] = Header(None),
+    clerk_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Stream a job's progress as server-sent events
+
+    Events: started, tagging, pricing, analyzing, reporter_done,
+    charter_done, retirement_done, then completed or failed. Each agent's *_done event
+    carries its result as "payload". Reconnect with the Last-Event-ID header
+    (or ?after=<id>) to continue where the last response stopped.
+    """
+
+    try:
+        job = await db.jobs.find_summary(job_id)
+    except Exception as e:
+        logger.error(f"Error getting job for events: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.get('clerk_user_id') != clerk_user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    if last_event_id:
+        try:
+            after = max(after, int(last_event_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    return StreamingResponse(
+        job_event_stream(job, after, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/api/jobs")
-async def list_jobs(clerk_user_id: str = Depends(get_current_user_id)):
-    """List user's analysis jobs"""
+async def list_jobs(
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    clerk_user_id: str = Depends(get_current_user_id)
+):
+    """List user's analysis jobs, most recent first (without results; see GET /api/jobs/{job_id})"""
 
     try:
-        # Get jobs for this user (with higher limit to avoid missing recent jobs)
-        user_jobs = db.jobs.find_by_user(clerk_user_id, limit=100)
-        # Sort by created_at descending (most recent first)
-        user_jobs.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return {"jobs": user_jobs}
+        # The database returns them already ordered by (created_at, id) descending
+        user_jobs, next_cursor = await db.jobs.find_summaries_by_user(clerk_user_id, limit=limit, cursor=cursor)
+        return {"jobs": user_jobs, "next_cursor": next_cursor}
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/reset-accounts")
-async def reset_accounts(clerk_user_id: str = Depends(get_current_user_id)):
+async def reset_accounts(clerk_user_id: str = Depends(get_current_user_id), user: Dict[str, Any] = Depends(get_current_user)):
     """Delete all accounts for the current user"""
 
     try:
-        # Get user
-        user = db.users.find_by_clerk_id(clerk_user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Get all accounts for user
-        accounts = db.accounts.find_by_user(clerk_user_id)
-
-        # Delete each account (positions will cascade delete)
-        deleted_count = 0
-        for account in accounts:
-            try:
-                # Positions are deleted automatically via CASCADE
-                db.accounts.delete(account['id'])
-                deleted_count += 1
-            except Exception as e:
-                logger.warning(f"Could not delete account {account['id']}: {e}")
+        # Delete all accounts in one statement (positions will cascade delete)
+        deleted_count = await db.accounts.delete_by_user(clerk_user_id)
 
         return {
             "message": f"Deleted {deleted_count} account(s)",
@@ -606,15 +840,10 @@ async def reset_accounts(clerk_user_id: str = Depends(get_current_user_id)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/populate-test-data")
-async def populate_test_data(clerk_user_id: str = Depends(get_current_user_id)):
+async def populate_test_data(clerk_user_id: str = Depends(get_current_user_id), user: Dict[str, Any] = Depends(get_current_user)):
     """Populate test data for the current user"""
 
     try:
-        # Get user
-        user = db.users.find_by_clerk_id(clerk_user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
         # Define missing instruments that might not be in the database
         missing_instruments = {
             "AAPL": {
@@ -660,25 +889,29 @@ async def populate_test_data(clerk_user_id: str = Depends(get_current_user_id)):
         }
 
         # Check and add missing instruments
+        from src.schemas import InstrumentCreate
+
+        existing_instruments = await db.instruments.find_by_symbols(list(missing_instruments))
+
+        new_instruments = []
         for symbol, info in missing_instruments.items():
-            existing = db.instruments.find_by_symbol(symbol)
-            if not existing:
-                try:
-                    from src.schemas import InstrumentCreate
-
-                    instrument_data = InstrumentCreate(
-                        symbol=symbol,
-                        name=info["name"],
-                        instrument_type=info["type"],
-                        current_price=Decimal(str(info["current_price"])),
-                        allocation_regions=info["allocation_regions"],
-                        allocation_sectors=info["allocation_sectors"],
-                        allocation_asset_class=info["allocation_asset_class"]
-                    )
-                    db.instruments.create_instrument(instrument_data)
-                    logger.info(f"Added missing instrument: {symbol}")
-                except Exception as e:
-                    logger.warning(f"Could not add instrument {symbol}: {e}")
+            if symbol not in existing_instruments:
+                new_instruments.append(InstrumentCreate(
+                    symbol=symbol,
+                    name=info["name"],
+                    instrument_type=info["type"],
+                    current_price=Decimal(str(info["current_price"])),
+                    allocation_regions=info["allocation_regions"],
+                    allocation_sectors=info["allocation_sectors"],
+                    allocation_asset_class=info["allocation_asset_class"]
+                ))
+
+        if new_instruments:
+            try:
+                await db.instruments.create_instruments(new_instruments)
+                logger.info(f"Added missing instruments: {[i.symbol for i in new_instruments]}")
+            except Exception as e:
+                logger.warning(f"Could not add instruments: {e}")
 
         # Create accounts with test data
         accounts_data = [
@@ -722,36 +955,47 @@ async def populate_test_data(clerk_user_id: str = Depends(get_current_user_id)):
             }
         ]
 
-        created_accounts = []
-        for account_data in accounts_data:
-            # Create account
-            account_id = db.accounts.create_account(
-                clerk_user_id=clerk_user_id,
-                account_name=account_data["name"],
-                account_purpose=account_data["purpose"],
-                cash_balance=Decimal(str(account_data["cash"]))
-            )
+        # Positions in instruments that still don't exist are reported and left out
+        wanted_symbols = {symbol for account_data in accounts_data for symbol, _ in account_data["positions"]}
+        known_symbols = set(await db.instruments.find_by_symbols(list(wanted_symbols)))
+        for symbol in sorted(wanted_symbols - known_symbols):
+            logger.warning(f"Could not add position {symbol}: instrument not found")
+
+        def create_test_accounts(tx):
+            created = []
+            for account_data in accounts_data:
+                # Create account
+                account_id = tx.accounts.create_account(
+                    clerk_user_id=clerk_user_id,
+                    account_name=account_data["name"],
+                    account_purpose=account_data["purpose"],
+                    cash_balance=Decimal(str(account_data["cash"]))
+                )
+
+                # Add positions in one batch, leaving out instruments that couldn't be added
+                positions = [
+                    (symbol, Decimal(str(quantity)))
+                    for symbol, quantity in account_data["positions"]
+                    if symbol in known_symbols
+                ]
+                tx.positions.upsert_many(account_id, positions)
 
-            # Add positions
-            for symbol, quantity in account_data["positions"]:
-                try:
-                    db.positions.add_position(
-                        account_id=account_id,
-                        symbol=symbol,
-                        quantity=Decimal(str(quantity))
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not add position {symbol}: {e}")
+                created.append(account_id)
+            return created
 
-            created_accounts.append(account_id)
+        # All accounts and positions land together or not at all
+        created_accounts = await db.run_in_transaction(create_test_accounts)
 
         # Get all accounts with their positions for summary
-        all_accounts = []
-        for account_id in created_accounts:
-            account = db.accounts.find_by_id(account_id)
-            positions = db.positions.find_by_account(account_id)
-            account['positions'] = positions
-            all_accounts.append(account)
+        async def load_account(account_id):
+            account, positions = await asyncio.gather(
+                db.accounts.find_by_id(account_id),
+                db.positions.find_by_account(account_id)
+            )
+            # A new dict, since typed rows (DB_TYPED_ROWS) don't take item assignment
+            return {**account, 'positions': positions}
+
+        all_accounts = list(await asyncio.gather(*(load_account(a) for a in created_accounts)))
 
         return {
             "message": "Test data populated successfully",
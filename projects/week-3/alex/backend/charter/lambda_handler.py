@@ -158,40 +158,9 @@ def lambda_handler(event, context):
                 # Load portfolio data from database (like Reporter does)
                 logger.info(f"Charter: Loading portfolio data for job {job_id}")
                 try:
-                    job = db.jobs.find_by_id(job_id)
-                    if job:
-                        user_id = job['clerk_user_id']
-                        user = db.users.find_by_clerk_id(user_id)
-                        accounts = db.accounts.find_by_user(user_id)
-
-                        portfolio_data = {
-                            'user_id': user_id,
-                            'job_id': job_id,
-                            'years_until_retirement': user.get('years_until_retirement', 30) if user else 30,
-                            'accounts': []
-                        }
-
-                        for account in accounts:
-                            account_data = {
-                                'id': account['id'],
-                                'name': account['account_name'],
-                                'type': account.get('account_type', 'investment'),
-                                'cash_balance': float(account.get('cash_balance', 0)),
-                                'positions': []
-                            }
-
-                            positions = db.positions.find_by_account(account['id'])
-                            for position in positions:
-                                instrument = db.instruments.find_by_symbol(position['symbol'])
-                                if instrument:
-                                    account_data['positions'].append({
-                                        'symbol': position['symbol'],
-                                        'quantity': float(position['quantity']),
-                                        'instrument': instrument
-                                    })
-
-                            portfolio_data['accounts'].append(account_data)
-
+                    # Accounts, positions and instruments in one round trip
+                    portfolio_data = db.load_portfolio(job_id=job_id)
+                    if portfolio_data:
                         logger.info(f"Charter: Loaded {len(portfolio_data['accounts'])} accounts with positions")
                     else:
                         logger.error(f"Charter: Job {job_id} not found")
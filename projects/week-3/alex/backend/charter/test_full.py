@@ -79,7 +79,7 @@ def test_charter_lambda():
 
         # Check database for results
         time.sleep(2)  # Give it a moment
-        job = db.jobs.find_by_id(job_id)
+        job = db.jobs.find_with_payloads(job_id)
 
         if job and job.get("charts_payload"):
             print(f"\n📊 Charts Created ({len(job['charts_payload'])} total):")
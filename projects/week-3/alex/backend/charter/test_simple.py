@@ -73,7 +73,7 @@ def test_charter():
         print(f"Message: {body.get('message', 'N/A')}")
 
         # Check what charts were created
-        job = db.jobs.find_by_id(job_id)
+        job = db.jobs.find_with_payloads(job_id)
         if job and job.get("charts_payload"):
             print(f"\n📊 Charts Created ({len(job['charts_payload'])} total):")
             print("=" * 50)
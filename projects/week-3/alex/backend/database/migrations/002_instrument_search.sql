@@ -0,0 +1,12 @@
+-- Alex Financial Planner Database Schema
+-- Version: 002
+-- Description: Indexes for instrument autocomplete (symbol prefix and name substring search)
+
+-- Trigram matching lets LIKE '%query%' use an index
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Symbol prefix search: LOWER(symbol) LIKE 'query%'
+CREATE INDEX IF NOT EXISTS idx_instruments_symbol_prefix ON instruments (LOWER(symbol) text_pattern_ops);
+
+-- Name substring search: LOWER(name) LIKE '%query%'
+CREATE INDEX IF NOT EXISTS idx_instruments_name_trgm ON instruments USING GIN (LOWER(name) gin_trgm_ops);
@@ -0,0 +1,7 @@
+-- Alex Financial Planner Database Schema
+-- Version: 003
+-- Description: Indexes matching the keyset (cursor) pagination order of list endpoints
+
+-- Jobs and accounts are listed per user, newest first, paged on (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_jobs_user_created ON jobs (clerk_user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_accounts_user_created ON accounts (clerk_user_id, created_at DESC, id DESC);
@@ -0,0 +1,201 @@
+-- Alex Financial Planner Database Schema
+-- Version: 004
+-- Description: Portfolio valuations per account and per user, kept current by triggers
+--
+-- Every write applies only its own delta (a position's quantity x price, a
+-- price move x the quantity held, a cash change), so reading a portfolio's
+-- value is one row lookup however many positions it has. Values are
+-- unconstrained NUMERIC so repeated deltas never accumulate rounding error.
+
+CREATE TABLE IF NOT EXISTS account_valuations (
+    account_id UUID PRIMARY KEY REFERENCES accounts(id) ON DELETE CASCADE,
+    clerk_user_id VARCHAR(255),
+    positions_value NUMERIC NOT NULL DEFAULT 0,  -- Sum of quantity x current_price
+    cash_balance NUMERIC NOT NULL DEFAULT 0,
+    total_value NUMERIC GENERATED ALWAYS AS (positions_value + cash_balance) STORED,
+    num_positions INTEGER NOT NULL DEFAULT 0,
+    priced_at TIMESTAMP,                         -- Latest price update reflected in the value
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS user_valuations (
+    clerk_user_id VARCHAR(255) PRIMARY KEY REFERENCES users(clerk_user_id) ON DELETE CASCADE,
+    positions_value NUMERIC NOT NULL DEFAULT 0,
+    cash_balance NUMERIC NOT NULL DEFAULT 0,
+    total_value NUMERIC GENERATED ALWAYS AS (positions_value + cash_balance) STORED,
+    num_accounts INTEGER NOT NULL DEFAULT 0,
+    num_positions INTEGER NOT NULL DEFAULT 0,
+    priced_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_account_valuations_user ON account_valuations(clerk_user_id);
+
+-- Backfill from the current portfolios
+INSERT INTO user_valuations (clerk_user_id)
+SELECT clerk_user_id FROM users
+ON CONFLICT (clerk_user_id) DO NOTHING;
+
+INSERT INTO account_valuations (account_id, clerk_user_id, positions_value, cash_balance, num_positions, priced_at)
+SELECT a.id, a.clerk_user_id,
+       COALESCE(SUM(p.quantity * COALESCE(i.current_price, 0)), 0),
+       COALESCE(a.cash_balance, 0),
+       COUNT(p.id),
+       MAX(i.updated_at)
+FROM accounts a
+LEFT JOIN positions p ON p.account_id = a.id
+LEFT JOIN instruments i ON i.symbol = p.symbol
+GROUP BY a.id
+ON CONFLICT (account_id) DO NOTHING;
+
+UPDATE user_valuations u
+SET positions_value = v.positions_value,
+    cash_balance = v.cash_balance,
+    num_accounts = v.num_accounts,
+    num_positions = v.num_positions,
+    priced_at = v.priced_at,
+    updated_at = NOW()
+FROM (
+    SELECT clerk_user_id, SUM(positions_value) AS positions_value, SUM(cash_balance) AS cash_balance,
+           COUNT(*) AS num_accounts, SUM(num_positions) AS num_positions, MAX(priced_at) AS priced_at
+    FROM account_valuations
+    GROUP BY clerk_user_id
+) v
+WHERE u.clerk_user_id = v.clerk_user_id;
+
+-- Apply a change to one account's valuation
+CREATE OR REPLACE FUNCTION apply_account_valuation_delta(
+    p_account_id UUID, p_value NUMERIC, p_cash NUMERIC, p_positions INTEGER, p_priced_at TIMESTAMP
+)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE account_valuations
+    SET positions_value = positions_value + p_value,
+        cash_balance = cash_balance + p_cash,
+        num_positions = num_positions + p_positions,
+        priced_at = GREATEST(priced_at, p_priced_at),
+        updated_at = NOW()
+    WHERE account_id = p_account_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- New users start with an empty valuation
+CREATE OR REPLACE FUNCTION users_valuation_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_valuations (clerk_user_id) VALUES (NEW.clerk_user_id)
+    ON CONFLICT (clerk_user_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Accounts: create the valuation row and follow cash changes
+CREATE OR REPLACE FUNCTION accounts_valuation_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO account_valuations (account_id, clerk_user_id, cash_balance)
+        VALUES (NEW.id, NEW.clerk_user_id, COALESCE(NEW.cash_balance, 0))
+        ON CONFLICT (account_id) DO NOTHING;
+    ELSE
+        PERFORM apply_account_valuation_delta(
+            NEW.id, 0, COALESCE(NEW.cash_balance, 0) - COALESCE(OLD.cash_balance, 0), 0, NULL
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Positions: add the new holding's value and remove the old one's
+CREATE OR REPLACE FUNCTION positions_valuation_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    price NUMERIC;
+    priced TIMESTAMP;
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.account_id = OLD.account_id AND NEW.symbol = OLD.symbol THEN
+        SELECT current_price, updated_at INTO price, priced FROM instruments WHERE symbol = NEW.symbol;
+        PERFORM apply_account_valuation_delta(
+            NEW.account_id, (NEW.quantity - OLD.quantity) * COALESCE(price, 0), 0, 0, priced
+        );
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT current_price, updated_at INTO price, priced FROM instruments WHERE symbol = OLD.symbol;
+        PERFORM apply_account_valuation_delta(OLD.account_id, -OLD.quantity * COALESCE(price, 0), 0, -1, priced);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT current_price, updated_at INTO price, priced FROM instruments WHERE symbol = NEW.symbol;
+        PERFORM apply_account_valuation_delta(NEW.account_id, NEW.quantity * COALESCE(price, 0), 0, 1, priced);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Instruments: revalue every account holding a symbol whose price moved
+CREATE OR REPLACE FUNCTION instruments_valuation_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE account_valuations v
+    SET positions_value = v.positions_value + held.quantity * (COALESCE(NEW.current_price, 0) - COALESCE(OLD.current_price, 0)),
+        priced_at = GREATEST(v.priced_at, NEW.updated_at),
+        updated_at = NOW()
+    FROM (
+        SELECT account_id, SUM(quantity) AS quantity
+        FROM positions
+        WHERE symbol = NEW.symbol
+        GROUP BY account_id
+    ) held
+    WHERE v.account_id = held.account_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Account valuations roll up into the owner's valuation
+CREATE OR REPLACE FUNCTION account_valuations_rollup_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE user_valuations
+        SET positions_value = positions_value - OLD.positions_value,
+            cash_balance = cash_balance - OLD.cash_balance,
+            num_positions = num_positions - OLD.num_positions,
+            num_accounts = num_accounts - 1,
+            updated_at = NOW()
+        WHERE clerk_user_id = OLD.clerk_user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE user_valuations
+        SET positions_value = positions_value + NEW.positions_value,
+            cash_balance = cash_balance + NEW.cash_balance,
+            num_positions = num_positions + NEW.num_positions,
+            num_accounts = num_accounts + 1,
+            priced_at = GREATEST(priced_at, NEW.priced_at),
+            updated_at = NOW()
+        WHERE clerk_user_id = NEW.clerk_user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_valuation ON users;
+CREATE TRIGGER users_valuation AFTER INSERT ON users
+    FOR EACH ROW EXECUTE FUNCTION users_valuation_trigger();
+
+DROP TRIGGER IF EXISTS accounts_valuation ON accounts;
+CREATE TRIGGER accounts_valuation AFTER INSERT OR UPDATE OF cash_balance ON accounts
+    FOR EACH ROW EXECUTE FUNCTION accounts_valuation_trigger();
+
+DROP TRIGGER IF EXISTS positions_valuation ON positions;
+CREATE TRIGGER positions_valuation AFTER INSERT OR DELETE OR UPDATE OF account_id, symbol, quantity ON positions
+    FOR EACH ROW EXECUTE FUNCTION positions_valuation_trigger();
+
+DROP TRIGGER IF EXISTS instruments_valuation ON instruments;
+CREATE TRIGGER instruments_valuation AFTER UPDATE OF current_price ON instruments
+    FOR EACH ROW WHEN (OLD.current_price IS DISTINCT FROM NEW.current_price)
+    EXECUTE FUNCTION instruments_valuation_trigger();
+
+DROP TRIGGER IF EXISTS account_valuations_rollup ON account_valuations;
+CREATE TRIGGER account_valuations_rollup AFTER INSERT OR DELETE OR UPDATE ON account_valuations
+    FOR EACH ROW EXECUTE FUNCTION account_valuations_rollup_trigger();
@@ -0,0 +1,12 @@
+-- Alex Financial Planner Database Schema
+-- Version: 005
+-- Description: Indexes for the hot per-account access paths
+
+-- Position lookups by account read symbol and quantity from the index alone
+CREATE INDEX IF NOT EXISTS idx_positions_account_symbol ON positions (account_id, symbol) INCLUDE (quantity);
+
+-- Superseded by idx_positions_account_symbol and by 003's (clerk_user_id, created_at, id)
+-- indexes, which share their leading column
+DROP INDEX IF EXISTS idx_jobs_user;
+DROP INDEX IF EXISTS idx_accounts_user;
+DROP INDEX IF EXISTS idx_positions_account;
@@ -0,0 +1,18 @@
+-- Alex Financial Planner Database Schema
+-- Version: 006
+-- Description: Short plain-text preview of each job's result for job listings
+--
+-- Written by Jobs.patch whenever the planner summary or the report is stored,
+-- so listing a user's jobs never has to read the payload columns.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS summary_preview VARCHAR(200);
+
+-- Backfill from the summary, or the report when there is none (offloaded
+-- payloads are only pointers in the row and are left without a preview)
+UPDATE jobs
+SET summary_preview = LEFT(BTRIM(REGEXP_REPLACE(
+        REGEXP_REPLACE(COALESCE(summary_payload->>'summary', report_payload->>'content'), '[#*_>`|]+', ' ', 'g'),
+        '\s+', ' ', 'g'
+    )), 200)
+WHERE summary_preview IS NULL
+  AND COALESCE(summary_payload->>'summary', report_payload->>'content') IS NOT NULL;
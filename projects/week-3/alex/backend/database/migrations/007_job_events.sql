@@ -0,0 +1,18 @@
+-- Alex Financial Planner Database Schema
+-- Version: 007
+-- Description: Job progress events streamed to the frontend
+--
+-- Events are numbered per job: publishing takes the next number from
+-- jobs.event_seq in the same statement as the insert (see events.py), so they
+-- commit in order and readers page through them on (job_id, seq).
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS event_seq INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id UUID NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    event VARCHAR(50) NOT NULL,        -- 'started', 'tagging', 'pricing', 'analyzing', 'reporter_done', ..., 'completed', 'failed'
+    data JSONB,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (job_id, seq)
+);
@@ -0,0 +1,113 @@
+-- Alex Financial Planner Database Schema
+-- Version: 008
+-- Description: Keep portfolio valuations exact under concurrent writes, and repair drift
+--
+-- Under READ COMMITTED a position write could read an instrument's price while
+-- a price update was in flight, and the price trigger summed holdings without
+-- positions not yet committed, so one of the two deltas was lost for good.
+-- Position writes now read the price FOR SHARE: they wait for a pending price
+-- update and value the position at the new price, and a price update waits
+-- for them and then sees their positions.
+
+CREATE OR REPLACE FUNCTION positions_valuation_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    price NUMERIC;
+    priced TIMESTAMP;
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.account_id = OLD.account_id AND NEW.symbol = OLD.symbol THEN
+        SELECT current_price, updated_at INTO price, priced FROM instruments WHERE symbol = NEW.symbol FOR SHARE;
+        PERFORM apply_account_valuation_delta(
+            NEW.account_id, (NEW.quantity - OLD.quantity) * COALESCE(price, 0), 0, 0, priced
+        );
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT current_price, updated_at INTO price, priced FROM instruments WHERE symbol = OLD.symbol FOR SHARE;
+        PERFORM apply_account_valuation_delta(OLD.account_id, -OLD.quantity * COALESCE(price, 0), 0, -1, priced);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT current_price, updated_at INTO price, priced FROM instruments WHERE symbol = NEW.symbol FOR SHARE;
+        PERFORM apply_account_valuation_delta(NEW.account_id, NEW.quantity * COALESCE(price, 0), 0, 1, priced);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute valuations from accounts, positions and prices, fixing any that
+-- drifted; one user's, or everyone's when p_clerk_user_id is NULL.
+-- Returns the number of account and user valuations corrected.
+CREATE OR REPLACE FUNCTION reconcile_valuations(p_clerk_user_id VARCHAR DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    accounts_fixed INTEGER;
+    users_fixed INTEGER;
+BEGIN
+    -- Lock in the order writers do (account, then user), waiting for in-flight
+    -- writes; each later statement reads what they committed
+    PERFORM 1 FROM account_valuations
+    WHERE p_clerk_user_id IS NULL OR clerk_user_id = p_clerk_user_id
+    ORDER BY account_id
+    FOR UPDATE;
+
+    PERFORM 1 FROM user_valuations
+    WHERE p_clerk_user_id IS NULL OR clerk_user_id = p_clerk_user_id
+    ORDER BY clerk_user_id
+    FOR UPDATE;
+
+    UPDATE account_valuations v
+    SET positions_value = actual.positions_value,
+        cash_balance = actual.cash_balance,
+        num_positions = actual.num_positions,
+        priced_at = actual.priced_at,
+        updated_at = NOW()
+    FROM (
+        SELECT a.id AS account_id,
+               COALESCE(SUM(p.quantity * COALESCE(i.current_price, 0)), 0) AS positions_value,
+               COALESCE(a.cash_balance, 0) AS cash_balance,
+               COUNT(p.id)::INTEGER AS num_positions,
+               MAX(i.updated_at) AS priced_at
+        FROM accounts a
+        LEFT JOIN positions p ON p.account_id = a.id
+        LEFT JOIN instruments i ON i.symbol = p.symbol
+        WHERE p_clerk_user_id IS NULL OR a.clerk_user_id = p_clerk_user_id
+        GROUP BY a.id
+    ) actual
+    WHERE v.account_id = actual.account_id
+      AND (v.positions_value, v.cash_balance, v.num_positions)
+          IS DISTINCT FROM (actual.positions_value, actual.cash_balance, actual.num_positions);
+    GET DIAGNOSTICS accounts_fixed = ROW_COUNT;
+
+    -- The rollup trigger applied those corrections as deltas; totals that had
+    -- drifted themselves are recomputed from the account rows
+    UPDATE user_valuations u
+    SET positions_value = actual.positions_value,
+        cash_balance = actual.cash_balance,
+        num_accounts = actual.num_accounts,
+        num_positions = actual.num_positions,
+        priced_at = actual.priced_at,
+        updated_at = NOW()
+    FROM (
+        SELECT uv.clerk_user_id,
+               COALESCE(SUM(v.positions_value), 0) AS positions_value,
+               COALESCE(SUM(v.cash_balance), 0) AS cash_balance,
+               COUNT(v.account_id)::INTEGER AS num_accounts,
+               COALESCE(SUM(v.num_positions), 0)::INTEGER AS num_positions,
+               MAX(v.priced_at) AS priced_at
+        FROM user_valuations uv
+        LEFT JOIN account_valuations v ON v.clerk_user_id = uv.clerk_user_id
+        WHERE p_clerk_user_id IS NULL OR uv.clerk_user_id = p_clerk_user_id
+        GROUP BY uv.clerk_user_id
+    ) actual
+    WHERE u.clerk_user_id = actual.clerk_user_id
+      AND (u.positions_value, u.cash_balance, u.num_accounts, u.num_positions)
+          IS DISTINCT FROM (actual.positions_value, actual.cash_balance, actual.num_accounts, actual.num_positions);
+    GET DIAGNOSTICS users_fixed = ROW_COUNT;
+
+    RETURN accounts_fixed + users_fixed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Repair anything that drifted before the triggers locked
+SELECT reconcile_valuations();
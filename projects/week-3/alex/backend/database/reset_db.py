@@ -19,6 +19,10 @@ def drop_all_tables(db: DataAPIClient):
     
     # Order matters due to foreign key constraints
     tables_to_drop = [
+        'schema_migrations',
+        'account_valuations',
+        'user_valuations',
+        'job_events',
         'positions',
         'accounts',
         'jobs',
@@ -125,6 +129,7 @@ def create_test_data(db_models: Database):
         if existing_positions:
             print(f"   ℹ️  Account already has {len(existing_positions)} positions")
         else:
+            validated_positions = []
             for symbol, quantity in positions:
                 # Validate position with Pydantic
                 position = PositionCreate(
@@ -133,11 +138,11 @@ def create_test_data(db_models: Database):
                     quantity=quantity
                 )
                 validated = position.model_dump()
-                db_models.positions.add_position(
-                    validated['account_id'],
-                    validated['symbol'],
-                    validated['quantity']
-                )
+                validated_positions.append((validated['symbol'], validated['quantity']))
+
+            # Upsert them all in one statement
+            db_models.positions.upsert_many(account_id, validated_positions)
+            for symbol, quantity in validated_positions:
                 print(f"   ✅ Added position: {quantity} shares of {symbol}")
 
 
@@ -8,6 +8,7 @@ import os
 import json
 import boto3
 from botocore.exceptions import ClientError
+from src.client import DataAPIClient
 from src.schemas import InstrumentCreate
 from pydantic import ValidationError
 from dotenv import load_dotenv
@@ -26,6 +27,7 @@ if not cluster_arn or not secret_arn:
     exit(1)
 
 client = boto3.client("rds-data", region_name=region)
+db_client = DataAPIClient(cluster_arn, secret_arn, database)
 
 # Define popular ETF instruments with realistic allocation data
 # All percentages should sum to 100 for each allocation type
@@ -348,68 +350,75 @@ INSTRUMENTS = [
 ]
 
 
-def insert_instrument(instrument_data):
-    """Insert a single instrument into the database with Pydantic validation"""
+INSERT_INSTRUMENT_SQL = """
+    INSERT INTO instruments (
+        symbol, name, instrument_type, current_price,
+        allocation_regions, allocation_sectors, allocation_asset_class
+    ) VALUES (
+        :symbol, :name, :instrument_type, :current_price::numeric,
+        :allocation_regions::jsonb, :allocation_sectors::jsonb, :allocation_asset_class::jsonb
+    )
+    ON CONFLICT (symbol) DO UPDATE SET
+        name = EXCLUDED.name,
+        instrument_type = EXCLUDED.instrument_type,
+        current_price = EXCLUDED.current_price,
+        allocation_regions = EXCLUDED.allocation_regions,
+        allocation_sectors = EXCLUDED.allocation_sectors,
+        allocation_asset_class = EXCLUDED.allocation_asset_class,
+        updated_at = NOW()
+"""
+
+
+def instrument_parameters(instrument_data):
+    """Build Data API parameters for a single instrument with Pydantic validation"""
     # Validate with Pydantic first
     try:
         instrument = InstrumentCreate(**instrument_data)
     except ValidationError as e:
         print(f"    ❌ Validation error: {e}")
-        return False
+        return None
 
     # Get validated data
     validated = instrument.model_dump()
 
-    sql = """
-        INSERT INTO instruments (
-            symbol, name, instrument_type, current_price,
-            allocation_regions, allocation_sectors, allocation_asset_class
-        ) VALUES (
-            :symbol, :name, :instrument_type, :current_price::numeric,
-            :allocation_regions::jsonb, :allocation_sectors::jsonb, :allocation_asset_class::jsonb
-        )
-        ON CONFLICT (symbol) DO UPDATE SET
-            name = EXCLUDED.name,
-            instrument_type = EXCLUDED.instrument_type,
-            current_price = EXCLUDED.current_price,
-            allocation_regions = EXCLUDED.allocation_regions,
-            allocation_sectors = EXCLUDED.allocation_sectors,
-            allocation_asset_class = EXCLUDED.allocation_asset_class,
-            updated_at = NOW()
-    """
+    return [
+        {"name": "symbol", "value": {"stringValue": validated["symbol"]}},
+        {"name": "name", "value": {"stringValue": validated["name"]}},
+        {"name": "instrument_type", "value": {"stringValue": validated["instrument_type"]}},
+        {
+            "name": "current_price",
+            "value": {"stringValue": str(validated.get("current_price", 0))},
+        },
+        {
+            "name": "allocation_regions",
+            "value": {"stringValue": json.dumps(validated["allocation_regions"])},
+        },
+        {
+            "name": "allocation_sectors",
+            "value": {"stringValue": json.dumps(validated["allocation_sectors"])},
+        },
+        {
+            "name": "allocation_asset_class",
+            "value": {"stringValue": json.dumps(validated["allocation_asset_class"])},
+        },
+    ]
+
+
+def insert_instruments(instruments):
+    """Upsert all instruments using batched Data API calls, returning the number loaded"""
+    parameter_sets = []
+    for inst in instruments:
+        print(f"  [{len(parameter_sets) + 1}/{len(instruments)}] {inst['symbol']}: {inst['name'][:40]}...")
+        params = instrument_parameters(inst)
+        if params:
+            parameter_sets.append(params)
 
     try:
-        response = client.execute_statement(
-            resourceArn=cluster_arn,
-            secretArn=secret_arn,
-            database=database,
-            sql=sql,
-            parameters=[
-                {"name": "symbol", "value": {"stringValue": validated["symbol"]}},
-                {"name": "name", "value": {"stringValue": validated["name"]}},
-                {"name": "instrument_type", "value": {"stringValue": validated["instrument_type"]}},
-                {
-                    "name": "current_price",
-                    "value": {"stringValue": str(validated.get("current_price", 0))},
-                },
-                {
-                    "name": "allocation_regions",
-                    "value": {"stringValue": json.dumps(validated["allocation_regions"])},
-                },
-                {
-                    "name": "allocation_sectors",
-                    "value": {"stringValue": json.dumps(validated["allocation_sectors"])},
-                },
-                {
-                    "name": "allocation_asset_class",
-                    "value": {"stringValue": json.dumps(validated["allocation_asset_class"])},
-                },
-            ],
-        )
-        return True
+        db_client.execute_many(INSERT_INSTRUMENT_SQL, parameter_sets)
+        return len(parameter_sets)
     except ClientError as e:
         print(f"    ❌ Error: {e.response['Error']['Message'][:100]}")
-        return False
+        return 0
 
 
 def verify_allocations(instrument):
@@ -449,17 +458,11 @@ def main():
 
     # Insert instruments
     print("\n💾 Inserting instruments...")
-    success_count = 0
-
-    for inst in INSTRUMENTS:
-        print(
-            f"  [{success_count + 1}/{len(INSTRUMENTS)}] {inst['symbol']}: {inst['name'][:40]}..."
-        )
-        if insert_instrument(inst):
-            print(f"    ✅ Success")
-            success_count += 1
-        else:
-            print(f"    ❌ Failed")
+    success_count = insert_instruments(INSTRUMENTS)
+    if success_count:
+        print(f"    ✅ Success")
+    else:
+        print(f"    ❌ Failed")
 
     print("\n" + "=" * 50)
     print(f"Seeding complete: {success_count}/{len(INSTRUMENTS)} instruments loaded")
@@ -1,10 +1,18 @@
 """
 Database package for Alex Financial Planner
-Provides database models, schemas, and Data API client
+Provides database models, schemas, and Data API / PostgreSQL clients
 """
 
-from .client import DataAPIClient
+from .client import BaseClient, DataAPIClient
+from .postgres import PostgresClient
 from .models import Database
+from .aio import AsyncDatabase
+from .cache import QueryCache
+from .responses import CachedResponse, ResponseCache
+from .events import DatabaseEventBroker, EventBroker, JobEvent, MemoryEventBroker
+from .instrumentation import Instrumentation, JsonlSink, LogSink, MemorySink
+from .payloads import LocalPayloadStore, PayloadStore, S3PayloadStore
+from .rows import AccountRow, InstrumentRow, JobRow, JobSummaryRow, PositionRow
 from .schemas import (
     # Types
     RegionType,
@@ -31,7 +39,29 @@ from .schemas import (
 
 __all__ = [
     'Database',
+    'AsyncDatabase',
+    'QueryCache',
+    'ResponseCache',
+    'CachedResponse',
+    'Instrumentation',
+    'LogSink',
+    'MemorySink',
+    'JsonlSink',
+    'PayloadStore',
+    'S3PayloadStore',
+    'LocalPayloadStore',
+    'EventBroker',
+    'DatabaseEventBroker',
+    'MemoryEventBroker',
+    'JobEvent',
+    'InstrumentRow',
+    'AccountRow',
+    'PositionRow',
+    'JobRow',
+    'JobSummaryRow',
+    'BaseClient',
     'DataAPIClient',
+    'PostgresClient',
     'InstrumentCreate',
     'UserCreate',
     'AccountCreate',
@@ -0,0 +1,145 @@
+"""
+Asyncio interface to the database
+Runs the blocking Data API calls on a bounded thread pool so async services
+(the FastAPI app) never block their event loop on Aurora
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+
+from .models import Database
+
+logger = logging.getLogger(__name__)
+
+# botocore keeps 10 pooled HTTPS connections per client by default; more
+# workers than that would just queue on the connection pool
+DEFAULT_MAX_WORKERS = 10
+
+
+class AsyncModel:
+    """Awaitable proxy for a synchronous model (or client)"""
+
+    def __init__(self, target: Any, database: "AsyncDatabase"):
+        self._target = target
+        self._database = database
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self._database.run(attr, *args, **kwargs)
+
+        return call
+
+
+class AsyncDatabase:
+    """
+    Async version of Database with the same model API
+
+    Usage:
+        db = AsyncDatabase()
+        user, accounts = await asyncio.gather(
+            db.users.find_by_clerk_id(clerk_user_id),
+            db.accounts.find_by_user(clerk_user_id),
+        )
+    """
+
+    def __init__(self, database: Database = None, max_workers: int = DEFAULT_MAX_WORKERS, **kwargs):
+        """
+        Initialize async database
+
+        Args:
+            database: Existing Database to wrap (a new one is created from kwargs otherwise)
+            max_workers: Maximum number of statements in flight at once
+        """
+        self.sync = database or Database(**kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alex-db")
+
+        self.client = AsyncModel(self.sync.client, self)
+        self.users = AsyncModel(self.sync.users, self)
+        self.instruments = AsyncModel(self.sync.instruments, self)
+        self.accounts = AsyncModel(self.sync.accounts, self)
+        self.positions = AsyncModel(self.sync.positions, self)
+        self.jobs = AsyncModel(self.sync.jobs, self)
+        self.valuations = AsyncModel(self.sync.valuations, self)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking database call on the executor, keeping the current context"""
+        loop = asyncio.get_running_loop()
+        # Copy context so the active transaction follows the call into the worker thread
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Async unit of work: every awaited model call inside the block shares one transaction
+
+        Usage:
+            async with db.transaction() as tx:
+                await tx.positions.delete_by_account(account_id)
+                await tx.accounts.delete(account_id)
+        """
+        client = self.sync.client
+        if client.transaction_id:
+            yield self
+            return
+
+        transaction_id = await self.run(client.begin_transaction)
+        try:
+            with client.use_transaction(transaction_id):
+                yield self
+        except BaseException:
+            try:
+                await self.run(client.rollback_transaction, transaction_id)
+            except Exception as e:
+                logger.warning(f"Rollback of transaction {transaction_id} failed: {e}")
+            finally:
+                client.finish_transaction(transaction_id)
+            raise
+        try:
+            await self.run(client.commit_transaction, transaction_id)
+        finally:
+            client.finish_transaction(transaction_id)
+
+    async def run_in_transaction(self, func: Callable[[Database], Any], max_attempts: int = 3) -> Any:
+        """Run a synchronous unit of work func(db) in a transaction on the executor"""
+        return await self.run(self.sync.run_in_transaction, func, max_attempts)
+
+    @property
+    def instrumentation(self):
+        """Statement instrumentation of the underlying client"""
+        return self.sync.instrumentation
+
+    def stats(self, top: int = 10):
+        """Statement statistics for the active scope (no I/O, so not awaited)"""
+        return self.sync.stats(top)
+
+    def cache_stats(self):
+        """Hit/miss statistics of the reference table cache (no I/O, so not awaited)"""
+        return self.sync.cache_stats()
+
+    async def load_portfolio(self, clerk_user_id: str = None, job_id: str = None):
+        """Load a user's nested portfolio in one round trip"""
+        return await self.run(self.sync.load_portfolio, clerk_user_id, job_id)
+
+    async def execute_raw(self, sql: str, parameters=None):
+        """Execute raw SQL for complex queries"""
+        return await self.run(self.sync.execute_raw, sql, parameters)
+
+    async def query_raw(self, sql: str, parameters=None):
+        """Execute raw SELECT query"""
+        return await self.run(self.sync.query_raw, sql, parameters)
+
+    def close(self):
+        """Shut down the worker threads"""
+        self._executor.shutdown(wait=False)
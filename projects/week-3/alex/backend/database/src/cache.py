@@ -0,0 +1,138 @@
+"""
+In-process query cache for small, rarely written reference tables
+Entries expire after a TTL, the least recently used are evicted past maxsize,
+and writes through the client invalidate every entry of the written table
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = float(os.getenv("DB_CACHE_TTL_SECONDS", "60"))
+DEFAULT_MAXSIZE = int(os.getenv("DB_CACHE_MAXSIZE", "2048"))
+
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache of query results, grouped by table"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of cached results
+            ttl: Seconds a result stays valid (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (table, key) -> (expires_at, value)
+        # Bumped by every invalidation, so a load that overlapped a write isn't stored
+        self._generations: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, table: str, key: Hashable, loader: Callable[[], Any], cache_none: bool = True) -> Any:
+        """
+        Return the cached result for (table, key), calling loader() on a miss
+
+        With cache_none=False a None result (nothing found) is not cached, so
+        the next call looks again.
+        """
+        entry_key = (table, key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation(table)
+
+        value = loader()
+        if value is not None or cache_none:
+            self.set(table, key, value, generation)
+        return value
+
+    def generation(self, table: str) -> Any:
+        """Token for set(): taken before a load, it makes set() drop results invalidated meanwhile"""
+        with self._lock:
+            return self._generation(table)
+
+    def _generation(self, table: str) -> Any:
+        # invalidate() with no table bumps the None counter, which covers every table
+        return (self._generations.get(None, 0), self._generations.get(table, 0))
+
+    def get_many(self, table: str, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Cached results for the keys that have a live entry (missing keys are left out)"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get((table, key))
+                if entry and entry[0] > now:
+                    self._entries.move_to_end((table, key))
+                    self.hits += 1
+                    found[key] = entry[1]
+                else:
+                    self.misses += 1
+        return found
+
+    def set(self, table: str, key: Hashable, value: Any, generation: Any = None):
+        """
+        Store a result, evicting the least recently used entries past maxsize
+
+        With a generation (see generation()), the result is dropped if the
+        table was invalidated after it was taken: it may predate the write.
+        """
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation(table):
+                return
+            self._entries[(table, key)] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end((table, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table: Optional[str] = None):
+        """Drop every cached result for a table (or for all tables)"""
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+            else:
+                for entry_key in [k for k in self._entries if k[0] == table]:
+                    del self._entries[entry_key]
+            self._generations[table] = self._generations.get(table, 0) + 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+# Shared by every Database in the process, so Lambdas that create a Database
+# per invocation still hit the cache in warm containers
+default_cache = QueryCache()
@@ -6,12 +6,19 @@ Provides a simple interface for database operations
 import boto3
 import json
 import os
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import date, datetime
-from decimal import Decimal
+import random
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from botocore.exceptions import ClientError
 import logging
 
+from .decoding import decode_columns, decode_formatted_records, decode_records, decode_rows, extract_value
+from .instrumentation import Instrumentation, default_instrumentation
+from .statements import Signature, compile_insert, compile_update, encode_value, merge_parameter, signature
+
 # Try to load .env file if it exists
 try:
     from dotenv import load_dotenv
@@ -22,98 +29,258 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Rows per round trip for iter_query; keeps typical rows well under the 1 MB response limit
+DEFAULT_PAGE_SIZE = 500
 
-class DataAPIClient:
-    """Wrapper for AWS RDS Data API to simplify database operations"""
+# Data API rejects requests larger than 4 MiB; leave headroom for the envelope
+MAX_BATCH_REQUEST_BYTES = 3 * 1024 * 1024
+# Keep individual batches small enough to finish well inside the statement timeout
+MAX_BATCH_PARAMETER_SETS = 1000
 
-    def __init__(
-        self,
-        cluster_arn: str = None,
-        secret_arn: str = None,
-        database: str = None,
-        region: str = None,
-    ):
-        """
-        Initialize Data API client
+# Errors raised while a paused Aurora Serverless cluster wakes up; the statement
+# never ran, so it is safe to send again even outside a transaction
+RESUMING_ERROR_CODES = frozenset({
+    "DatabaseResumingException",
+    "DatabaseUnavailableException",
+    "ServiceUnavailableError",
+    "ThrottlingException",
+})
+RESUMING_ERROR_MESSAGES = (
+    "communications link failure",
+    "is resuming",
+)
+
+# Errors worth retrying a whole transaction for: resuming, plus conflicts that
+# roll the transaction back
+TRANSIENT_ERROR_CODES = RESUMING_ERROR_CODES
+TRANSIENT_ERROR_MESSAGES = RESUMING_ERROR_MESSAGES + (
+    "could not serialize access",
+    "deadlock detected",
+)
+
+# Statement retry policy: jittered exponential backoff bounded by a deadline
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 5.0
+RETRY_MAX_ATTEMPTS = 8
+DEFAULT_RETRY_DEADLINE = float(os.getenv("DB_RETRY_DEADLINE_SECONDS", "30"))
+
+
+def _error_matches(error: Exception, codes, messages) -> bool:
+    """Whether a Data API error has one of the codes or a message containing one of messages"""
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code", "")
+    message = error.response.get("Error", {}).get("Message", "").lower()
+    return code in codes or any(m in message for m in messages)
+
+
+def is_resuming_error(error: Exception) -> bool:
+    """Check whether a Data API error means the cluster is (re)starting"""
+    return _error_matches(error, RESUMING_ERROR_CODES, RESUMING_ERROR_MESSAGES)
 
+
+def is_transient_error(error: Exception) -> bool:
+    """Check whether a Data API error is safe to retry"""
+    return _error_matches(error, TRANSIENT_ERROR_CODES, TRANSIENT_ERROR_MESSAGES)
+
+
+def request_size(sql: str, parameters: Any) -> int:
+    """Approximate size of a request payload in bytes"""
+    return len(sql) + (len(json.dumps(parameters, default=str)) if parameters else 0)
+
+
+def response_size(response: Dict) -> Optional[int]:
+    """Size of a Data API response as reported by its HTTP headers, if known"""
+    length = response.get("ResponseMetadata", {}).get("HTTPHeaders", {}).get("content-length")
+    return int(length) if length is not None else None
+
+
+class BaseClient(ABC):
+    """
+    SQL helpers shared by every database backend
+
+    Subclasses provide the transport: execute, _batch_execute and the
+    transaction calls. Responses use the Data API shape (records,
+    columnMetadata, numberOfRecordsUpdated) whatever the backend.
+    """
+
+    def __init__(self, numeric_type: type = float, instrumentation: Instrumentation = None):
+        """
         Args:
-            cluster_arn: Aurora cluster ARN (or from env AURORA_CLUSTER_ARN)
-            secret_arn: Secrets Manager ARN (or from env AURORA_SECRET_ARN)
-            database: Database name (or from env AURORA_DATABASE)
-            region: AWS region (or from env AWS_REGION)
+            numeric_type: Type used for NUMERIC/DECIMAL columns (float or Decimal)
+            instrumentation: Where statement timings go (defaults to the process-wide one)
         """
-        self.cluster_arn = cluster_arn or os.environ.get("AURORA_CLUSTER_ARN")
-        self.secret_arn = secret_arn or os.environ.get("AURORA_SECRET_ARN")
-        self.database = database or os.environ.get("AURORA_DATABASE", "alex")
+        self.numeric_type = numeric_type
+        self.instrumentation = instrumentation or default_instrumentation
+        # Transaction of the current thread/task, picked up by every statement
+        self._transaction_id = ContextVar(f"transaction_id_{id(self)}", default=None)
+        # Monotonic time by which retried statements must give up, set by deadline()
+        self._deadline = ContextVar(f"deadline_{id(self)}", default=None)
+        self.retry_deadline = DEFAULT_RETRY_DEADLINE
+        # Called with the table name after every write made through the helpers
+        self._write_listeners: List[Callable[[str], None]] = []
+        # Tables written by each open transaction, notified again once it ends
+        self._transaction_writes: Dict[str, set] = {}
+
+    @abstractmethod
+    def _execute(self, sql: str, parameters: List[Dict] = None, format_records_as: str = None) -> Dict:
+        """Execute a SQL statement and return a Data API shaped response"""
+
+    @abstractmethod
+    def _batch_execute(self, sql: str, parameter_sets: List[List[Dict]]) -> List[Dict]:
+        """Execute one chunk of parameter sets, returning one update result per set"""
+
+    @abstractmethod
+    def begin_transaction(self) -> str:
+        """Begin a database transaction"""
 
-        if not self.cluster_arn or not self.secret_arn:
-            raise ValueError(
-                "Missing required Aurora configuration. "
-                "Set AURORA_CLUSTER_ARN and AURORA_SECRET_ARN environment variables."
-            )
+    @abstractmethod
+    def commit_transaction(self, transaction_id: str):
+        """Commit a database transaction"""
 
-        self.region = os.environ.get("DEFAULT_AWS_REGION", "us-east-1")
-        self.client = boto3.client("rds-data", region_name=self.region)
+    @abstractmethod
+    def rollback_transaction(self, transaction_id: str):
+        """Rollback a database transaction"""
+
+    def _is_transient(self, error: Exception) -> bool:
+        """Whether an error from this backend is safe to retry"""
+        return is_transient_error(error)
+
+    def _is_resuming(self, error: Exception) -> bool:
+        """Whether a statement failed because the database is waking up (safe to resend)"""
+        return is_resuming_error(error)
 
-    def execute(self, sql: str, parameters: List[Dict] = None) -> Dict:
+    @contextmanager
+    def deadline(self, seconds: float):
+        """
+        Bound how long statements in the block may keep retrying
+
+        Usage:
+            with db.client.deadline(5):
+                db.users.find_by_clerk_id(clerk_user_id)
+        """
+        until = time.monotonic() + seconds
+        current = self._deadline.get()
+        token = self._deadline.set(min(until, current) if current else until)
+        try:
+            yield
+        finally:
+            self._deadline.reset(token)
+
+    def _with_retries(self, func: Callable[[], Any], event=None) -> Any:
+        """
+        Call func, retrying while the database resumes
+
+        Backoff is exponential with full jitter and stops at the caller's
+        deadline (or retry_deadline). Statements inside a transaction are not
+        retried on their own; run_in_transaction retries the whole unit.
+        """
+        deadline = self._deadline.get() or time.monotonic() + self.retry_deadline
+        for attempt in range(1, RETRY_MAX_ATTEMPTS + 1):
+            try:
+                return func()
+            except Exception as e:
+                if self.transaction_id or attempt == RETRY_MAX_ATTEMPTS or not self._is_resuming(e):
+                    raise
+                delay = random.uniform(0, min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY))
+                if time.monotonic() + delay > deadline:
+                    raise
+                logger.warning(f"Database is resuming ({e}), retry {attempt} in {delay:.2f}s")
+                if event is not None:
+                    event.retries += 1
+                time.sleep(delay)
+
+    def execute(self, sql: str, parameters: List[Dict] = None, format_records_as: str = None) -> Dict:
         """
         Execute a SQL statement
 
         Args:
             sql: SQL statement to execute
             parameters: Optional list of parameters for prepared statement
+            format_records_as: Set to 'JSON' to get rows back as formattedRecords
 
         Returns:
-            Response from Data API
+            Data API shaped response
+
+        Statements hitting a paused or resuming cluster are retried with
+        jittered backoff until the deadline (see deadline()).
         """
-        try:
-            kwargs = {
-                "resourceArn": self.cluster_arn,
-                "secretArn": self.secret_arn,
-                "database": self.database,
-                "sql": sql,
-                "includeResultMetadata": True,  # Include column names
-            }
+        with self.instrumentation.measure(sql) as event:
+            if self.instrumentation.enabled:
+                event.request_bytes = request_size(sql, parameters)
+            response = self._with_retries(lambda: self._execute(sql, parameters, format_records_as), event)
+            event.rows = len(response.get("records") or ()) or response.get("numberOfRecordsUpdated", 0)
+            event.response_bytes = response_size(response)
+        return response
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Statement statistics for the active instrumentation scope (or the whole process)"""
+        return self.instrumentation.stats(top)
+
+    def query(self, sql: str, parameters: List[Dict] = None, as_json: bool = False) -> List[Dict]:
+        """
+        Execute a SELECT query and return results as list of dicts
 
-            if parameters:
-                kwargs["parameters"] = parameters
+        Values are decoded using the column types: NUMERIC as numeric_type,
+        JSONB parsed, DATE/TIMESTAMP as date/datetime.
 
-            response = self.client.execute_statement(**kwargs)
-            return response
+        Args:
+            sql: SELECT statement
+            parameters: Optional parameters
+            as_json: Ask the Data API for JSON-formatted records, which is
+                cheaper to decode for wide rows
 
-        except ClientError as e:
-            logger.error(f"Database error: {e}")
-            raise
+        Returns:
+            List of dictionaries with column names as keys
+        """
+        if as_json:
+            response = self.execute(sql, parameters, format_records_as="JSON")
+            if "formattedRecords" not in response:
+                return []
+            return decode_formatted_records(response, self.numeric_type)
 
-    def query(self, sql: str, parameters: List[Dict] = None) -> List[Dict]:
+        response = self.execute(sql, parameters)
+
+        if "records" not in response:
+            return []
+
+        return decode_records(response, self.numeric_type)
+
+    def query_rows(self, sql: str, parameters: List[Dict] = None, row_type: type = None) -> List[Any]:
         """
-        Execute a SELECT query and return results as list of dicts
+        Execute a SELECT query and return typed rows (see rows.py)
 
         Args:
             sql: SELECT statement
             parameters: Optional parameters
+            row_type: Row subclass to build; plain dicts (as query) if None
 
         Returns:
-            List of dictionaries with column names as keys
+            List of row_type instances
         """
+        if row_type is None:
+            return self.query(sql, parameters)
+
         response = self.execute(sql, parameters)
 
         if "records" not in response:
             return []
 
-        # Extract column names
-        columns = [col["name"] for col in response.get("columnMetadata", [])]
+        return decode_rows(response, row_type, self.numeric_type)
 
-        # Convert records to dictionaries
-        results = []
-        for record in response["records"]:
-            row = {}
-            for i, col in enumerate(columns):
-                value = self._extract_value(record[i])
-                row[col] = value
-            results.append(row)
+    def query_columns(self, sql: str, parameters: List[Dict] = None) -> Dict[str, List]:
+        """
+        Execute a SELECT query and return results column by column
 
-        return results
+        Args:
+            sql: SELECT statement
+            parameters: Optional parameters
+
+        Returns:
+            Dictionary mapping each column name to the list of its values
+        """
+        response = self.execute(sql, parameters)
+        return decode_columns(response, self.numeric_type)
 
     def query_one(self, sql: str, parameters: List[Dict] = None) -> Optional[Dict]:
         """
@@ -129,52 +296,104 @@ class DataAPIClient:
         results = self.query(sql, parameters)
         return results[0] if results else None
 
-    def insert(self, table: str, data: Dict, returning: str = None) -> str:
+    def iter_query(
+        self,
+        sql: str,
+        parameters: List[Dict] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        key_columns: Tuple[str, ...] = ("id",),
+        row_type: type = None,
+    ) -> Iterator[Dict]:
+        """
+        Stream the rows of a SELECT query page by page
+
+        Pages are fetched with keyset pagination on key_columns, so each page
+        is an index range scan and memory stays bounded by page_size. A page
+        that exceeds the Data API response size limit is retried at half size.
+
+        Args:
+            sql: SELECT statement without ORDER BY/LIMIT; its result must
+                include key_columns, which must be unique and non-null
+            parameters: Optional parameters
+            page_size: Rows fetched per round trip
+            key_columns: Columns rows are ordered and paged by
+            row_type: Row subclass to yield instead of dicts
+
+        Yields:
+            Decoded rows, ordered by key_columns
+        """
+        keys = ", ".join(f"page.{col}" for col in key_columns)
+        after = None  # raw key fields and type names of the last row seen
+
+        while True:
+            page_parameters = list(parameters or []) + [{"name": "page_size", "value": {"longValue": page_size}}]
+            where = ""
+            if after:
+                bounds = []
+                for i, (field, type_name) in enumerate(after):
+                    page_parameters.append({"name": f"after_key_{i}", "value": field})
+                    bounds.append(f":after_key_{i}::{type_name}" if type_name else f":after_key_{i}")
+                where = f"WHERE ({keys}) > ({', '.join(bounds)})"
+
+            page_sql = f"SELECT * FROM ({sql}) AS page {where} ORDER BY {keys} LIMIT :page_size"
+            try:
+                response = self.execute(page_sql, page_parameters)
+            except Exception as e:
+                if page_size > 1 and "response size limit" in str(e):
+                    page_size //= 2
+                    logger.warning(f"Page too large for one response, retrying with page_size={page_size}")
+                    continue
+                raise
+
+            records = response.get("records") or []
+            if records:
+                if row_type is None:
+                    yield from decode_records(response, self.numeric_type)
+                else:
+                    yield from decode_rows(response, row_type, self.numeric_type)
+
+            if len(records) < page_size:
+                return
+
+            names = [col["name"] for col in response["columnMetadata"]]
+            after = [
+                (records[-1][names.index(col)], response["columnMetadata"][names.index(col)].get("typeName"))
+                for col in key_columns
+            ]
+
+    def insert(self, table: str, data: Dict, returning: str = None,
+               on_conflict: str = None, row_type: type = None) -> Any:
         """
         Insert a record into a table
 
         Args:
             table: Table name
             data: Dictionary of column names and values
-            returning: Column to return (e.g., 'id', 'clerk_user_id')
+            returning: Column to return (e.g., 'id', 'clerk_user_id'), or '*'
+                       for the whole row as stored
+            on_conflict: Conflict clause, e.g. '(clerk_user_id) DO NOTHING'
+            row_type: Row class for a returned row (see rows.py); dict if None
 
         Returns:
-            Value of returning column if specified
+            Value of returning column if specified; for '*' the inserted row,
+            or None when on_conflict skipped it
         """
-        columns = list(data.keys())
-        placeholders = []
-
-        # Check if columns need type casting
-        for col in columns:
-            if isinstance(data[col], (dict, list)):
-                placeholders.append(f":{col}::jsonb")
-            elif isinstance(data[col], Decimal):
-                placeholders.append(f":{col}::numeric")
-            elif isinstance(data[col], date) and not isinstance(data[col], datetime):
-                placeholders.append(f":{col}::date")
-            elif isinstance(data[col], datetime):
-                placeholders.append(f":{col}::timestamp")
-            else:
-                placeholders.append(f":{col}")
-
-        sql = f"""
-            INSERT INTO {table} ({", ".join(columns)})
-            VALUES ({", ".join(placeholders)})
-        """
-
-        # Add RETURNING clause if specified
-        if returning:
-            sql += f" RETURNING {returning}"
+        statement = compile_insert(table, signature(data), returning, on_conflict)
+        if returning == '*':
+            rows = self.query_rows(statement.sql, statement.encode(data), row_type)
+            self.notify_write(table)
+            return rows[0] if rows else None
 
-        parameters = self._build_parameters(data)
-        response = self.execute(sql, parameters)
+        response = self.execute(statement.sql, statement.encode(data))
+        self.notify_write(table)
 
         # Return value if RETURNING was used
         if returning and response.get("records"):
             return self._extract_value(response["records"][0][0])
         return None
 
-    def update(self, table: str, data: Dict, where: str, where_params: Dict = None) -> int:
+    def update(self, table: str, data: Dict, where: str, where_params: Dict = None, merge: Dict = None,
+               returning: str = None, row_type: type = None) -> Any:
         """
         Update records in a table
 
@@ -183,37 +402,27 @@ class DataAPIClient:
             data: Dictionary of columns to update
             where: WHERE clause (without WHERE keyword)
             where_params: Parameters for WHERE clause
+            merge: JSONB column -> dictionary of top-level keys to merge into it
+            returning: Columns to return from each updated row (e.g., 'id' or '*')
+            row_type: Row class for returned rows (see rows.py); dicts if None
 
         Returns:
-            Number of affected rows
-        """
-        # Build SET clause with type casting where needed
-        set_parts = []
-        for col, val in data.items():
-            if isinstance(val, (dict, list)):
-                set_parts.append(f"{col} = :{col}::jsonb")
-            elif isinstance(val, Decimal):
-                set_parts.append(f"{col} = :{col}::numeric")
-            elif isinstance(val, date) and not isinstance(val, datetime):
-                set_parts.append(f"{col} = :{col}::date")
-            elif isinstance(val, datetime):
-                set_parts.append(f"{col} = :{col}::timestamp")
-            else:
-                set_parts.append(f"{col} = :{col}")
-
-        set_clause = ", ".join(set_parts)
-
-        sql = f"""
-            UPDATE {table}
-            SET {set_clause}
-            WHERE {where}
-        """
-
-        # Combine data and where parameters
-        all_params = {**data, **(where_params or {})}
-        parameters = self._build_parameters(all_params)
+            Number of affected rows, or the updated rows if returning is given
+        """
+        where_params = where_params or {}
+        merge = merge or {}
+        statement = compile_update(
+            table, signature(data), where, signature(where_params), returning, merge_columns=tuple(merge)
+        )
+        merge_params = {merge_parameter(col): document for col, document in merge.items()}
+        parameters = statement.encode({**data, **merge_params, **where_params})
+        if returning:
+            rows = self.query_rows(statement.sql, parameters, row_type)
+            self.notify_write(table)
+            return rows
 
-        response = self.execute(sql, parameters)
+        response = self.execute(statement.sql, parameters)
+        self.notify_write(table)
         return response.get("numberOfRecordsUpdated", 0)
 
     def delete(self, table: str, where: str, where_params: Dict = None) -> int:
@@ -232,12 +441,342 @@ class DataAPIClient:
         parameters = self._build_parameters(where_params) if where_params else None
 
         response = self.execute(sql, parameters)
+        self.notify_write(table)
         return response.get("numberOfRecordsUpdated", 0)
 
+
+    def execute_many(self, sql: str, parameter_sets: List[List[Dict]]) -> List[Dict]:
+        """
+        Execute the same SQL statement once per parameter set in batches
+
+        Parameter sets are split into chunks that stay under the Data API request
+        limits, so a few hundred rows cost a handful of round trips.
+
+        Args:
+            sql: SQL statement to execute
+            parameter_sets: List of parameter lists, one per row
+
+        Returns:
+            One update result per parameter set, in input order
+        """
+        results = []
+        for chunk in self._chunk_parameter_sets(sql, parameter_sets):
+            with self.instrumentation.measure(sql, operation="batch") as event:
+                if self.instrumentation.enabled:
+                    event.request_bytes = request_size(sql, chunk)
+                update_results = self._with_retries(lambda: self._batch_execute(sql, chunk), event)
+                event.rows = len(chunk)
+            # Pad so callers can always zip results with their input rows
+            update_results += [{}] * (len(chunk) - len(update_results))
+            results.extend(update_results)
+
+        return results
+
+    def insert_many(self, table: str, rows: List[Dict], returning: str = None) -> List[Any]:
+        """
+        Insert many records into a table in as few round trips as possible
+
+        Args:
+            table: Table name
+            rows: List of dictionaries, all with the same column names
+            returning: Column to return for each row (e.g., 'id', 'symbol')
+
+        Returns:
+            Value of returning column for each row (None if not specified)
+        """
+        if not rows:
+            return []
+
+        columns = list(rows[0].keys())
+        self._check_same_columns(rows, columns)
+
+        statement = compile_insert(table, self._column_signature(rows, columns), returning)
+        results = self.execute_many(statement.sql, [statement.encode(row) for row in rows])
+        self.notify_write(table)
+        return [self._generated_value(result) if returning else None for result in results]
+
+    def update_many(
+        self, table: str, updates: List[Tuple[Dict, Dict]], where: str, returning: str = None
+    ) -> List[Any]:
+        """
+        Apply many updates that share the same columns and WHERE clause
+
+        Args:
+            table: Table name
+            updates: List of (data, where_params) tuples, one per row
+            where: WHERE clause (without WHERE keyword)
+            returning: Column to return for each updated row
+
+        Returns:
+            Value of returning column for each update (None if not specified
+            or if no row matched)
+        """
+        if not updates:
+            return []
+
+        datas = [data for data, _ in updates]
+        columns = list(datas[0].keys())
+        self._check_same_columns(datas, columns)
+
+        where_params = [where_params or {} for _, where_params in updates]
+        where_columns = list(where_params[0].keys())
+        self._check_same_columns(where_params, where_columns)
+
+        statement = compile_update(
+            table,
+            self._column_signature(datas, columns),
+            where,
+            self._column_signature(where_params, where_columns),
+            returning,
+        )
+        results = self.execute_many(
+            statement.sql,
+            [statement.encode({**data, **params}) for data, params in zip(datas, where_params)],
+        )
+        self.notify_write(table)
+        return [self._generated_value(result) if returning else None for result in results]
+
+
+    def on_write(self, listener: Callable[[str], None]):
+        """Register a callback run with the table name whenever a helper writes to it"""
+        self._write_listeners.append(listener)
+
+    def notify_write(self, table: str):
+        """
+        Tell listeners (caches) that a table changed
+
+        Called by insert/update/delete and their batch versions; call it
+        yourself after writing through execute/execute_many.
+        """
+        if self.transaction_id:
+            self._transaction_writes.setdefault(self.transaction_id, set()).add(table)
+        for listener in self._write_listeners:
+            listener(table)
+
+    def finish_transaction(self, transaction_id: str):
+        """Notify the tables written in a transaction again once it has committed or rolled back"""
+        for table in self._transaction_writes.pop(transaction_id, ()):
+            for listener in self._write_listeners:
+                listener(table)
+
+    @property
+    def transaction_id(self) -> Optional[str]:
+        """ID of the transaction statements are currently running in, if any"""
+        return self._transaction_id.get()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run every statement inside the block in one transaction
+
+        Commits when the block exits normally and rolls back on any exception.
+        Nested blocks join the outer transaction.
+
+        Yields:
+            The transaction ID
+        """
+        if self.transaction_id:
+            yield self.transaction_id
+            return
+
+        transaction_id = self.begin_transaction()
+        try:
+            with self.use_transaction(transaction_id):
+                yield transaction_id
+        except BaseException:
+            try:
+                self.rollback_transaction(transaction_id)
+            except Exception as e:
+                logger.warning(f"Rollback of transaction {transaction_id} failed: {e}")
+            finally:
+                self.finish_transaction(transaction_id)
+            raise
+        try:
+            self.commit_transaction(transaction_id)
+        finally:
+            self.finish_transaction(transaction_id)
+
+    @contextmanager
+    def use_transaction(self, transaction_id: str):
+        """Bind statements in the block to an already started transaction"""
+        token = self._transaction_id.set(transaction_id)
+        try:
+            yield transaction_id
+        finally:
+            self._transaction_id.reset(token)
+
+    def run_in_transaction(self, func: Callable[[], Any], max_attempts: int = 3) -> Any:
+        """
+        Run func in a transaction, retrying the whole unit on transient errors
+
+        Args:
+            func: Callable doing the work; it is re-run from scratch on retry
+            max_attempts: Maximum number of attempts
+
+        Returns:
+            Whatever func returns
+        """
+        if self.transaction_id:
+            return func()
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                with self.transaction():
+                    return func()
+            except Exception as e:
+                if attempt == max_attempts or not self._is_transient(e):
+                    raise
+                delay = min(0.2 * 2 ** attempt, 5) * random.uniform(0.5, 1)
+                logger.warning(f"Transaction attempt {attempt} failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+
+    def _chunk_parameter_sets(self, sql: str, parameter_sets: List[List[Dict]]):
+        """Split parameter sets into chunks that fit in one batch request"""
+        chunk = []
+        chunk_bytes = len(sql)
+        for parameter_set in parameter_sets:
+            size = len(json.dumps(parameter_set, default=str))
+            if chunk and (
+                len(chunk) >= MAX_BATCH_PARAMETER_SETS
+                or chunk_bytes + size > MAX_BATCH_REQUEST_BYTES
+            ):
+                yield chunk
+                chunk = []
+                chunk_bytes = len(sql)
+            chunk.append(parameter_set)
+            chunk_bytes += size
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _check_same_columns(rows: List[Dict], columns: List[str]):
+        """Batch statements need every row to bind the same parameters"""
+        expected = set(columns)
+        for row in rows:
+            if set(row.keys()) != expected:
+                raise ValueError(
+                    f"All rows must have the same columns: expected {sorted(expected)}, "
+                    f"got {sorted(row.keys())}"
+                )
+
+    @staticmethod
+    def _column_signature(rows: List[Dict], columns: List[str]) -> Signature:
+        """Signature typed by each column's first non-null value, used to pick its cast"""
+        column_types = []
+        for col in columns:
+            value = next((row[col] for row in rows if row[col] is not None), None)
+            column_types.append((col, type(value)))
+        return tuple(column_types)
+
+    def _generated_value(self, update_result: Dict) -> Any:
+        """Extract the RETURNING value from a batch update result"""
+        fields = update_result.get("generatedFields") or []
+        return self._extract_value(fields[0]) if fields else None
+
+    def _build_parameters(self, data: Dict) -> List[Dict]:
+        """Convert dictionary to Data API parameter format"""
+        if not data:
+            return []
+
+        return [{"name": key, "value": encode_value(value)} for key, value in data.items()]
+
+    def _extract_value(self, field: Dict) -> Any:
+        """Extract value from Data API field response"""
+        return extract_value(field)
+
+
+class DataAPIClient(BaseClient):
+    """Wrapper for AWS RDS Data API to simplify database operations"""
+
+    def __init__(
+        self,
+        cluster_arn: str = None,
+        secret_arn: str = None,
+        database: str = None,
+        region: str = None,
+        numeric_type: type = float,
+        instrumentation: Instrumentation = None,
+    ):
+        """
+        Initialize Data API client
+
+        Args:
+            cluster_arn: Aurora cluster ARN (or from env AURORA_CLUSTER_ARN)
+            secret_arn: Secrets Manager ARN (or from env AURORA_SECRET_ARN)
+            database: Database name (or from env AURORA_DATABASE)
+            region: AWS region (or from env AWS_REGION)
+            numeric_type: Type used for NUMERIC/DECIMAL columns (float or Decimal)
+            instrumentation: Where statement timings go (defaults to the process-wide one)
+        """
+        self.cluster_arn = cluster_arn or os.environ.get("AURORA_CLUSTER_ARN")
+        self.secret_arn = secret_arn or os.environ.get("AURORA_SECRET_ARN")
+        self.database = database or os.environ.get("AURORA_DATABASE", "alex")
+
+        if not self.cluster_arn or not self.secret_arn:
+            raise ValueError(
+                "Missing required Aurora configuration. "
+                "Set AURORA_CLUSTER_ARN and AURORA_SECRET_ARN environment variables."
+            )
+
+        super().__init__(numeric_type, instrumentation)
+        self.region = os.environ.get("DEFAULT_AWS_REGION", "us-east-1")
+        self.client = boto3.client("rds-data", region_name=self.region)
+
+
+    def _execute(self, sql: str, parameters: List[Dict] = None, format_records_as: str = None) -> Dict:
+        """Run one statement through execute_statement"""
+        try:
+            kwargs = {
+                "resourceArn": self.cluster_arn,
+                "secretArn": self.secret_arn,
+                "database": self.database,
+                "sql": sql,
+                "includeResultMetadata": True,  # Include column names
+            }
+
+            if parameters:
+                kwargs["parameters"] = parameters
+            if format_records_as:
+                kwargs["formatRecordsAs"] = format_records_as
+            if self.transaction_id:
+                kwargs["transactionId"] = self.transaction_id
+
+            response = self.client.execute_statement(**kwargs)
+            return response
+
+        except ClientError as e:
+            logger.error(f"Database error: {e}")
+            raise
+
+
+    def _batch_execute(self, sql: str, parameter_sets: List[List[Dict]]) -> List[Dict]:
+        """Run one chunk through batch_execute_statement"""
+        kwargs = {
+            "resourceArn": self.cluster_arn,
+            "secretArn": self.secret_arn,
+            "database": self.database,
+            "sql": sql,
+            "parameterSets": parameter_sets,
+        }
+        if self.transaction_id:
+            kwargs["transactionId"] = self.transaction_id
+
+        try:
+            response = self.client.batch_execute_statement(**kwargs)
+        except ClientError as e:
+            logger.error(f"Database batch error: {e}")
+            raise
+
+        return response.get("updateResults", [])
+
     def begin_transaction(self) -> str:
         """Begin a database transaction"""
-        response = self.client.begin_transaction(
-            resourceArn=self.cluster_arn, secretArn=self.secret_arn, database=self.database
+        # Usually the first call after idle, so it waits for a paused cluster too
+        response = self._with_retries(
+            lambda: self.client.begin_transaction(
+                resourceArn=self.cluster_arn, secretArn=self.secret_arn, database=self.database
+            )
         )
         return response["transactionId"]
 
@@ -252,59 +791,3 @@ class DataAPIClient:
         self.client.rollback_transaction(
             resourceArn=self.cluster_arn, secretArn=self.secret_arn, transactionId=transaction_id
         )
-
-    def _build_parameters(self, data: Dict) -> List[Dict]:
-        """Convert dictionary to Data API parameter format"""
-        if not data:
-            return []
-
-        parameters = []
-        for key, value in data.items():
-            param = {"name": key}
-
-            if value is None:
-                param["value"] = {"isNull": True}
-            elif isinstance(value, bool):
-                param["value"] = {"booleanValue": value}
-            elif isinstance(value, int):
-                param["value"] = {"longValue": value}
-            elif isinstance(value, float):
-                param["value"] = {"doubleValue": value}
-            elif isinstance(value, Decimal):
-                param["value"] = {"stringValue": str(value)}
-            elif isinstance(value, (date, datetime)):
-                param["value"] = {"stringValue": value.isoformat()}
-            elif isinstance(value, dict):
-                param["value"] = {"stringValue": json.dumps(value)}
-            elif isinstance(value, list):
-                param["value"] = {"stringValue": json.dumps(value)}
-            else:
-                param["value"] = {"stringValue": str(value)}
-
-            parameters.append(param)
-
-        return parameters
-
-    def _extract_value(self, field: Dict) -> Any:
-        """Extract value from Data API field response"""
-        if field.get("isNull"):
-            return None
-        elif "booleanValue" in field:
-            return field["booleanValue"]
-        elif "longValue" in field:
-            return field["longValue"]
-        elif "doubleValue" in field:
-            return field["doubleValue"]
-        elif "stringValue" in field:
-            value = field["stringValue"]
-            # Try to parse JSON if it looks like JSON
-            if value and value[0] in ["{", "["]:
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    pass
-            return value
-        elif "blobValue" in field:
-            return field["blobValue"]
-        else:
-            return None
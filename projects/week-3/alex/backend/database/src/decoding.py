@@ -0,0 +1,202 @@
+"""
+Result decoding for Data API responses
+Builds one converter per column from columnMetadata instead of inspecting every cell
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List
+
+Converter = Callable[[Any], Any]
+
+INTEGER_TYPES = {"int2", "int4", "int8", "serial", "serial4", "serial8", "bigserial", "oid"}
+FLOAT_TYPES = {"float4", "float8"}
+NUMERIC_TYPES = {"numeric", "decimal", "money"}
+JSON_TYPES = {"json", "jsonb"}
+TIMESTAMP_TYPES = {"timestamp", "timestamptz"}
+BOOLEAN_TYPES = {"bool"}
+TEXT_TYPES = {"varchar", "text", "bpchar", "char", "name", "uuid", "citext"}
+
+
+def extract_value(field: Dict) -> Any:
+    """Extract value from a Data API field without type information"""
+    if field.get("isNull"):
+        return None
+    elif "booleanValue" in field:
+        return field["booleanValue"]
+    elif "longValue" in field:
+        return field["longValue"]
+    elif "doubleValue" in field:
+        return field["doubleValue"]
+    elif "stringValue" in field:
+        value = field["stringValue"]
+        # Try to parse JSON if it looks like JSON
+        if value and value[0] in ["{", "["]:
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                pass
+        return value
+    elif "blobValue" in field:
+        return field["blobValue"]
+    else:
+        return None
+
+
+def _parse_timestamp(value: str) -> Any:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def _parse_date(value: str) -> Any:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def _string_parser(type_name: str, numeric_type: type) -> Converter:
+    """Parser applied to the string form of a column, or None to keep the string"""
+    if type_name in NUMERIC_TYPES:
+        return numeric_type
+    if type_name in JSON_TYPES:
+        return json.loads
+    if type_name in TIMESTAMP_TYPES:
+        return _parse_timestamp
+    if type_name == "date":
+        return _parse_date
+    return None
+
+
+def _field_converter(type_name: str, numeric_type: type) -> Converter:
+    """Converter from a Data API field dict to a Python value"""
+    if type_name in TEXT_TYPES:
+        key = "stringValue"
+    elif type_name in INTEGER_TYPES:
+        key = "longValue"
+    elif type_name in FLOAT_TYPES:
+        key = "doubleValue"
+    elif type_name in BOOLEAN_TYPES:
+        key = "booleanValue"
+    else:
+        key = None
+
+    if key:
+        def convert(field):
+            return field[key] if key in field else extract_value(field)
+        return convert
+
+    parse = _string_parser(type_name, numeric_type)
+    if parse is None:
+        return extract_value
+
+    def convert_string(field):
+        value = field.get("stringValue")
+        if value is None:
+            return extract_value(field)
+        return parse(value)
+    return convert_string
+
+
+def _json_converter(type_name: str, numeric_type: type) -> Converter:
+    """Converter for a value from formattedRecords, or None if it needs no work"""
+    if type_name in NUMERIC_TYPES:
+        def convert_numeric(value):
+            if value is None:
+                return None
+            return numeric_type(value if isinstance(value, str) else str(value))
+        return convert_numeric
+
+    if type_name in JSON_TYPES:
+        def convert_json(value):
+            return json.loads(value) if isinstance(value, str) else value
+        return convert_json
+
+    parse = _string_parser(type_name, numeric_type)
+    if parse is None:
+        return None
+
+    def convert_string(value):
+        return parse(value) if isinstance(value, str) else value
+    return convert_string
+
+
+def build_converters(column_metadata: List[Dict], numeric_type: type = float) -> List[Converter]:
+    """Build one field converter per column of a result set"""
+    return [
+        _field_converter(col.get("typeName", "").lower(), numeric_type)
+        for col in column_metadata
+    ]
+
+
+def decode_records(response: Dict, numeric_type: type = float) -> List[Dict]:
+    """Decode Data API records into a list of dicts keyed by column name"""
+    metadata = response.get("columnMetadata", [])
+    columns = [col["name"] for col in metadata]
+    converters = build_converters(metadata, numeric_type)
+    pairs = list(zip(columns, converters))
+
+    return [
+        {col: convert(field) for (col, convert), field in zip(pairs, record)}
+        for record in response["records"]
+    ]
+
+
+def decode_columns(response: Dict, numeric_type: type = float) -> Dict[str, List]:
+    """Decode Data API records into a dict of column name to list of values"""
+    metadata = response.get("columnMetadata", [])
+    converters = build_converters(metadata, numeric_type)
+    records = response.get("records", [])
+
+    return {
+        col["name"]: [convert(record[i]) for record in records]
+        for i, (col, convert) in enumerate(zip(metadata, converters))
+    }
+
+
+def decode_formatted_records(response: Dict, numeric_type: type = float) -> List[Dict]:
+    """Decode rows returned with formatRecordsAs='JSON'"""
+    rows = json.loads(response["formattedRecords"])
+    conversions = []
+    for col in response.get("columnMetadata", []):
+        convert = _json_converter(col.get("typeName", "").lower(), numeric_type)
+        if convert:
+            conversions.append((col["name"], convert))
+
+    for row in rows:
+        for col, convert in conversions:
+            if col in row:
+                row[col] = convert(row[col])
+    return rows
+
+
+def _raw_json(field: Dict) -> Any:
+    """JSONB value left as text, for rows that parse it lazily"""
+    return None if field.get("isNull") else field.get("stringValue")
+
+
+def decode_rows(response: Dict, row_type: type, numeric_type: type = float) -> List[Any]:
+    """
+    Decode Data API records into typed rows (see rows.py)
+
+    Columns the row type doesn't declare are dropped and missing ones are None;
+    its JSONB columns keep their text so they are only parsed if read.
+    """
+    metadata = response.get("columnMetadata", [])
+    names = [col["name"] for col in metadata]
+    converters = build_converters(metadata, numeric_type)
+
+    plan = []
+    for field in row_type._fields:
+        if field not in names:
+            plan.append((None, None))
+            continue
+        i = names.index(field)
+        plan.append((i, _raw_json if field in row_type._json_fields else converters[i]))
+
+    return [
+        row_type(*[convert(record[i]) if convert else None for i, convert in plan])
+        for record in response.get("records", [])
+    ]
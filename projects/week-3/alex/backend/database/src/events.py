@@ -0,0 +1,160 @@
+"""
+Job progress events
+The planner and agents publish stage transitions for a job (tagging, pricing,
+the agents starting, each agent's result landing, completion); the API streams
+them to the browser as server-sent events. Events are numbered per job from 1 in the order they
+were committed, so a reader resumes after the last one it saw without missing
+or repeating any.
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .client import BaseClient
+
+# Stage events
+STARTED = 'started'
+TAGGING = 'tagging'
+PRICING = 'pricing'
+ANALYZING = 'analyzing'
+REPORTER_DONE = 'reporter_done'
+CHARTER_DONE = 'charter_done'
+RETIREMENT_DONE = 'retirement_done'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+# Events that end a job's stream
+TERMINAL_EVENTS = (COMPLETED, FAILED)
+
+# Event published when each agent's result column is written
+PAYLOAD_EVENTS = {
+    'report_payload': REPORTER_DONE,
+    'charts_payload': CHARTER_DONE,
+    'retirement_payload': RETIREMENT_DONE,
+}
+
+# Event published for each job status
+STATUS_EVENTS = {
+    'running': STARTED,
+    'completed': COMPLETED,
+    'failed': FAILED,
+}
+
+
+@dataclass
+class JobEvent:
+    """One published event; seq orders a job's events from 1"""
+
+    job_id: str
+    seq: int
+    event: str
+    data: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+
+
+class EventBroker(ABC):
+    """Base class for job event brokers"""
+
+    @abstractmethod
+    def publish(self, job_id: str, event: str, data: Dict[str, Any] = None) -> JobEvent:
+        """Append an event to a job's stream, numbered after its last one"""
+
+    @abstractmethod
+    def read(self, job_id: str, after: int = 0, limit: int = 100) -> List[JobEvent]:
+        """A job's events with seq greater than after, oldest first"""
+
+
+class MemoryEventBroker(EventBroker):
+    """
+    Events kept in process memory
+
+    For local development and tests, where the API and the agents share one
+    process; events are lost when it exits.
+    """
+
+    def __init__(self):
+        self._events: Dict[str, List[JobEvent]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any] = None) -> JobEvent:
+        job_id = str(job_id)
+        with self._lock:
+            events = self._events.setdefault(job_id, [])
+            published = JobEvent(job_id, len(events) + 1, event, data, datetime.now(timezone.utc))
+            events.append(published)
+        return published
+
+    def read(self, job_id: str, after: int = 0, limit: int = 100) -> List[JobEvent]:
+        with self._lock:
+            # seq n is at index n - 1
+            return self._events.get(str(job_id), [])[after:after + limit]
+
+
+class DatabaseEventBroker(EventBroker):
+    """Events stored in the job_events table, shared by every Lambda and API instance"""
+
+    # Taking the next number from the job row locks it until the insert
+    # commits, so a job's events commit in seq order and a reader polling for
+    # seq > n can never skip one that commits late
+    PUBLISH_SQL = """
+        WITH next AS (
+            UPDATE jobs SET event_seq = event_seq + 1
+            WHERE id = :job_id::uuid
+            RETURNING id, event_seq
+        )
+        INSERT INTO job_events (job_id, seq, event, data)
+        SELECT id, event_seq, :event, :data::jsonb FROM next
+        RETURNING seq, created_at
+    """
+
+    READ_SQL = """
+        SELECT seq, event, data, created_at
+        FROM job_events
+        WHERE job_id = :job_id::uuid AND seq > :after
+        ORDER BY seq
+        LIMIT :limit
+    """
+
+    def __init__(self, client: BaseClient):
+        self.client = client
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any] = None) -> JobEvent:
+        row = self.client.query_one(self.PUBLISH_SQL, [
+            {'name': 'job_id', 'value': {'stringValue': str(job_id)}},
+            {'name': 'event', 'value': {'stringValue': event}},
+            {'name': 'data', 'value': {'stringValue': json.dumps(data or {}, default=str)}},
+        ])
+        if row is None:
+            raise ValueError(f"Job not found: {job_id}")
+        return JobEvent(str(job_id), row['seq'], event, data, row['created_at'])
+
+    def read(self, job_id: str, after: int = 0, limit: int = 100) -> List[JobEvent]:
+        rows = self.client.query(self.READ_SQL, [
+            {'name': 'job_id', 'value': {'stringValue': str(job_id)}},
+            {'name': 'after', 'value': {'longValue': after}},
+            {'name': 'limit', 'value': {'longValue': limit}},
+        ])
+        return [JobEvent(str(job_id), row['seq'], row['event'], row['data'], row['created_at']) for row in rows]
+
+
+def event_broker_from_env(client: BaseClient) -> Optional[EventBroker]:
+    """
+    Broker selected by JOB_EVENTS_BROKER: "database", "memory", or "none"
+    (default) to publish nothing
+
+    The database broker costs an extra statement per job write (the event
+    insert, which also bumps jobs.event_seq), so deployments opt in to it.
+    """
+    kind = os.environ.get('JOB_EVENTS_BROKER', 'none')
+    if kind == 'database':
+        return DatabaseEventBroker(client)
+    if kind == 'memory':
+        return MemoryEventBroker()
+    if kind == 'none':
+        return None
+    raise ValueError(f"Unknown job events broker: {kind} (expected 'database', 'memory' or 'none')")
@@ -0,0 +1,247 @@
+"""
+Per-statement instrumentation
+Records latency, rows, payload sizes and retries for every statement, keyed by
+a fingerprint of its SQL, and hands them to pluggable sinks (log, in-memory
+histogram, JSONL file). Scopes collect the statements of one API request or
+Lambda invocation so N+1 query patterns show up in db.stats().
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# A fingerprint executed at least this many times in one scope is reported as a hotspot
+HOTSPOT_MIN_CALLS = 3
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w:$])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """Normalise SQL so statements differing only in literals group together"""
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class StatementEvent:
+    """Measurements for one statement (or one batch request)"""
+
+    fingerprint: str
+    operation: str = "execute"
+    duration_ms: float = 0.0
+    rows: int = 0
+    request_bytes: int = 0
+    response_bytes: Optional[int] = None
+    retries: int = 0
+    error: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+class LogSink:
+    """Logs one line per statement"""
+
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+
+    def record(self, event: StatementEvent):
+        logger.log(
+            self.level,
+            f"DB {event.operation} {event.duration_ms:.1f}ms rows={event.rows} "
+            f"req={event.request_bytes}B resp={event.response_bytes}B retries={event.retries}"
+            f"{' error=' + event.error if event.error else ''} | {event.fingerprint[:200]}",
+        )
+
+
+class JsonlSink:
+    """Appends one JSON object per statement to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, event: StatementEvent):
+        line = json.dumps(asdict(event))
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+class MemorySink:
+    """Aggregates statements per fingerprint: counts, latency histogram, rows, bytes, retries"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, event: StatementEvent):
+        with self._lock:
+            stats = self._stats.get(event.fingerprint)
+            if stats is None:
+                stats = self._stats[event.fingerprint] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "request_bytes": 0,
+                    "response_bytes": 0,
+                    "retries": 0,
+                    "histogram": defaultdict(int),
+                }
+            stats["calls"] += 1
+            stats["errors"] += 1 if event.error else 0
+            stats["total_ms"] += event.duration_ms
+            stats["max_ms"] = max(stats["max_ms"], event.duration_ms)
+            stats["rows"] += event.rows
+            stats["request_bytes"] += event.request_bytes
+            stats["response_bytes"] += event.response_bytes or 0
+            stats["retries"] += event.retries
+            bucket = next((b for b in LATENCY_BUCKETS_MS if event.duration_ms <= b), "inf")
+            stats["histogram"][bucket] += 1
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Totals plus the statements that took the most time and the likely N+1 hotspots"""
+        with self._lock:
+            statements = [
+                {"fingerprint": fp, **stats, "histogram": dict(stats["histogram"])}
+                for fp, stats in self._stats.items()
+            ]
+
+        for statement in statements:
+            statement["avg_ms"] = statement["total_ms"] / statement["calls"]
+
+        by_time = sorted(statements, key=lambda s: s["total_ms"], reverse=True)
+        return {
+            "statements": sum(s["calls"] for s in statements),
+            "total_ms": sum(s["total_ms"] for s in statements),
+            "rows": sum(s["rows"] for s in statements),
+            "retries": sum(s["retries"] for s in statements),
+            "top": by_time[:top],
+            "hotspots": [
+                {"fingerprint": s["fingerprint"], "calls": s["calls"], "total_ms": s["total_ms"]}
+                for s in sorted(statements, key=lambda s: s["calls"], reverse=True)
+                if s["calls"] >= HOTSPOT_MIN_CALLS
+            ],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def sinks_from_env(spec: str = None) -> List[Any]:
+    """
+    Build sinks from a comma-separated spec (or env DB_INSTRUMENTATION)
+
+    Examples: "memory" (default), "memory,log", "jsonl:/tmp/db.jsonl", "off"
+    """
+    spec = spec if spec is not None else os.getenv("DB_INSTRUMENTATION", "memory")
+    sinks = []
+    for name in filter(None, (part.strip() for part in spec.split(","))):
+        if name == "memory":
+            sinks.append(MemorySink())
+        elif name == "log":
+            sinks.append(LogSink())
+        elif name.startswith("jsonl:"):
+            sinks.append(JsonlSink(name[len("jsonl:"):]))
+        elif name != "off":
+            logger.warning(f"Unknown instrumentation sink: {name}")
+    return sinks
+
+
+class Instrumentation:
+    """Dispatches statement events to sinks and to the active scope"""
+
+    def __init__(self, sinks: List[Any] = None):
+        self.sinks = sinks if sinks is not None else sinks_from_env()
+        self._scope = ContextVar(f"instrumentation_scope_{id(self)}", default=None)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks) or self._scope.get() is not None
+
+    def add_sink(self, sink: Any):
+        self.sinks.append(sink)
+
+    def record(self, event: StatementEvent):
+        scope = self._scope.get()
+        if scope is not None:
+            scope.record(event)
+        for sink in self.sinks:
+            try:
+                sink.record(event)
+            except Exception as e:
+                logger.warning(f"Instrumentation sink {type(sink).__name__} failed: {e}")
+
+    @contextmanager
+    def measure(self, sql: str, operation: str = "execute", request_bytes: int = 0):
+        """
+        Time a statement; the caller fills in rows/response_bytes/retries on the event
+
+        Usage:
+            with instrumentation.measure(sql) as event:
+                response = ...
+                event.rows = len(response.get("records", []))
+        """
+        if not self.enabled:
+            yield StatementEvent(fingerprint="")
+            return
+
+        event = StatementEvent(fingerprint=fingerprint(sql), operation=operation, request_bytes=request_bytes)
+        started = time.perf_counter()
+        try:
+            yield event
+        except Exception as e:
+            event.error = type(e).__name__
+            raise
+        finally:
+            event.duration_ms = (time.perf_counter() - started) * 1000
+            self.record(event)
+
+    @contextmanager
+    def scope(self):
+        """
+        Collect the statements run inside the block (one request or invocation)
+
+        Usage:
+            with db.instrumentation.scope() as stats:
+                handle(event)
+            logger.info(stats.summary())
+        """
+        collector = MemorySink()
+        token = self._scope.set(collector)
+        try:
+            yield collector
+        finally:
+            self._scope.reset(token)
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Summary for the active scope, or for the process if no scope is active"""
+        scope = self._scope.get()
+        if scope is not None:
+            return scope.summary(top)
+        memory = next((s for s in self.sinks if isinstance(s, MemorySink)), None)
+        return memory.summary(top) if memory else MemorySink().summary(top)
+
+
+# Shared by every client in the process, so warm Lambda containers keep their totals
+default_instrumentation = Instrumentation()
@@ -0,0 +1,84 @@
+"""
+Keep-warm pinger for Aurora Serverless
+Issues a cheap query on an interval so the cluster does not auto-pause between
+user requests. Run it either as a scheduled Lambda (EventBridge rate rule
+pointing at lambda_handler) or as a background thread in a long-running service.
+
+Keeping the cluster warm trades its idle-time savings for no resume delay,
+so it is opt-in.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from .client import BaseClient, DataAPIClient
+
+logger = logging.getLogger(__name__)
+
+KEEP_WARM_SQL = "SELECT 1"
+
+# Aurora Serverless v2 pauses after 5 minutes idle at the earliest
+DEFAULT_INTERVAL_SECONDS = 240
+
+# Long enough for a full resume (typically 15-30 seconds)
+PING_DEADLINE_SECONDS = 60
+
+
+def ping(client: BaseClient) -> float:
+    """Run the keep-warm query, waiting for a resume if needed; returns latency in ms"""
+    started = time.perf_counter()
+    with client.deadline(PING_DEADLINE_SECONDS):
+        client.execute(KEEP_WARM_SQL)
+    return (time.perf_counter() - started) * 1000
+
+
+class KeepWarm:
+    """Background thread pinging the database every interval seconds"""
+
+    def __init__(self, client: BaseClient, interval: float = DEFAULT_INTERVAL_SECONDS):
+        self.client = client
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "KeepWarm":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="alex-db-keepwarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                latency = ping(self.client)
+                logger.debug(f"Keep-warm ping took {latency:.0f}ms")
+            except Exception as e:
+                logger.warning(f"Keep-warm ping failed: {e}")
+            self._stop.wait(self.interval)
+
+
+def start_from_env(client: BaseClient) -> Optional[KeepWarm]:
+    """Start a KeepWarm thread if DB_KEEP_WARM_SECONDS is set"""
+    interval = os.getenv("DB_KEEP_WARM_SECONDS")
+    if not interval:
+        return None
+    logger.info(f"Keeping database warm every {interval}s")
+    return KeepWarm(client, float(interval)).start()
+
+
+def lambda_handler(event, context):
+    """Scheduled entry point: ping the cluster once"""
+    try:
+        latency = ping(DataAPIClient())
+        logger.info(f"Keep-warm ping took {latency:.0f}ms")
+        return {"statusCode": 200, "body": json.dumps({"latency_ms": round(latency)})}
+    except Exception as e:
+        logger.error(f"Keep-warm ping failed: {e}")
+        return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
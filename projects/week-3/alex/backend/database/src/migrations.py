@@ -0,0 +1,181 @@
+"""
+Versioned schema migrations
+Applies the numbered SQL files in migrations/ in order, each in its own
+transaction, and records them in schema_migrations so every file runs once.
+The Data API runs one statement per call, so files are split into statements
+(dollar-quoted function bodies and comments are handled).
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .client import BaseClient
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+_FILENAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+_DOLLAR_TAG = re.compile(r"\$[A-Za-z_]*\$")
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum VARCHAR(64) NOT NULL,
+        applied_at TIMESTAMP DEFAULT NOW()
+    )
+"""
+
+# Tables created by 001: a database that has them but no schema_migrations was
+# set up by the old statement-list runner
+BASELINE_TABLE = "users"
+
+
+@dataclass
+class Migration:
+    """One numbered SQL file"""
+
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text()
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+    def statements(self) -> List[str]:
+        return split_statements(self.sql)
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a SQL script on top-level semicolons, skipping comments and quoted text"""
+    statements = []
+    current = []
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = len(sql) if end == -1 else end
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = len(sql) if end == -1 else end + 2
+            continue
+        if char == "'":
+            end = i + 1
+            while True:
+                end = sql.find("'", end)
+                if end == -1 or not sql.startswith("''", end):
+                    break
+                end += 2
+            end = len(sql) if end == -1 else end + 1
+            current.append(sql[i:end])
+            i = end
+            continue
+        tag = _DOLLAR_TAG.match(sql, i) if char == "$" else None
+        if tag:
+            end = sql.find(tag.group(), tag.end())
+            end = len(sql) if end == -1 else end + len(tag.group())
+            current.append(sql[i:end])
+            i = end
+            continue
+        if char == ";":
+            statements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    statements.append("".join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Numbered migration files in version order"""
+    migrations = []
+    for path in Path(directory).glob("*.sql"):
+        match = _FILENAME.match(path.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    migrations.sort(key=lambda m: m.version)
+
+    versions = [m.version for m in migrations]
+    duplicates = {v for v in versions if versions.count(v) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate migration versions: {sorted(duplicates)}")
+    return migrations
+
+
+class MigrationRunner:
+    """Applies pending migrations and records them in schema_migrations"""
+
+    def __init__(self, client: BaseClient, directory: Path = MIGRATIONS_DIR):
+        self.client = client
+        self.migrations = discover(directory)
+
+    def applied(self) -> Dict[int, Dict]:
+        """Applied migrations by version"""
+        self.client.execute(CREATE_TABLE_SQL)
+        rows = self.client.query("SELECT version, name, checksum, applied_at FROM schema_migrations")
+        return {row["version"]: row for row in rows}
+
+    def pending(self) -> List[Migration]:
+        applied = self.applied()
+        for migration in self.migrations:
+            row = applied.get(migration.version)
+            if row and row["checksum"] != migration.checksum:
+                logger.warning(f"Migration {migration.version:03d}_{migration.name} changed after it was applied")
+        return [m for m in self.migrations if m.version not in applied]
+
+    def baseline(self) -> Optional[Migration]:
+        """
+        Mark 001 as applied on a database created before schema_migrations existed
+
+        Later files are written to be re-runnable (IF NOT EXISTS, OR REPLACE,
+        DROP ... IF EXISTS), so they are safe over a schema the old runner
+        already brought up to date.
+        """
+        if self.applied() or not self.migrations:
+            return None
+        exists = self.client.query_one(
+            "SELECT to_regclass(:table) IS NOT NULL AS present",
+            [{"name": "table", "value": {"stringValue": BASELINE_TABLE}}],
+        )
+        if not exists or not exists["present"]:
+            return None
+        first = self.migrations[0]
+        self._record(first)
+        logger.info(f"Baselined existing schema at {first.version:03d}_{first.name}")
+        return first
+
+    def apply(self, migration: Migration):
+        """Run one migration and record it, all in one transaction"""
+        with self.client.transaction():
+            for statement in migration.statements():
+                self.client.execute(statement)
+            self._record(migration)
+
+    def run(self) -> List[Migration]:
+        """Apply every pending migration in order; returns the ones applied"""
+        self.baseline()
+        applied = []
+        for migration in self.pending():
+            logger.info(f"Applying migration {migration.version:03d}_{migration.name}")
+            self.apply(migration)
+            applied.append(migration)
+        return applied
+
+    def _record(self, migration: Migration):
+        self.client.insert(
+            "schema_migrations",
+            {"version": migration.version, "name": migration.name, "checksum": migration.checksum},
+        )
@@ -2,30 +2,75 @@
 Database models and query builders
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime, date
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple
+from datetime import datetime, date, timezone
 from decimal import Decimal
-from .client import DataAPIClient
+import copy
+import json
+import logging
+import os
+import re
+from .cache import QueryCache, default_cache
+from .client import BaseClient, DataAPIClient
+from .events import PAYLOAD_EVENTS, STATUS_EVENTS, EventBroker, JobEvent, event_broker_from_env
+from .pagination import OrderColumns, decode_cursor, encode_cursor, keyset_parameters, keyset_sql
+from .payloads import PayloadStore, is_pointer, payload_store_from_env
+from .rows import AccountRow, InstrumentRow, JobRow, JobSummaryRow, PositionRow, Row
+from .search import InstrumentIndex
 from .schemas import (
     InstrumentCreate, UserCreate, AccountCreate, 
     PositionCreate, JobCreate, JobUpdate
 )
 
+logger = logging.getLogger(__name__)
+
 
 class BaseModel:
     """Base class for database models"""
     
     table_name = None
+    # Unique, non-null columns used to page through the table
+    key_columns = ('id',)
+    # (column, SQL type) that list pages are ordered by; together they must be unique
+    page_order: OrderColumns = (('created_at', 'timestamp'), ('id', 'uuid'))
+    page_descending = True
+    
+    # Compact row class returned in typed mode (see rows.py); None keeps dicts
+    row_type = None
     
-    def __init__(self, db: DataAPIClient):
+    def __init__(self, db: BaseClient, cache: QueryCache = None, typed: bool = False):
         self.db = db
+        self.cache = cache
         if not self.table_name:
             raise ValueError("table_name must be defined")
+        if not typed:
+            self.row_type = None
+
+    def _query(self, sql: str, params: List[Dict] = None) -> List[Any]:
+        """Run a SELECT, returning typed rows in typed mode and dicts otherwise"""
+        return self.db.query_rows(sql, params, self.row_type)
+
+    def _query_one(self, sql: str, params: List[Dict] = None) -> Optional[Any]:
+        """First row of a SELECT, or None"""
+        rows = self._query(sql, params)
+        return rows[0] if rows else None
+
+    def _cache_key(self, key: Any) -> Any:
+        """Cache key for a result; typed and dict results are cached apart"""
+        return key if self.row_type is None else (self.row_type.__name__, key)
+
+    def _cached(self, key: Any, loader: Callable[[], Any], cache_none: bool = True) -> Any:
+        """Read through the query cache (bypassed inside transactions, which may see uncommitted rows)"""
+        if self.cache is None or self.db.transaction_id:
+            return loader()
+        # Callers get their own copy so mutating a result never corrupts the cache
+        return copy.deepcopy(self.cache.get_or_load(self.table_name, self._cache_key(key), loader, cache_none))
     
     def find_by_id(self, id: Any) -> Optional[Dict]:
         """Find a record by ID"""
         sql = f"SELECT * FROM {self.table_name} WHERE id = :id::uuid"
-        return self.db.query_one(sql, [{'name': 'id', 'value': {'stringValue': str(id)}}])
+        return self._query_one(sql, [{'name': 'id', 'value': {'stringValue': str(id)}}])
     
     def find_all(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Find all records with pagination"""
@@ -34,15 +79,60 @@ class BaseModel:
             {'name': 'limit', 'value': {'longValue': limit}},
             {'name': 'offset', 'value': {'longValue': offset}}
         ]
-        return self.db.query(sql, params)
+        return self._query(sql, params)
+
+    def find_page(self, limit: int = 100, cursor: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of records, newest first; pass the returned cursor to get the next"""
+        return self._find_page(f"SELECT * FROM {self.table_name}", [], limit, cursor)
+
+    def _find_page(self, sql: str, params: List[Dict], limit: int, cursor: str = None,
+                   order: OrderColumns = None, descending: bool = None,
+                   row_type: type = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Keyset-paginate a SELECT (without ORDER BY/LIMIT) by page_order
+
+        row_type overrides the model's row class for SELECTs of other columns.
+
+        Returns:
+            (rows, next_cursor), with next_cursor None on the last page
+        """
+        order = order or self.page_order
+        descending = self.page_descending if descending is None else descending
+        after = decode_cursor(cursor, order) if cursor else None
+        page_sql = keyset_sql(sql, order, descending, after is not None)
+        # One extra row tells us whether there is another page
+        rows = self.db.query_rows(page_sql, list(params) + keyset_parameters(after, limit + 1),
+                                  row_type or self.row_type)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1], order)
+
+    def iter_all(self, page_size: int = 500) -> Iterator[Dict]:
+        """Stream every record in key order without loading the whole table"""
+        sql = f"SELECT * FROM {self.table_name}"
+        return self.db.iter_query(sql, page_size=page_size, key_columns=self.key_columns,
+                                  row_type=self.row_type)
     
-    def create(self, data: Dict, returning: str = 'id') -> str:
-        """Create a new record"""
-        return self.db.insert(self.table_name, data, returning=returning)
+    def create(self, data: Dict, returning: str = 'id') -> Any:
+        """Create a new record (returning='*' gives back the whole row as stored)"""
+        return self.db.insert(self.table_name, data, returning=returning, row_type=self.row_type)
     
     def update(self, id: Any, data: Dict) -> int:
         """Update a record by ID"""
         return self.db.update(self.table_name, data, "id = :id::uuid", {'id': str(id)})
+
+    def update_row(self, id: Any, data: Dict, where: str = None, where_params: Dict = None) -> Optional[Any]:
+        """
+        Update a record by ID and return it as stored, in the same statement
+
+        where narrows the match (e.g. to the caller's rows); None means no
+        record matched.
+        """
+        condition = f"id = :id::uuid AND ({where})" if where else "id = :id::uuid"
+        rows = self.db.update(self.table_name, data, condition, {**(where_params or {}), 'id': str(id)},
+                              returning='*', row_type=self.row_type)
+        return rows[0] if rows else None
     
     def delete(self, id: Any) -> int:
         """Delete a record by ID"""
@@ -52,12 +142,41 @@ class BaseModel:
 class Users(BaseModel):
     """Users table operations"""
     table_name = 'users'
+    key_columns = ('clerk_user_id',)
+    page_order = (('created_at', 'timestamp'), ('clerk_user_id', ''))
     
     def find_by_clerk_id(self, clerk_user_id: str) -> Optional[Dict]:
-        """Find user by Clerk ID"""
+        """
+        Find user by Clerk ID
+
+        With a cache (the API's short-TTL profile cache), repeat lookups are
+        served from memory until the TTL lapses or the users table is written.
+        """
         sql = f"SELECT * FROM {self.table_name} WHERE clerk_user_id = :clerk_id"
         params = [{'name': 'clerk_id', 'value': {'stringValue': clerk_user_id}}]
-        return self.db.query_one(sql, params)
+        if self.cache is None or self.db.transaction_id:
+            return self.db.query_one(sql, params)
+
+        key = self._cache_key(('clerk_id', clerk_user_id))
+        cached = self.cache.get_many(self.table_name, [key])
+        if key in cached:
+            return copy.deepcopy(cached[key])
+        generation = self.cache.generation(self.table_name)
+        user = self.db.query_one(sql, params)
+        # Unknown users aren't cached, so a profile created by another instance shows up at once
+        return self._remember(user, generation)
+
+    def _remember(self, user: Optional[Dict], generation: Any = None) -> Optional[Dict]:
+        """
+        Cache a user row just read or written
+
+        A row returned by a write needs no generation: the write has already
+        invalidated the table and the row is its result.
+        """
+        if user is not None and self.cache is not None and not self.db.transaction_id:
+            self.cache.set(self.table_name, self._cache_key(('clerk_id', user['clerk_user_id'])),
+                           copy.deepcopy(user), generation)
+        return user
     
     def create_user(self, clerk_user_id: str, display_name: str = None, 
                    years_until_retirement: int = None,
@@ -73,29 +192,96 @@ class Users(BaseModel):
         data = {k: v for k, v in data.items() if v is not None}
         return self.db.insert(self.table_name, data, returning='clerk_user_id')
 
+    def create_if_missing(self, data: Dict) -> Optional[Dict]:
+        """Insert a user unless one with this Clerk ID exists; the new row, or None if it already existed"""
+        return self._remember(
+            self.db.insert(self.table_name, data, returning='*', on_conflict='(clerk_user_id) DO NOTHING')
+        )
+
+    def update_by_clerk_id(self, clerk_user_id: str, data: Dict) -> Optional[Dict]:
+        """Update a user and return the stored row, or None if there is no such user"""
+        rows = self.db.update(self.table_name, data, "clerk_user_id = :clerk_user_id",
+                              {'clerk_user_id': clerk_user_id}, returning='*')
+        return self._remember(rows[0]) if rows else None
+
 
 class Instruments(BaseModel):
     """Instruments table operations"""
     table_name = 'instruments'
+    row_type = InstrumentRow
+    key_columns = ('symbol',)
+    page_order = (('symbol', ''),)
+    page_descending = False
 
     def find_all(self, limit: int = None, offset: int = 0) -> List[Dict]:
         """Find all instruments - no limit by default for autocomplete"""
-        sql = f"SELECT * FROM {self.table_name} ORDER BY symbol"
-        return self.db.query(sql, [])
+        # Paged so the whole table never has to fit in one Data API response
+        return self._cached('all', self._load_all)[1]
+
+    def version(self) -> str:
+        """
+        Token that changes whenever an instrument is added, removed or updated
+
+        Cached together with the list find_all returns, so the two always agree.
+        """
+        if self.cache is None or self.db.transaction_id:
+            return self._load_all()[0]
+        return self.cache.get_or_load(self.table_name, self._cache_key('all'), self._load_all)[0]
+
+    def _load_all(self) -> Tuple[str, List[Dict]]:
+        """(version, instruments) for the whole table"""
+        instruments = list(self.iter_all())
+        latest = max((i['updated_at'] for i in instruments if i['updated_at'] is not None), default=None)
+        return f"{len(instruments)}:{latest}", instruments
 
     def find_by_symbol(self, symbol: str) -> Optional[Dict]:
         """Find instrument by symbol"""
         sql = f"SELECT * FROM {self.table_name} WHERE symbol = :symbol"
         params = [{'name': 'symbol', 'value': {'stringValue': symbol}}]
-        return self.db.query_one(sql, params)
+        # Misses aren't cached: another instance may create the symbol at any moment
+        return self._cached(('symbol', symbol), lambda: self._query_one(sql, params), cache_none=False)
     
-    def create_instrument(self, instrument: InstrumentCreate) -> str:
-        """Create a new instrument with validation"""
+    def find_by_symbols(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Find many instruments in one round trip
+
+        Returns:
+            Dictionary of symbol -> instrument for the symbols that exist
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if self.cache is None or self.db.transaction_id:
+            return self._query_symbols(symbols)
+
+        keys = [self._cache_key(('symbol', symbol)) for symbol in symbols]
+        cached = self.cache.get_many(self.table_name, keys)
+        missing = [symbol for symbol, key in zip(symbols, keys) if key not in cached]
+        generation = self.cache.generation(self.table_name)
+        loaded = self._query_symbols(missing) if missing else {}
+        for symbol, instrument in loaded.items():
+            # Unknown symbols are left uncached, as in find_by_symbol
+            self.cache.set(self.table_name, self._cache_key(('symbol', symbol)), instrument, generation)
+
+        found = {symbol: cached[key] for symbol, key in zip(symbols, keys) if cached.get(key) is not None}
+        found.update(loaded)
+        # Callers get their own copies, as with find_by_symbol
+        return copy.deepcopy(found)
+
+    def _query_symbols(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Query instruments by symbol; the list goes as one JSON parameter since the Data API has no arrays"""
+        sql = f"""
+            SELECT * FROM {self.table_name}
+            WHERE symbol IN (SELECT jsonb_array_elements_text(:symbols::jsonb))
+        """
+        params = [{'name': 'symbols', 'value': {'stringValue': json.dumps(symbols)}}]
+        return {row['symbol']: row for row in self._query(sql, params)}
+
+    def _instrument_data(self, instrument: InstrumentCreate) -> Dict:
+        """Column values for an instrument row"""
         # Validate using Pydantic
         validated = instrument.model_dump()
         
         # Convert allocations to JSON strings for storage
-        data = {
+        return {
             'symbol': validated['symbol'],
             'name': validated['name'],
             'instrument_type': validated['instrument_type'],
@@ -103,46 +289,103 @@ class Instruments(BaseModel):
             'allocation_sectors': validated['allocation_sectors'],
             'allocation_asset_class': validated['allocation_asset_class']
         }
-        
-        return self.db.insert(self.table_name, data, returning='symbol')
+
+    def create_instrument(self, instrument: InstrumentCreate) -> str:
+        """
+        Create a new instrument with validation
+
+        A symbol that already exists (say, created concurrently by another
+        request) is left as it is; its symbol is returned either way.
+        """
+        data = self._instrument_data(instrument)
+        self.db.insert(self.table_name, data, returning='symbol', on_conflict='(symbol) DO NOTHING')
+        return data['symbol']
+
+    def create_instruments(self, instruments: List[InstrumentCreate]) -> List[str]:
+        """Create many instruments in one batch"""
+        rows = [self._instrument_data(instrument) for instrument in instruments]
+        return self.db.insert_many(self.table_name, rows, returning='symbol')
     
     def find_by_type(self, instrument_type: str) -> List[Dict]:
         """Find all instruments of a specific type"""
         sql = f"SELECT * FROM {self.table_name} WHERE instrument_type = :type ORDER BY symbol"
         params = [{'name': 'type', 'value': {'stringValue': instrument_type}}]
-        return self.db.query(sql, params)
+        return self._query(sql, params)
     
-    def search(self, query: str) -> List[Dict]:
-        """Search instruments by symbol or name"""
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """
+        Search instruments by symbol or name for autocomplete
+
+        Served from an in-process index of the cached instrument list; inside a
+        transaction (or without a cache) the trigram-indexed query runs instead.
+        """
+        if self.cache is None or self.db.transaction_id:
+            return self._query_search(query, limit, offset)
+        index = self.cache.get_or_load(self.table_name, self._cache_key('search_index'), self._build_index)
+        return copy.deepcopy(index.search(query, limit, offset))
+
+    def _build_index(self) -> InstrumentIndex:
+        """Index the cached instrument list (rebuilt after any write to instruments)"""
+        return InstrumentIndex(
+            self.cache.get_or_load(self.table_name, self._cache_key('all'), self._load_all)[1]
+        )
+
+    def _query_search(self, query: str, limit: int, offset: int) -> List[Dict]:
+        """Ranked prefix/substring search backed by the pg_trgm indexes from 002_instrument_search.sql"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        # Escape LIKE wildcards so user input only ever matches literally
+        pattern = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
         sql = f"""
-            SELECT * FROM {self.table_name} 
-            WHERE LOWER(symbol) LIKE LOWER(:query) 
-               OR LOWER(name) LIKE LOWER(:query)
-            ORDER BY symbol
-            LIMIT 20
+            SELECT * FROM {self.table_name}
+            WHERE LOWER(symbol) LIKE :prefix
+               OR LOWER(name) LIKE :contains
+            ORDER BY LOWER(symbol) = :query DESC,
+                     LOWER(symbol) LIKE :prefix DESC,
+                     symbol
+            LIMIT :limit OFFSET :offset
         """
-        params = [{'name': 'query', 'value': {'stringValue': f'%{query}%'}}]
-        return self.db.query(sql, params)
+        params = [
+            {'name': 'query', 'value': {'stringValue': query}},
+            {'name': 'prefix', 'value': {'stringValue': f'{pattern}%'}},
+            {'name': 'contains', 'value': {'stringValue': f'%{pattern}%'}},
+            {'name': 'limit', 'value': {'longValue': limit}},
+            {'name': 'offset', 'value': {'longValue': offset}}
+        ]
+        return self._query(sql, params)
 
 
 class Accounts(BaseModel):
     """Accounts table operations"""
     table_name = 'accounts'
+    row_type = AccountRow
     
     def find_by_user(self, clerk_user_id: str) -> List[Dict]:
         """Find all accounts for a user"""
         sql = f"""
             SELECT * FROM {self.table_name} 
             WHERE clerk_user_id = :user_id 
-            ORDER BY created_at DESC
+            ORDER BY created_at DESC, id DESC
         """
         params = [{'name': 'user_id', 'value': {'stringValue': clerk_user_id}}]
-        return self.db.query(sql, params)
+        return self._query(sql, params)
+
+    def find_page_by_user(self, clerk_user_id: str, limit: int = 100,
+                          cursor: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of a user's accounts, newest first, plus the cursor of the next page"""
+        sql = f"SELECT * FROM {self.table_name} WHERE clerk_user_id = :user_id"
+        params = [{'name': 'user_id', 'value': {'stringValue': clerk_user_id}}]
+        return self._find_page(sql, params, limit, cursor)
+    
+    def delete_by_user(self, clerk_user_id: str) -> int:
+        """Delete all accounts for a user, returning how many were deleted"""
+        return self.db.delete(self.table_name, "clerk_user_id = :user_id", {'user_id': clerk_user_id})
     
     def create_account(self, clerk_user_id: str, account_name: str,
                       account_purpose: str = None, cash_balance: Decimal = Decimal('0'),
-                      cash_interest: Decimal = Decimal('0')) -> str:
-        """Create a new account"""
+                      cash_interest: Decimal = Decimal('0'), returning: str = 'id') -> Any:
+        """Create a new account, returning its ID (or the whole row for returning='*')"""
         data = {
             'clerk_user_id': clerk_user_id,
             'account_name': account_name,
@@ -150,24 +393,49 @@ class Accounts(BaseModel):
             'cash_balance': cash_balance,
             'cash_interest': cash_interest
         }
-        return self.db.insert(self.table_name, data, returning='id')
+        return self.create(data, returning=returning)
+
+    def update_for_user(self, account_id: str, clerk_user_id: str, data: Dict) -> Optional[Any]:
+        """Update one of a user's accounts; None if it doesn't exist or belongs to someone else"""
+        return self.update_row(account_id, data, "clerk_user_id = :clerk_user_id",
+                               {'clerk_user_id': clerk_user_id})
 
 
 class Positions(BaseModel):
     """Positions table operations"""
     table_name = 'positions'
+    row_type = PositionRow
     
+    ACCOUNT_POSITIONS_SQL = """
+        SELECT p.*, i.name as instrument_name, i.instrument_type, i.current_price
+        FROM positions p
+        JOIN instruments i ON p.symbol = i.symbol
+        WHERE p.account_id = :account_id::uuid
+    """
+
     def find_by_account(self, account_id: str) -> List[Dict]:
         """Find all positions in an account"""
-        sql = f"""
-            SELECT p.*, i.name as instrument_name, i.instrument_type, i.current_price
-            FROM {self.table_name} p
-            JOIN instruments i ON p.symbol = i.symbol
-            WHERE p.account_id = :account_id::uuid
-            ORDER BY p.symbol
-        """
+        sql = f"{self.ACCOUNT_POSITIONS_SQL} ORDER BY p.symbol"
         params = [{'name': 'account_id', 'value': {'stringValue': account_id}}]
-        return self.db.query(sql, params)
+        return self._query(sql, params)
+
+    def find_page_by_account(self, account_id: str, limit: int = 500,
+                             cursor: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of an account's positions by symbol, plus the cursor of the next page"""
+        params = [{'name': 'account_id', 'value': {'stringValue': account_id}}]
+        # Symbols are unique within an account, so they alone order the pages
+        return self._find_page(self.ACCOUNT_POSITIONS_SQL, params, limit, cursor,
+                               order=(('symbol', ''),), descending=False)
+    
+    def delete_by_account(self, account_id: str) -> int:
+        """Delete all positions in an account"""
+        return self.db.delete(self.table_name, "account_id = :account_id::uuid", {'account_id': account_id})
+
+    def iter_symbols(self, page_size: int = 500) -> Iterator[str]:
+        """Stream the distinct symbols held across all accounts"""
+        sql = f"SELECT DISTINCT symbol FROM {self.table_name}"
+        for row in self.db.iter_query(sql, page_size=page_size, key_columns=('symbol',)):
+            yield row['symbol']
     
     def get_portfolio_value(self, account_id: str) -> Dict:
         """Calculate total portfolio value using current prices from instruments table"""
@@ -192,34 +460,218 @@ class Positions(BaseModel):
             }
         return {'num_positions': 0, 'total_value': 0, 'total_shares': 0}
     
+    # Use UPSERT to handle existing positions; an unknown symbol inserts
+    # nothing and returns no id
+    UPSERT_SQL = """
+        INSERT INTO positions (account_id, symbol, quantity, as_of_date)
+        SELECT :account_id::uuid, symbol, :quantity::numeric, :as_of_date::date
+        FROM instruments WHERE symbol = :symbol
+        ON CONFLICT (account_id, symbol) 
+        DO UPDATE SET 
+            quantity = EXCLUDED.quantity,
+            as_of_date = EXCLUDED.as_of_date,
+            updated_at = NOW()
+        RETURNING id
+    """
+
+    def _upsert_params(self, account_id: str, symbol: str, quantity: Decimal) -> List[Dict]:
+        """Parameters for UPSERT_SQL"""
+        return [
+            {'name': 'account_id', 'value': {'stringValue': account_id}},
+            {'name': 'symbol', 'value': {'stringValue': symbol}},
+            {'name': 'quantity', 'value': {'stringValue': str(quantity)}},
+            {'name': 'as_of_date', 'value': {'stringValue': date.today().isoformat()}}
+        ]
+
+    # UPSERT_SQL restricted to one user's account, returning the stored row
+    UPSERT_FOR_USER_SQL = """
+        INSERT INTO positions (account_id, symbol, quantity, as_of_date)
+        SELECT a.id, i.symbol, :quantity::numeric, :as_of_date::date
+        FROM accounts a JOIN instruments i ON i.symbol = :symbol
+        WHERE a.id = :account_id::uuid AND a.clerk_user_id = :clerk_user_id
+        ON CONFLICT (account_id, symbol) 
+        DO UPDATE SET 
+            quantity = EXCLUDED.quantity,
+            as_of_date = EXCLUDED.as_of_date,
+            updated_at = NOW()
+        RETURNING *
+    """
+
+    # Positions are owned through their account
+    OWNED_BY_USER = "account_id IN (SELECT id FROM accounts WHERE clerk_user_id = :clerk_user_id)"
+
+    def upsert_for_user(self, account_id: str, clerk_user_id: str, symbol: str,
+                        quantity: Decimal) -> Optional[Any]:
+        """
+        Add or update a position in one of a user's accounts, returning the stored row
+
+        None if the account doesn't exist, belongs to someone else, or the
+        symbol is unknown.
+        """
+        params = self._upsert_params(account_id, symbol, quantity)
+        params.append({'name': 'clerk_user_id', 'value': {'stringValue': clerk_user_id}})
+        rows = self.db.query_rows(self.UPSERT_FOR_USER_SQL, params, self.row_type)
+        self.db.notify_write(self.table_name)
+        return rows[0] if rows else None
+
+    def update_for_user(self, position_id: str, clerk_user_id: str, data: Dict) -> Optional[Any]:
+        """Update a position in one of a user's accounts; None if there is no such position"""
+        return self.update_row(position_id, data, self.OWNED_BY_USER, {'clerk_user_id': clerk_user_id})
+
     def add_position(self, account_id: str, symbol: str, quantity: Decimal) -> str:
-        """Add or update a position"""
-        # Use UPSERT to handle existing positions
-        sql = """
+        """Add or update a position, returning its ID (ValueError for an unknown symbol)"""
+        params = self._upsert_params(account_id, symbol, quantity)
+        response = self.db.execute(self.UPSERT_SQL, params)
+        self.db.notify_write(self.table_name)
+        if not response.get('records'):
+            # UPSERT_SQL inserts nothing rather than failing on the foreign key
+            raise ValueError(f"Instrument not found: {symbol}")
+        return response['records'][0][0].get('stringValue')
+
+    # Set-based variant of UPSERT_SQL: every row arrives as one JSON parameter,
+    # since the Data API has no array parameters to unnest. Unknown symbols
+    # come back with a NULL id, and then nothing is written at all.
+    UPSERT_MANY_SQL = """
+        WITH rows AS (
+            SELECT * FROM jsonb_to_recordset(:positions::jsonb) AS rows(symbol varchar, quantity numeric)
+        ),
+        unknown AS (
+            SELECT rows.symbol FROM rows
+            WHERE NOT EXISTS (SELECT 1 FROM instruments i WHERE i.symbol = rows.symbol)
+        ),
+        upserted AS (
             INSERT INTO positions (account_id, symbol, quantity, as_of_date)
-            VALUES (:account_id::uuid, :symbol, :quantity::numeric, :as_of_date::date)
+            SELECT :account_id::uuid, rows.symbol, rows.quantity, :as_of_date::date
+            FROM rows
+            WHERE NOT EXISTS (SELECT 1 FROM unknown)
             ON CONFLICT (account_id, symbol) 
             DO UPDATE SET 
                 quantity = EXCLUDED.quantity,
                 as_of_date = EXCLUDED.as_of_date,
                 updated_at = NOW()
-            RETURNING id
+            RETURNING id, symbol
+        )
+        SELECT id, symbol FROM upserted
+        UNION ALL
+        SELECT NULL, symbol FROM unknown
+    """
+
+    def upsert_many(self, account_id: str, positions: List[tuple]) -> List[str]:
+        """
+        Add or update many positions in a single statement
+
+        Args:
+            account_id: Account holding the positions
+            positions: (symbol, quantity) pairs; a repeated symbol keeps its last quantity
+
+        Returns:
+            Position IDs in input order
+
+        Raises:
+            ValueError: if any symbol is not a known instrument; no position is written
         """
+        if not positions:
+            return []
+        # ON CONFLICT cannot touch the same row twice in one statement
+        quantities = dict(positions)
+        rows = [{'symbol': symbol, 'quantity': str(quantity)} for symbol, quantity in quantities.items()]
         params = [
             {'name': 'account_id', 'value': {'stringValue': account_id}},
-            {'name': 'symbol', 'value': {'stringValue': symbol}},
-            {'name': 'quantity', 'value': {'stringValue': str(quantity)}},
+            {'name': 'positions', 'value': {'stringValue': json.dumps(rows)}},
             {'name': 'as_of_date', 'value': {'stringValue': date.today().isoformat()}}
         ]
-        response = self.db.execute(sql, params)
-        if response.get('records'):
-            return response['records'][0][0].get('stringValue')
-        return None
+        response = self.db.execute(self.UPSERT_MANY_SQL, params)
+        ids = {
+            record[1].get('stringValue'): record[0].get('stringValue')
+            for record in response.get('records') or []
+        }
+        unknown = sorted(symbol for symbol, position_id in ids.items() if not position_id)
+        if unknown:
+            raise ValueError(f"Instruments not found: {', '.join(unknown)}")
+        self.db.notify_write(self.table_name)
+        return [ids[symbol] for symbol, _ in positions]
+
+
+class Valuations(BaseModel):
+    """
+    Portfolio valuations (user_valuations / account_valuations)
+
+    Maintained incrementally by the triggers in 004_portfolio_valuations.sql,
+    so reading a portfolio's value never re-aggregates its positions;
+    reconcile() recomputes them in full.
+    """
+    table_name = 'user_valuations'
+    key_columns = ('clerk_user_id',)
+
+    def find_by_user(self, clerk_user_id: str) -> Optional[Dict]:
+        """Total value, cash and position counts across a user's accounts"""
+        sql = f"SELECT * FROM {self.table_name} WHERE clerk_user_id = :user_id"
+        params = [{'name': 'user_id', 'value': {'stringValue': clerk_user_id}}]
+        return self.db.query_one(sql, params)
+
+    def find_by_account(self, account_id: str) -> Optional[Dict]:
+        """Valuation of one account"""
+        sql = "SELECT * FROM account_valuations WHERE account_id = :account_id::uuid"
+        params = [{'name': 'account_id', 'value': {'stringValue': account_id}}]
+        return self.db.query_one(sql, params)
+
+    def find_accounts_by_user(self, clerk_user_id: str) -> List[Dict]:
+        """Valuation of each of a user's accounts"""
+        sql = "SELECT * FROM account_valuations WHERE clerk_user_id = :user_id ORDER BY account_id"
+        params = [{'name': 'user_id', 'value': {'stringValue': clerk_user_id}}]
+        return self.db.query(sql, params)
+
+    def reconcile(self, clerk_user_id: str = None) -> int:
+        """
+        Recompute valuations from positions and prices, correcting any that drifted
+
+        Covers one user, or everyone when clerk_user_id is None (see
+        reconcile_valuations in 008_valuation_consistency.sql).
+
+        Returns:
+            Number of account and user valuations corrected
+        """
+        if clerk_user_id is None:
+            params = [{'name': 'user_id', 'value': {'isNull': True}}]
+        else:
+            params = [{'name': 'user_id', 'value': {'stringValue': clerk_user_id}}]
+        row = self.db.query_one("SELECT reconcile_valuations(:user_id::varchar) AS corrected", params)
+        return row['corrected']
+
+    def find_by_job(self, job_id: str) -> Optional[Dict]:
+        """Valuation of a job's owner plus their retirement goals, in one round trip"""
+        sql = f"""
+            SELECT j.clerk_user_id, u.clerk_user_id IS NOT NULL AS user_exists,
+                   u.years_until_retirement, u.target_retirement_income,
+                   v.positions_value, v.cash_balance, v.total_value,
+                   v.num_accounts, v.num_positions, v.priced_at
+            FROM jobs j
+            LEFT JOIN users u ON u.clerk_user_id = j.clerk_user_id
+            LEFT JOIN {self.table_name} v ON v.clerk_user_id = j.clerk_user_id
+            WHERE j.id = :job_id::uuid
+        """
+        params = [{'name': 'job_id', 'value': {'stringValue': job_id}}]
+        return self.db.query_one(sql, params)
 
 
 class Jobs(BaseModel):
     """Jobs table operations"""
     table_name = 'jobs'
+    row_type = JobRow
+
+    # Agent results large enough to be worth moving to the payload store
+    offload_columns = ('report_payload', 'charts_payload', 'retirement_payload')
+
+    # Columns of the job listing; payloads are only read for a single job
+    summary_columns = JobSummaryRow._fields
+    preview_length = 200
+    _markdown = re.compile(r"[#*_>`|]+")
+
+    def __init__(self, db: BaseClient, cache: QueryCache = None, typed: bool = False,
+                 payloads: PayloadStore = None, events: EventBroker = None):
+        super().__init__(db, cache, typed)
+        self.payloads = payloads
+        self.events = events
     
     def create_job(self, clerk_user_id: str, job_type: str, 
                   request_payload: Dict = None) -> str:
@@ -232,85 +684,378 @@ class Jobs(BaseModel):
         }
         return self.db.insert(self.table_name, data, returning='id')
     
-    def update_status(self, job_id: str, status: str, error_message: str = None) -> int:
-        """Update job status"""
-        data = {'status': status}
-        
+    # Columns patch() may set directly
+    patch_columns = (
+        'status', 'error_message', 'request_payload', 'report_payload',
+        'charts_payload', 'retirement_payload', 'summary_payload'
+    )
+
+    def patch(self, job_id: str, merge: Dict[str, Dict] = None, **fields) -> int:
+        """
+        Update any combination of job columns in one statement
+
+        Args:
+            job_id: Job to update
+            merge: Payload column -> top-level keys merged into the stored
+                   document, so agents can add metadata without resending it
+            **fields: Columns to overwrite (see patch_columns)
+
+        Usage:
+            db.jobs.patch(job_id, status='completed',
+                          merge={'summary_payload': {'planner': {'turns': 7}}})
+        """
+        unknown = set(fields) - set(self.patch_columns)
+        unknown.update(col for col in (merge or {}) if col not in self.patch_columns or not col.endswith('_payload'))
+        if unknown:
+            raise ValueError(f"Cannot patch job columns: {', '.join(sorted(unknown))}")
+
+        preview = self._preview_source(fields, merge)
+        if preview is not None:
+            fields['summary_preview'] = self.preview(preview)
+
+        if self.payloads:
+            fields, merge = self._offload(job_id, fields, merge)
+
+        data = dict(fields)
+        status = data.get('status')
         if status == 'running':
-            data['started_at'] = datetime.utcnow()
+            data['started_at'] = datetime.now(timezone.utc)
         elif status in ['completed', 'failed']:
-            data['completed_at'] = datetime.utcnow()
-        
+            data['completed_at'] = datetime.now(timezone.utc)
+
+        updated = self.db.update(self.table_name, data, "id = :id::uuid", {'id': job_id}, merge=merge)
+        if updated:
+            self._publish_changes(job_id, fields)
+        return updated
+
+    def _publish_changes(self, job_id: str, fields: Dict):
+        """Progress events for what a patch wrote: agent results landing and status changes"""
+        for col, event in PAYLOAD_EVENTS.items():
+            if fields.get(col) is not None:
+                self.emit(job_id, event, {'column': col})
+        event = STATUS_EVENTS.get(fields.get('status'))
+        if event:
+            self.emit(job_id, event, {'error': fields['error_message']} if fields.get('error_message') else None)
+
+    def emit(self, job_id: str, event: str, data: Dict = None) -> Optional[JobEvent]:
+        """
+        Publish a progress event for a job (see events.py for the stages)
+
+        Events only drive the live progress view, so a failure to publish is
+        logged rather than failing the work that produced it.
+        """
+        if not self.events:
+            return None
+        try:
+            return self.events.publish(job_id, event, data)
+        except Exception as e:
+            logger.warning(f"Could not publish {event} event for job {job_id}: {e}")
+            return None
+
+    def events_since(self, job_id: str, after: int = 0, limit: int = 100) -> List[JobEvent]:
+        """A job's progress events after seq, oldest first"""
+        return self.events.read(job_id, after, limit) if self.events else []
+
+    @classmethod
+    def preview(cls, text: str) -> str:
+        """Plain-text preview of a summary or markdown report"""
+        return " ".join(cls._markdown.sub(" ", text).split())[:cls.preview_length]
+
+    @staticmethod
+    def _preview_source(fields: Dict, merge: Optional[Dict]) -> Optional[str]:
+        """Text the listing preview is made from: the planner summary, else the report"""
+        for document in (fields.get('summary_payload'), (merge or {}).get('summary_payload')):
+            if isinstance(document, dict) and isinstance(document.get('summary'), str):
+                return document['summary']
+        report = fields.get('report_payload')
+        if isinstance(report, dict) and isinstance(report.get('content'), str):
+            return report['content']
+        return None
+
+    def _offload(self, job_id: str, fields: Dict, merge: Optional[Dict]) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Write large payloads to the payload store, leaving pointers in their columns
+
+        Merges still run in SQL: merged into an offloaded column, the keys land
+        next to its pointer and are applied over the document when it is loaded.
+        """
+        for col in self.offload_columns:
+            if col in fields:
+                fields[col] = self.payloads.offload(job_id, col, fields[col])
+        return fields, merge
+
+    def resolve_payloads(self, job: Any) -> Any:
+        """Replace payload pointers in a job with the documents they point at"""
+        if job is None or not self.payloads:
+            return job
+        for col in self.offload_columns:
+            value = job.get(col)
+            if is_pointer(value):
+                document = self.payloads.load(value)
+                if isinstance(job, Row):
+                    setattr(job, col, document)
+                else:
+                    job[col] = document
+        return job
+
+    def find_summary(self, job_id: str) -> Optional[Dict]:
+        """A job's summary_columns only (status, owner, timestamps), without payloads"""
+        sql = f"SELECT {', '.join(self.summary_columns)} FROM {self.table_name} WHERE id = :id::uuid"
+        rows = self.db.query_rows(sql, [{'name': 'id', 'value': {'stringValue': str(job_id)}}],
+                                  self.row_type and JobSummaryRow)
+        return rows[0] if rows else None
+
+    def find_payload(self, job_id: str, column: str) -> Any:
+        """One payload column of a job, fetched from the payload store if offloaded"""
+        if column not in self.patch_columns or not column.endswith('_payload'):
+            raise ValueError(f"Not a job payload column: {column}")
+        row = self.db.query_one(
+            f"SELECT {column} FROM {self.table_name} WHERE id = :id::uuid",
+            [{'name': 'id', 'value': {'stringValue': str(job_id)}}]
+        )
+        if row is None:
+            return None
+        return self.payloads.load(row[column]) if self.payloads else row[column]
+
+    def find_with_payloads(self, job_id: str) -> Optional[Dict]:
+        """Find a job with its offloaded payloads fetched (find_by_id leaves the pointers)"""
+        return self.resolve_payloads(self.find_by_id(job_id))
+
+    def update_status(self, job_id: str, status: str, error_message: str = None) -> int:
+        """Update job status"""
         if error_message:
-            data['error_message'] = error_message
-        
-        return self.db.update(self.table_name, data, "id = :id::uuid", {'id': job_id})
+            return self.patch(job_id, status=status, error_message=error_message)
+        return self.patch(job_id, status=status)
     
     def update_report(self, job_id: str, report_payload: Dict) -> int:
         """Update job with Reporter agent's analysis"""
-        data = {'report_payload': report_payload}
-        return self.db.update(self.table_name, data, "id = :id::uuid", {'id': job_id})
+        return self.patch(job_id, report_payload=report_payload)
     
     def update_charts(self, job_id: str, charts_payload: Dict) -> int:
         """Update job with Charter agent's visualization data"""
-        data = {'charts_payload': charts_payload}
-        return self.db.update(self.table_name, data, "id = :id::uuid", {'id': job_id})
+        return self.patch(job_id, charts_payload=charts_payload)
     
     def update_retirement(self, job_id: str, retirement_payload: Dict) -> int:
         """Update job with Retirement agent's projections"""
-        data = {'retirement_payload': retirement_payload}
-        return self.db.update(self.table_name, data, "id = :id::uuid", {'id': job_id})
+        return self.patch(job_id, retirement_payload=retirement_payload)
     
     def update_summary(self, job_id: str, summary_payload: Dict) -> int:
         """Update job with Planner's final summary"""
-        data = {'summary_payload': summary_payload}
-        return self.db.update(self.table_name, data, "id = :id::uuid", {'id': job_id})
+        return self.patch(job_id, summary_payload=summary_payload)
     
     def find_by_user(self, clerk_user_id: str, status: str = None, 
                     limit: int = 20) -> List[Dict]:
-        """Find jobs for a user"""
+        """Find a user's most recent jobs"""
+        return self.find_page_by_user(clerk_user_id, status, limit)[0]
+
+    def find_page_by_user(self, clerk_user_id: str, status: str = None, limit: int = 20,
+                          cursor: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of a user's jobs, newest first, plus the cursor of the next page"""
+        sql, params = self._user_jobs_sql('*', clerk_user_id, status)
+        return self._find_page(sql, params, limit, cursor)
+
+    def find_summaries_by_user(self, clerk_user_id: str, status: str = None, limit: int = 20,
+                               cursor: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of a user's jobs without their payloads, newest first
+
+        Rows carry summary_columns only (status, timestamps, error and the
+        summary_preview); fetch a job by id for its results.
+        """
+        sql, params = self._user_jobs_sql(', '.join(self.summary_columns), clerk_user_id, status)
+        return self._find_page(sql, params, limit, cursor, row_type=self.row_type and JobSummaryRow)
+
+    def _user_jobs_sql(self, columns: str, clerk_user_id: str, status: str = None) -> Tuple[str, List[Dict]]:
+        sql = f"SELECT {columns} FROM {self.table_name} WHERE clerk_user_id = :user_id"
+        params = [{'name': 'user_id', 'value': {'stringValue': clerk_user_id}}]
         if status:
-            sql = f"""
-                SELECT * FROM {self.table_name}
-                WHERE clerk_user_id = :user_id AND status = :status
-                ORDER BY created_at DESC
-                LIMIT :limit
-            """
-            params = [
-                {'name': 'user_id', 'value': {'stringValue': clerk_user_id}},
-                {'name': 'status', 'value': {'stringValue': status}},
-                {'name': 'limit', 'value': {'longValue': limit}}
-            ]
-        else:
-            sql = f"""
-                SELECT * FROM {self.table_name}
-                WHERE clerk_user_id = :user_id
-                ORDER BY created_at DESC
-                LIMIT :limit
-            """
-            params = [
-                {'name': 'user_id', 'value': {'stringValue': clerk_user_id}},
-                {'name': 'limit', 'value': {'longValue': limit}}
-            ]
-        
-        return self.db.query(sql, params)
+            sql += " AND status = :status"
+            params.append({'name': 'status', 'value': {'stringValue': status}})
+        return sql, params
 
 
 class Database:
     """Main database interface providing access to all models"""
     
     def __init__(self, cluster_arn: str = None, secret_arn: str = None,
-                 database: str = None, region: str = None):
-        """Initialize database with all model classes"""
-        self.client = DataAPIClient(cluster_arn, secret_arn, database, region)
+                 database: str = None, region: str = None,
+                 backend: str = None, client: BaseClient = None,
+                 cache: QueryCache = None, typed_rows: bool = None,
+                 payloads: PayloadStore = None, events: EventBroker = None,
+                 user_cache: QueryCache = None):
+        """
+        Initialize database with all model classes
+
+        Args:
+            backend: "data_api" (default) or "postgres" (or from env DATABASE_BACKEND)
+            client: Ready-made client to use instead of creating one
+            cache: Cache for reference tables (defaults to the process-wide cache)
+            typed_rows: Return compact row objects (rows.py) instead of dicts
+                        (or from env DB_TYPED_ROWS)
+            payloads: Store for large job payloads (or from env, see payloads.py);
+                      None keeps every payload inline
+            events: Broker for job progress events (or from env JOB_EVENTS_BROKER,
+                    see events.py)
+            user_cache: Cache for user profiles looked up by Clerk ID; None
+                        (the default) always reads them from the database
+        """
+        self.client = client or self._create_client(
+            backend or os.environ.get('DATABASE_BACKEND', 'data_api'),
+            cluster_arn, secret_arn, database, region
+        )
+        self.cache = cache or default_cache
+        self.client.on_write(self.cache.invalidate)
+        self.user_cache = user_cache
+        if user_cache is not None:
+            self.client.on_write(user_cache.invalidate)
         
+        if typed_rows is None:
+            typed_rows = os.environ.get('DB_TYPED_ROWS', '').lower() in ('1', 'true', 'yes')
+        self.typed_rows = typed_rows
+        self.payloads = payloads or payload_store_from_env()
+        self.events = events or event_broker_from_env(self.client)
+
         # Initialize all models
-        self.users = Users(self.client)
-        self.instruments = Instruments(self.client)
-        self.accounts = Accounts(self.client)
-        self.positions = Positions(self.client)
-        self.jobs = Jobs(self.client)
+        self.users = Users(self.client, self.user_cache, typed=typed_rows)
+        self.instruments = Instruments(self.client, self.cache, typed=typed_rows)
+        self.accounts = Accounts(self.client, typed=typed_rows)
+        self.positions = Positions(self.client, typed=typed_rows)
+        self.jobs = Jobs(self.client, typed=typed_rows, payloads=self.payloads, events=self.events)
+        self.valuations = Valuations(self.client, typed=typed_rows)
     
+    @staticmethod
+    def _create_client(backend: str, cluster_arn: str, secret_arn: str,
+                       database: str, region: str) -> BaseClient:
+        """Create the client for the configured backend"""
+        if backend == 'data_api':
+            return DataAPIClient(cluster_arn, secret_arn, database, region)
+        if backend == 'postgres':
+            # Imported lazily so Lambdas without psycopg never touch it
+            from .postgres import PostgresClient
+            return PostgresClient()
+        raise ValueError(f"Unknown database backend: {backend} (expected 'data_api' or 'postgres')")
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: every model call inside the block shares one transaction
+
+        Usage:
+            with db.transaction() as tx:
+                tx.positions.delete(position_id)
+                tx.accounts.delete(account_id)
+        """
+        with self.client.transaction():
+            yield self
+
+    def run_in_transaction(self, func: Callable[['Database'], Any], max_attempts: int = 3) -> Any:
+        """Run func(db) in a transaction, retrying the whole unit on transient errors"""
+        return self.client.run_in_transaction(lambda: func(self), max_attempts=max_attempts)
+    
+    @property
+    def instrumentation(self):
+        """Statement instrumentation of the underlying client"""
+        return self.client.instrumentation
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Statement statistics: totals, slowest fingerprints and N+1 hotspots
+
+        Covers the active instrumentation scope (one request or invocation), or
+        everything the process has run when no scope is active.
+        """
+        return self.client.stats(top)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics of the reference table cache"""
+        return self.cache.stats()
+
+    # Instrument columns come back prefixed and are decoded like any other read
+    PORTFOLIO_INSTRUMENT_COLUMNS = ", ".join(f"i.{column} AS instrument_{column}" for column in InstrumentRow._fields)
+
+    PORTFOLIO_SQL = """
+        WITH target AS ({target})
+        SELECT
+            u.clerk_user_id,
+            u.years_until_retirement,
+            u.target_retirement_income,
+            a.id AS account_id,
+            a.account_name,
+            a.cash_balance,
+            p.symbol,
+            p.quantity,
+            {instrument_columns}
+        FROM target t
+        JOIN users u ON u.clerk_user_id = t.clerk_user_id
+        LEFT JOIN accounts a ON a.clerk_user_id = u.clerk_user_id
+        LEFT JOIN positions p ON p.account_id = a.id
+        LEFT JOIN instruments i ON i.symbol = p.symbol
+        ORDER BY a.created_at DESC, a.id, p.symbol
+    """
+
+    def load_portfolio(self, clerk_user_id: str = None, job_id: str = None) -> Optional[Dict]:
+        """
+        Load a user's accounts, positions and instruments in one round trip
+
+        Args:
+            clerk_user_id: User to load
+            job_id: Alternatively, load the user who owns this job
+
+        Returns:
+            portfolio_data as consumed by the agents:
+            {user_id, job_id, years_until_retirement, target_retirement_income,
+             accounts: [{id, name, type, cash_balance,
+                         positions: [{symbol, quantity, instrument}]}]}
+            or None if the user (or the job) does not exist
+        """
+        if clerk_user_id:
+            target = "SELECT :clerk_user_id::varchar AS clerk_user_id"
+            params = [{'name': 'clerk_user_id', 'value': {'stringValue': clerk_user_id}}]
+        elif job_id:
+            target = "SELECT clerk_user_id FROM jobs WHERE id = :job_id::uuid"
+            params = [{'name': 'job_id', 'value': {'stringValue': job_id}}]
+        else:
+            raise ValueError("clerk_user_id or job_id is required")
+
+        sql = self.PORTFOLIO_SQL.format(target=target, instrument_columns=self.PORTFOLIO_INSTRUMENT_COLUMNS)
+        rows = self.client.query(sql, params)
+        if not rows:
+            return None
+
+        first = rows[0]
+        portfolio = {
+            'user_id': first['clerk_user_id'],
+            'job_id': job_id,
+            'years_until_retirement': first['years_until_retirement'] if first['years_until_retirement'] is not None else 30,
+            'target_retirement_income': float(first['target_retirement_income'] if first['target_retirement_income'] is not None else 80000),
+            'accounts': []
+        }
+
+        accounts = {}
+        for row in rows:
+            if row['account_id'] is None:
+                continue  # User without accounts
+            account = accounts.get(row['account_id'])
+            if account is None:
+                account = accounts[row['account_id']] = {
+                    'id': row['account_id'],
+                    'name': row['account_name'],
+                    'type': 'investment',
+                    'cash_balance': float(row['cash_balance'] or 0),
+                    'positions': []
+                }
+                portfolio['accounts'].append(account)
+            if row['instrument_symbol'] is not None:
+                account['positions'].append({
+                    'symbol': row['symbol'],
+                    'quantity': float(row['quantity']),
+                    'instrument': {
+                        column: row[f'instrument_{column}'] for column in InstrumentRow._fields
+                    }
+                })
+
+        return portfolio
+
     def execute_raw(self, sql: str, parameters: List[Dict] = None) -> Dict:
         """Execute raw SQL for complex queries"""
         return self.client.execute(sql, parameters)
@@ -0,0 +1,102 @@
+"""
+Keyset pagination cursors
+A cursor is the sort-key values of the last row on a page, JSON-encoded and
+base64url'd so clients treat it as opaque. The next page starts strictly after
+those values, so every page is one index range scan however deep it is.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .statements import encode_value
+
+# (column, SQL type used to cast the bound value, or "" for text)
+OrderColumns = Tuple[Tuple[str, str], ...]
+
+
+class InvalidCursor(ValueError):
+    """Cursor that was not produced by encode_cursor for this ordering"""
+
+
+# Parsers checking that a cursor value will cast to its column's SQL type, so a
+# forged value is rejected here instead of failing in the query
+_VALUE_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "": str,
+    "timestamp": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "uuid": uuid.UUID,
+}
+
+
+def _check_value(value: Any, type_name: str) -> None:
+    if value is None:
+        return
+    parse = _VALUE_PARSERS.get(type_name)
+    if parse is None:
+        if not isinstance(value, (str, int, float, bool)):
+            raise ValueError(f"unexpected {type(value).__name__} for {type_name}")
+        return
+    if not isinstance(value, str):
+        raise ValueError(f"expected a string for {type_name or 'text'}, got {type(value).__name__}")
+    if "\x00" in value:
+        raise ValueError("NUL characters can't be bound as text")
+    parse(value)
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+
+
+def encode_cursor(row: Dict, order: OrderColumns) -> str:
+    """Cursor pointing just after row"""
+    values = [_cursor_value(row[col]) for col, _ in order]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: OrderColumns) -> List[Any]:
+    """Sort-key values carried by a cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != len(order):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+    for value, (_, type_name) in zip(values, order):
+        try:
+            _check_value(value, type_name)
+        except ValueError as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+    return values
+
+
+def keyset_sql(sql: str, order: OrderColumns, descending: bool, after: bool) -> str:
+    """
+    Wrap a SELECT so it returns one page ordered by the keyset columns
+
+    The page is bound by :page_limit and, when after is set, by one
+    :after_<i> parameter per order column.
+    """
+    direction = "DESC" if descending else "ASC"
+    keys = ", ".join(f"page.{col}" for col, _ in order)
+    where = ""
+    if after:
+        bounds = ", ".join(f":after_{i}::{type_name}" if type_name else f":after_{i}" for i, (_, type_name) in enumerate(order))
+        where = f"WHERE ({keys}) {'<' if descending else '>'} ({bounds})"
+    order_by = ", ".join(f"page.{col} {direction}" for col, _ in order)
+    return f"SELECT * FROM ({sql}) AS page {where} ORDER BY {order_by} LIMIT :page_limit"
+
+
+def keyset_parameters(values: Optional[List[Any]], limit: int) -> List[Dict]:
+    """Parameters for keyset_sql: the page limit plus the cursor's values"""
+    parameters = [{"name": "page_limit", "value": {"longValue": limit}}]
+    parameters += [{"name": f"after_{i}", "value": encode_value(value)} for i, value in enumerate(values or [])]
+    return parameters
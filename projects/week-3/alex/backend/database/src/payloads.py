@@ -0,0 +1,192 @@
+"""
+Blob storage for large job payloads
+Reports, chart sets and retirement projections above a size threshold are
+written compressed to S3 (or a local directory in development), and the jobs
+row keeps only a small pointer document. Listing jobs then moves a few hundred
+bytes per row over the Data API, and the full payload is fetched only when a
+single job is opened.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+# Key of the pointer document stored in place of an offloaded payload
+POINTER_KEY = '$payload'
+
+# File extension for each compression
+EXTENSIONS = {'gzip': 'gz', 'zstd': 'zst'}
+
+# Payloads smaller than this (serialized bytes) stay inline in the jobs row
+DEFAULT_INLINE_MAX_BYTES = 16 * 1024
+
+
+def is_pointer(value: Any) -> bool:
+    """
+    Whether a payload column value points at an offloaded payload
+
+    Keys stored next to the pointer were merged into the column after the
+    payload was offloaded (see Jobs.patch); they override the stored document's.
+    """
+    return isinstance(value, dict) and isinstance(value.get(POINTER_KEY), dict)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=6)
+    raise ValueError(f"Unknown payload encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    raise ValueError(f"Unknown payload encoding: {encoding}")
+
+
+class PayloadStore(ABC):
+    """
+    Base class for payload stores
+
+    Subclasses implement put/get of raw bytes under a key; offload and load
+    handle serialization, compression and the pointer format.
+    """
+
+    name = None
+
+    def __init__(self, inline_max_bytes: int = DEFAULT_INLINE_MAX_BYTES, encoding: str = None):
+        self.inline_max_bytes = inline_max_bytes
+        self.encoding = encoding or ('zstd' if zstandard is not None else 'gzip')
+        if self.encoding not in EXTENSIONS:
+            raise ValueError(f"Unknown payload encoding: {self.encoding}")
+        if self.encoding == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd payload encoding needs the zstandard package")
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_encoding: str):
+        """Store compressed bytes under key"""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """The compressed bytes stored under key"""
+
+    def offload(self, job_id: str, column: str, document: Any) -> Any:
+        """
+        Store a payload if it is over the inline threshold
+
+        Returns the pointer to write to the column instead, or the document
+        itself when it is small enough to stay inline.
+        """
+        if document is None or is_pointer(document):
+            return document
+        data = json.dumps(document, separators=(',', ':'), default=str).encode()
+        if len(data) <= self.inline_max_bytes:
+            return document
+
+        digest = hashlib.sha256(data).hexdigest()
+        # Content-addressed, so a rewrite never clobbers what a reader is fetching
+        key = f"jobs/{job_id}/{column}/{digest[:16]}.json.{EXTENSIONS[self.encoding]}"
+        stored = compress(data, self.encoding)
+        self.put(key, stored, self.encoding)
+        return {POINTER_KEY: {
+            'store': self.name,
+            'key': key,
+            'encoding': self.encoding,
+            'size': len(data),
+            'stored_size': len(stored),
+            'sha256': digest,
+        }}
+
+    def load(self, value: Any) -> Any:
+        """The payload a column value refers to (inline values are returned as is)"""
+        if not is_pointer(value):
+            return value
+        pointer = value[POINTER_KEY]
+        data = decompress(self.get(pointer['key']), pointer['encoding'])
+        if hashlib.sha256(data).hexdigest() != pointer['sha256']:
+            raise ValueError(f"Payload {pointer['key']} does not match its checksum")
+        document = json.loads(data)
+        merged = {key: item for key, item in value.items() if key != POINTER_KEY}
+        return {**document, **merged} if merged else document
+
+
+class S3PayloadStore(PayloadStore):
+    """Payloads stored as objects in an S3 bucket"""
+
+    name = 's3'
+
+    def __init__(self, bucket: str, region: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self.bucket = bucket
+        self.region = region or os.environ.get('DEFAULT_AWS_REGION', 'us-east-1')
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client('s3', region_name=self.region)
+        return self._client
+
+    def put(self, key: str, data: bytes, content_encoding: str):
+        self.client.put_object(
+            Bucket=self.bucket, Key=key, Body=data,
+            ContentType='application/json', ContentEncoding=content_encoding,
+        )
+
+    def get(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+
+
+class LocalPayloadStore(PayloadStore):
+    """Payloads stored as files under a directory (local development stand-in for S3)"""
+
+    name = 'local'
+
+    def __init__(self, directory: str, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+
+    def put(self, key: str, data: bytes, content_encoding: str):
+        path = self.directory / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial file
+        partial = path.with_name(path.name + '.partial')
+        partial.write_bytes(data)
+        partial.replace(path)
+
+    def get(self, key: str) -> bytes:
+        return (self.directory / key).read_bytes()
+
+
+def payload_store_from_env() -> Optional[PayloadStore]:
+    """
+    Payload store configured by the environment, or None to keep payloads inline
+
+    JOB_PAYLOAD_BUCKET selects S3, otherwise JOB_PAYLOAD_DIR a local directory.
+    JOB_PAYLOAD_INLINE_MAX_BYTES sets the threshold and JOB_PAYLOAD_ENCODING
+    forces 'gzip' or 'zstd'.
+    """
+    options = {
+        'inline_max_bytes': int(os.environ.get('JOB_PAYLOAD_INLINE_MAX_BYTES', DEFAULT_INLINE_MAX_BYTES)),
+        'encoding': os.environ.get('JOB_PAYLOAD_ENCODING') or None,
+    }
+    if os.environ.get('JOB_PAYLOAD_BUCKET'):
+        return S3PayloadStore(os.environ['JOB_PAYLOAD_BUCKET'], **options)
+    if os.environ.get('JOB_PAYLOAD_DIR'):
+        return LocalPayloadStore(os.environ['JOB_PAYLOAD_DIR'], **options)
+    return None
@@ -0,0 +1,286 @@
+"""
+Direct PostgreSQL backend
+Pooled psycopg connections with server-side prepared statements, for long-running
+services (like the API container) and for running against a local Postgres in tests
+"""
+
+import json
+import logging
+import os
+import re
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from .client import BaseClient
+from .instrumentation import Instrumentation
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg.types.numeric import FloatLoader
+    from psycopg.types.string import TextLoader
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    psycopg = None  # Optional dependency: pip install "alex-database[postgres]"
+
+logger = logging.getLogger(__name__)
+
+# ":name" placeholders as used with the Data API, but not "::type" casts
+_PARAMETER = re.compile(r"(?<![:\w]):([A-Za-z_][A-Za-z0-9_]*)")
+
+
+@lru_cache(maxsize=1024)
+def translate_sql(sql: str) -> str:
+    """Rewrite Data API ':name' placeholders as psycopg '%(name)s' placeholders"""
+    return _PARAMETER.sub(r"%(\1)s", sql.replace("%", "%%"))
+
+
+def parameter_values(parameters: List[Dict]) -> Dict[str, Any]:
+    """Convert Data API parameters to a plain name -> value dict"""
+    values = {}
+    for param in parameters or []:
+        value = param["value"]
+        values[param["name"]] = None if value.get("isNull") else next(iter(value.values()))
+    return values
+
+
+def encode_field(value: Any) -> Dict:
+    """Encode a Python value as a Data API field"""
+    if value is None:
+        return {"isNull": True}
+    elif isinstance(value, bool):
+        return {"booleanValue": value}
+    elif isinstance(value, int):
+        return {"longValue": value}
+    elif isinstance(value, float):
+        return {"doubleValue": value}
+    elif isinstance(value, (dict, list)):
+        return {"stringValue": json.dumps(value)}
+    elif isinstance(value, datetime):
+        return {"stringValue": value.isoformat(sep=" ")}
+    elif isinstance(value, (date, Decimal, uuid.UUID)):
+        return {"stringValue": str(value)}
+    elif isinstance(value, (bytes, memoryview)):
+        return {"blobValue": bytes(value)}
+    return {"stringValue": str(value)}
+
+
+def typed_row_factory(row_type: type):
+    """psycopg row factory building row_type from each result tuple"""
+    def factory(cursor):
+        names = [col.name for col in cursor.description or ()]
+        plan = [names.index(field) if field in names else None for field in row_type._fields]
+
+        def make_row(values):
+            return row_type(*[values[i] if i is not None else None for i in plan])
+        return make_row
+    return factory
+
+
+class PostgresClient(BaseClient):
+    """Database client talking to PostgreSQL directly through a connection pool"""
+
+    def __init__(
+        self,
+        dsn: str = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        prepare_threshold: int = 0,
+        numeric_type: type = float,
+        instrumentation: Instrumentation = None,
+    ):
+        """
+        Initialize pooled PostgreSQL client
+
+        Args:
+            dsn: libpq connection string (or from env DATABASE_URL)
+            min_size: Connections kept open in the pool
+            max_size: Maximum number of pooled connections
+            prepare_threshold: Executions of a statement before it is prepared
+                server-side on a connection (0 prepares on first use)
+            numeric_type: Type used for NUMERIC/DECIMAL columns (float or Decimal)
+            instrumentation: Where statement timings go (defaults to the process-wide one)
+        """
+        if psycopg is None:
+            raise ImportError(
+                "PostgresClient requires psycopg. Install with: uv add 'psycopg[binary]' psycopg-pool"
+            )
+
+        self.dsn = dsn or os.environ.get("DATABASE_URL")
+        if not self.dsn:
+            raise ValueError(
+                "Missing PostgreSQL configuration. Set the DATABASE_URL environment variable."
+            )
+
+        super().__init__(numeric_type, instrumentation)
+        self.prepare_threshold = prepare_threshold
+        self.pool = ConnectionPool(
+            self.dsn,
+            min_size=min_size,
+            max_size=max_size,
+            kwargs={"autocommit": True},
+            configure=self._configure,
+            open=True,
+        )
+        self._transactions = {}
+
+    def _configure(self, conn):
+        """Per-connection setup: prepared statements and Data API compatible types"""
+        conn.prepare_threshold = self.prepare_threshold
+        # IDs are handled as strings everywhere else in the code
+        conn.adapters.register_loader("uuid", TextLoader)
+        if self.numeric_type is float:
+            conn.adapters.register_loader("numeric", FloatLoader)
+
+    @contextmanager
+    def _connection(self):
+        """Connection of the current transaction, or a pooled autocommit connection"""
+        if self.transaction_id:
+            yield self._transactions[self.transaction_id]
+        else:
+            with self.pool.connection() as conn:
+                yield conn
+
+    def _execute(self, sql: str, parameters: List[Dict] = None, format_records_as: str = None) -> Dict:
+        """Run one statement; format_records_as is ignored, rows always come back as records"""
+        try:
+            with self._connection() as conn:
+                cur = conn.execute(translate_sql(sql), parameter_values(parameters))
+                if not cur.description:
+                    return {"numberOfRecordsUpdated": max(cur.rowcount, 0)}
+
+                rows = cur.fetchall()
+                return {
+                    "columnMetadata": [
+                        {"name": col.name, "typeName": self._type_name(col.type_code)}
+                        for col in cur.description
+                    ],
+                    "records": [[encode_field(value) for value in row] for row in rows],
+                    "numberOfRecordsUpdated": max(cur.rowcount, 0) if cur.statusmessage.split()[0] != "SELECT" else 0,
+                }
+        except psycopg.Error as e:
+            logger.error(f"Database error: {e}")
+            raise
+
+    def query(self, sql: str, parameters: List[Dict] = None, as_json: bool = False) -> List[Dict]:
+        """Execute a SELECT query and return rows as dicts, decoded by the driver"""
+        try:
+            with self.instrumentation.measure(sql, operation="query") as event:
+                rows = self._with_retries(lambda: self._fetch(sql, parameters, dict_row), event)
+                event.rows = len(rows)
+                return rows
+        except psycopg.Error as e:
+            logger.error(f"Database error: {e}")
+            raise
+
+    def query_rows(self, sql: str, parameters: List[Dict] = None, row_type: type = None) -> List[Any]:
+        """Execute a SELECT query and build typed rows straight from the driver's tuples"""
+        if row_type is None:
+            return self.query(sql, parameters)
+        with self.instrumentation.measure(sql, operation="query") as event:
+            rows = self._with_retries(
+                lambda: self._fetch(sql, parameters, typed_row_factory(row_type), raw_json=True), event
+            )
+            event.rows = len(rows)
+            return rows
+
+    def query_columns(self, sql: str, parameters: List[Dict] = None) -> Dict[str, List]:
+        """Execute a SELECT query and return results column by column"""
+        with self.instrumentation.measure(sql, operation="query") as event:
+            rows, description = self._with_retries(lambda: self._fetch(sql, parameters, with_description=True), event)
+            event.rows = len(rows)
+        if not description:
+            return {}
+        columns = list(zip(*rows)) or [()] * len(description)
+        return {col.name: list(values) for col, values in zip(description, columns)}
+
+    def _fetch(self, sql: str, parameters: List[Dict], row_factory=None, with_description: bool = False,
+               raw_json: bool = False):
+        """Run a statement and fetch all its rows (raw_json leaves JSON columns as text)"""
+        with self._connection() as conn:
+            with conn.cursor(row_factory=row_factory) as cur:
+                if raw_json:
+                    cur.adapters.register_loader("json", TextLoader)
+                    cur.adapters.register_loader("jsonb", TextLoader)
+                cur.execute(translate_sql(sql), parameter_values(parameters))
+                rows = cur.fetchall() if cur.description else []
+                return (rows, cur.description) if with_description else rows
+
+    def _batch_execute(self, sql: str, parameter_sets: List[List[Dict]]) -> List[Dict]:
+        """Run one chunk with executemany (pipelined into a single round trip)"""
+        results = []
+        try:
+            with self._connection() as conn:
+                # A batch is all-or-nothing, like batch_execute_statement
+                with conn.transaction(), conn.cursor() as cur:
+                    cur.executemany(
+                        translate_sql(sql),
+                        [parameter_values(params) for params in parameter_sets],
+                        returning=True,
+                    )
+                    while True:
+                        row = cur.fetchone() if cur.description else None
+                        results.append({"generatedFields": [encode_field(v) for v in row] if row else []})
+                        if not cur.nextset():
+                            break
+        except psycopg.Error as e:
+            logger.error(f"Database batch error: {e}")
+            raise
+        return results
+
+    def begin_transaction(self) -> str:
+        """Begin a transaction on a connection reserved until commit/rollback"""
+        conn = self.pool.getconn()
+        conn.autocommit = False
+        transaction_id = str(uuid.uuid4())
+        self._transactions[transaction_id] = conn
+        return transaction_id
+
+    def commit_transaction(self, transaction_id: str):
+        """Commit a transaction and return its connection to the pool"""
+        conn = self._transactions.pop(transaction_id)
+        try:
+            conn.commit()
+        finally:
+            self._release(conn)
+
+    def rollback_transaction(self, transaction_id: str):
+        """Rollback a transaction and return its connection to the pool"""
+        conn = self._transactions.pop(transaction_id)
+        try:
+            conn.rollback()
+        finally:
+            self._release(conn)
+
+    def _release(self, conn):
+        if not conn.closed:
+            conn.rollback()
+            conn.autocommit = True
+        self.pool.putconn(conn)
+
+    def _is_resuming(self, error: Exception) -> bool:
+        """Connection failures and "the database system is starting up" happen before anything runs"""
+        if not isinstance(error, psycopg.OperationalError):
+            return False
+        sqlstate = error.sqlstate
+        return sqlstate is None or sqlstate.startswith("08") or sqlstate == "57P03"
+
+    def _is_transient(self, error: Exception) -> bool:
+        """Serialization failures, deadlocks and dropped connections can be retried"""
+        return isinstance(
+            error,
+            (psycopg.errors.SerializationFailure, psycopg.errors.DeadlockDetected, psycopg.OperationalError),
+        )
+
+    @staticmethod
+    def _type_name(oid: int) -> str:
+        info = psycopg.adapters.types.get(oid)
+        return info.name if info else ""
+
+    def close(self):
+        """Close all pooled connections"""
+        self.pool.close()
@@ -0,0 +1,182 @@
+"""
+Precomputed HTTP responses
+Bodies that only change with a version (the instrument list, a finished
+job) are serialized and compressed once and served as bytes until the version
+moves on. Concurrent misses for the same key share one build instead of each
+querying Aurora and serializing the same result.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+DEFAULT_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", "256"))
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag for the response identified by parts (a name plus its version)"""
+    return '"' + hashlib.sha256(repr(parts).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, as for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+def compress_body(body: bytes) -> Dict[str, bytes]:
+    """The body in each supported Content-Encoding"""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return {}
+    encodings = {"gzip": gzip.compress(body, compresslevel=6)}
+    if brotli is not None:
+        encodings["br"] = brotli.compress(body, quality=5)
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    """Best encoding the client accepts (brotli over gzip), or None for identity"""
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+@dataclass
+class CachedResponse:
+    """A serialized body with its ETag and precompressed variants"""
+
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+    # Whatever the caller needs to check before serving it (e.g. the owner)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes, etag: str, media_type: str = "application/json",
+              meta: Dict[str, Any] = None) -> "CachedResponse":
+        return cls(body, etag, media_type, compress_body(body), meta or {})
+
+    def encoded(self, accept_encoding: Optional[str]):
+        """(body, content_encoding) to send a client with this Accept-Encoding"""
+        encoding = choose_encoding(accept_encoding, self.encodings)
+        return (self.encodings[encoding], encoding) if encoding else (self.body, None)
+
+
+class ResponseCache:
+    """TTL + LRU cache of precomputed responses with single-flight builds"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, CachedResponse)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """The live entry for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            return None
+
+    def set(self, key: Hashable, response: CachedResponse):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    async def get_or_build(self, key: Hashable,
+                           build: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        """
+        Cached response for key, building it on a miss
+
+        Requests that miss while a build for the same key is running wait for
+        that build rather than starting their own.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        with self._lock:
+            self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await build()
+            self.set(key, response)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; mark it retrieved so an unwaited one isn't logged
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
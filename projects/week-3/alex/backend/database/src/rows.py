@@ -0,0 +1,147 @@
+"""
+Compact typed rows for hot model results
+A slotted object per row instead of a dict: no per-row key table, attribute
+access instead of hashing, and JSONB columns kept as their raw text until
+first read. Rows still answer row['col'] and row.get('col') so code written
+against dict results keeps working.
+"""
+
+import json
+from typing import Any, Dict, Iterator, Tuple
+
+
+class LazyJSON:
+    """Descriptor parsing a JSONB column's text on first access"""
+
+    __slots__ = ("name", "slot")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.slot = f"_{name}"
+
+    def __get__(self, row, owner=None):
+        if row is None:
+            return self
+        value = getattr(row, self.slot)
+        if isinstance(value, str):
+            value = json.loads(value)
+            setattr(row, self.slot, value)
+        return value
+
+    def __set__(self, row, value):
+        setattr(row, self.slot, value)
+
+
+def row_slots(fields: Tuple[str, ...], json_fields: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    """Slot names for a row class (JSONB columns are stored under _<name>)"""
+    return tuple(f"_{field}" if field in json_fields else field for field in fields)
+
+
+class Row:
+    """
+    Base class for typed rows
+
+    Subclasses list their columns in _fields, the JSONB ones in _json_fields,
+    and set __slots__ = row_slots(_fields, _json_fields).
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _json_fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for field in cls._json_fields:
+            setattr(cls, field, LazyJSON(field))
+        cls._slot_names = row_slots(cls._fields, cls._json_fields)
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, *values: Any):
+        for slot, value in zip(self._slot_names, values):
+            object.__setattr__(self, slot, value)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Row":
+        return cls(*(data.get(field) for field in cls._fields))
+
+    # Dict-style access, so rows can stand in for the dicts query() returns
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._field_set:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._field_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._field_set else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((field, getattr(self, field)) for field in self._fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Row):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+class InstrumentRow(Row):
+    _fields = (
+        'symbol', 'name', 'instrument_type', 'current_price',
+        'allocation_regions', 'allocation_sectors', 'allocation_asset_class',
+        'created_at', 'updated_at',
+    )
+    _json_fields = ('allocation_regions', 'allocation_sectors', 'allocation_asset_class')
+    __slots__ = row_slots(_fields, _json_fields)
+
+
+class AccountRow(Row):
+    _fields = (
+        'id', 'clerk_user_id', 'account_name', 'account_purpose',
+        'cash_balance', 'cash_interest', 'created_at', 'updated_at',
+    )
+    __slots__ = row_slots(_fields)
+
+
+class PositionRow(Row):
+    # Instrument columns are filled when the query joins instruments
+    _fields = (
+        'id', 'account_id', 'symbol', 'quantity', 'as_of_date', 'created_at', 'updated_at',
+        'instrument_name', 'instrument_type', 'current_price',
+    )
+    __slots__ = row_slots(_fields)
+
+
+class JobRow(Row):
+    _fields = (
+        'id', 'clerk_user_id', 'job_type', 'status',
+        'request_payload', 'report_payload', 'charts_payload', 'retirement_payload', 'summary_payload',
+        'summary_preview', 'error_message', 'created_at', 'started_at', 'completed_at', 'updated_at',
+    )
+    _json_fields = ('request_payload', 'report_payload', 'charts_payload', 'retirement_payload', 'summary_payload')
+    __slots__ = row_slots(_fields, _json_fields)
+
+
+class JobSummaryRow(Row):
+    # Job listing projection: no payload columns
+    _fields = (
+        'id', 'clerk_user_id', 'job_type', 'status', 'summary_preview',
+        'error_message', 'created_at', 'started_at', 'completed_at', 'updated_at',
+    )
+    __slots__ = row_slots(_fields)
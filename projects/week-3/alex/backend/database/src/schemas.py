@@ -60,6 +60,11 @@ JobType = Literal[
 
 JobStatus = Literal["pending", "running", "completed", "failed"]
 
+# Job statuses a job ends in; completed results never change afterwards
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+FINISHED_JOB_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
 AccountType = Literal[
     "401k", "roth_ira", "traditional_ira", "taxable", "529", "hsa", "pension", "other"
 ]
@@ -0,0 +1,84 @@
+"""
+In-process instrument search index for autocomplete
+Built once from the cached instrument list and rebuilt whenever the instruments
+table is written, so a keystroke costs a few binary searches instead of a query
+"""
+
+import bisect
+import re
+from typing import Dict, Iterator, List
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _prefix_range(keys: List[str], prefix: str) -> range:
+    """Positions in a sorted list of strings that start with prefix"""
+    start = bisect.bisect_left(keys, prefix)
+    # U+10FFFF sorts after every character a symbol or name can contain
+    end = bisect.bisect_left(keys, prefix + "\U0010ffff", start)
+    return range(start, end)
+
+
+class InstrumentIndex:
+    """Sorted-array prefix index over instrument symbols and name words"""
+
+    def __init__(self, instruments: List[Dict]):
+        # Sorted by the lowercased symbol that _symbols is bisected on
+        self.instruments = sorted(instruments, key=lambda i: i["symbol"].lower())
+        self._symbols = [i["symbol"].lower() for i in self.instruments]
+        # (word, position) pairs so a word prefix maps back to its instruments
+        words = sorted(
+            (word, position)
+            for position, instrument in enumerate(self.instruments)
+            for word in set(_WORD.findall((instrument.get("name") or "").lower()))
+        )
+        self._words = [word for word, _ in words]
+        self._word_positions = [position for _, position in words]
+        self._haystacks = [
+            f"{instrument['symbol']}\n{instrument.get('name') or ''}".lower()
+            for instrument in self.instruments
+        ]
+
+    def __len__(self) -> int:
+        return len(self.instruments)
+
+    def _matches(self, query: str) -> Iterator[int]:
+        """Positions of matching instruments, best tier first and by symbol within a tier"""
+        # The exact symbol sorts first among its prefix matches
+        yield from _prefix_range(self._symbols, query)
+
+        first_word = next(iter(_WORD.findall(query)), None)
+        if first_word:
+            word_matches = {
+                self._word_positions[i] for i in _prefix_range(self._words, first_word)
+            }
+            # A multi-word query still has to appear as a whole
+            yield from sorted(p for p in word_matches if query in self._haystacks[p])
+
+        # Substring fallback only runs once the prefix tiers are exhausted
+        for position, haystack in enumerate(self._haystacks):
+            if query in haystack:
+                yield position
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """
+        Instruments whose symbol or name matches the query
+
+        Symbol prefixes rank first, then names with a word starting with the
+        query, then any other substring match.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        results = []
+        seen = set()
+        for position in self._matches(query):
+            if position in seen:
+                continue
+            seen.add(position)
+            if len(seen) > offset:
+                results.append(self.instruments[position])
+                if len(results) >= limit:
+                    break
+        return results
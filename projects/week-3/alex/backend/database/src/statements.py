@@ -0,0 +1,176 @@
+"""
+Compiled write statements
+Caches the SQL text and a parameter encoder per (table, column types) so hot
+writers skip rebuilding placeholders and dispatching on value types every call
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (column name, Python type of its value), in column order
+Signature = Tuple[Tuple[str, type], ...]
+
+
+def signature(data: Dict) -> Signature:
+    """Column/type signature of a row, the cache key for its statement"""
+    return tuple((col, type(value)) for col, value in data.items())
+
+
+def cast_suffix(value_type: type) -> str:
+    """Type cast needed for a placeholder bound to values of this type"""
+    if issubclass(value_type, (dict, list)):
+        return "::jsonb"
+    elif issubclass(value_type, Decimal):
+        return "::numeric"
+    elif issubclass(value_type, datetime):
+        return "::timestamp"
+    elif issubclass(value_type, date):
+        return "::date"
+    return ""
+
+
+def _encode_null(value: Any) -> Dict:
+    return {"isNull": True}
+
+
+def _encode_bool(value: bool) -> Dict:
+    return {"booleanValue": value}
+
+
+def _encode_long(value: int) -> Dict:
+    return {"longValue": value}
+
+
+def _encode_double(value: float) -> Dict:
+    return {"doubleValue": value}
+
+
+def _encode_isoformat(value: date) -> Dict:
+    return {"stringValue": value.isoformat()}
+
+
+def _encode_json(value: Any) -> Dict:
+    # Decoded rows hold dates and numbers; they serialize as in payloads and events
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def _encode_string(value: Any) -> Dict:
+    return {"stringValue": str(value)}
+
+
+@lru_cache(maxsize=None)
+def value_encoder(value_type: type) -> Callable[[Any], Dict]:
+    """Data API value encoder for a Python type"""
+    if value_type is type(None):
+        return _encode_null
+    elif issubclass(value_type, bool):
+        return _encode_bool
+    elif issubclass(value_type, int):
+        return _encode_long
+    elif issubclass(value_type, float):
+        return _encode_double
+    elif issubclass(value_type, (date, datetime)):
+        return _encode_isoformat
+    elif issubclass(value_type, (dict, list)):
+        return _encode_json
+    return _encode_string
+
+
+def encode_value(value: Any) -> Dict:
+    """Encode a single value in Data API format"""
+    return value_encoder(type(value))(value)
+
+
+def parameter_encoder(names: Tuple[str, ...], types: Tuple[type, ...]) -> Callable[[Dict], List[Dict]]:
+    """
+    Build a function turning a row dict into Data API parameters
+
+    The encoders are picked once from the compiled types; a value of another
+    type (a NULL, or an int in a float column) falls back to a lookup by its own type.
+    """
+    encoders = tuple((name, value_type, value_encoder(value_type)) for name, value_type in zip(names, types))
+
+    def encode(data: Dict) -> List[Dict]:
+        parameters = []
+        for name, value_type, encoder in encoders:
+            value = data[name]
+            if type(value) is not value_type:
+                encoder = value_encoder(type(value))
+            parameters.append({"name": name, "value": encoder(value)})
+        return parameters
+
+    return encode
+
+
+class CompiledStatement:
+    """SQL text plus the encoder for its parameters"""
+
+    __slots__ = ("sql", "encode")
+
+    def __init__(self, sql: str, encode: Callable[[Dict], List[Dict]]):
+        self.sql = sql
+        self.encode = encode
+
+
+@lru_cache(maxsize=512)
+def compile_insert(table: str, columns: Signature, returning: Optional[str] = None,
+                   on_conflict: Optional[str] = None) -> CompiledStatement:
+    """Compile an INSERT for a column/type signature (on_conflict follows ON CONFLICT)"""
+    names = tuple(col for col, _ in columns)
+    types = tuple(value_type for _, value_type in columns)
+    placeholders = [f":{col}{cast_suffix(value_type)}" for col, value_type in columns]
+
+    sql = f"""
+            INSERT INTO {table} ({", ".join(names)})
+            VALUES ({", ".join(placeholders)})
+        """
+    if on_conflict:
+        sql += f" ON CONFLICT {on_conflict}"
+    if returning:
+        sql += f" RETURNING {returning}"
+
+    return CompiledStatement(sql, parameter_encoder(names, types))
+
+
+def merge_parameter(column: str) -> str:
+    """Parameter name carrying the document merged into a JSONB column"""
+    return f"{column}_merge"
+
+
+@lru_cache(maxsize=512)
+def compile_update(
+    table: str,
+    columns: Signature,
+    where: str,
+    where_columns: Signature = (),
+    returning: Optional[str] = None,
+    merge_columns: Tuple[str, ...] = (),
+) -> CompiledStatement:
+    """
+    Compile an UPDATE for a SET column/type signature and WHERE clause
+
+    merge_columns are JSONB columns whose top-level keys are merged with a
+    document (col || :col_merge) instead of being replaced wholesale.
+    """
+    assignments = [f"{col} = :{col}{cast_suffix(value_type)}" for col, value_type in columns]
+    assignments += [
+        f"{col} = COALESCE({col}, '{{}}'::jsonb) || :{merge_parameter(col)}::jsonb" for col in merge_columns
+    ]
+    set_clause = ", ".join(assignments)
+
+    sql = f"""
+            UPDATE {table}
+            SET {set_clause}
+            WHERE {where}
+        """
+    if returning:
+        sql += f" RETURNING {returning}"
+
+    # WHERE parameters win over SET columns of the same name, as with {**data, **where_params}
+    parameters = dict(columns)
+    parameters.update((merge_parameter(col), dict) for col in merge_columns)
+    parameters.update(where_columns)
+    return CompiledStatement(sql, parameter_encoder(tuple(parameters), tuple(parameters.values())))
@@ -0,0 +1,83 @@
+"""
+Test that DataAPIClient batch writes are split into requests the Data API accepts
+Runs without AWS: the boto3 client is swapped for one that records its calls.
+"""
+
+import json
+
+from src import client as client_module
+from src.client import DataAPIClient
+
+
+class RecordingRDSData:
+    """Stands in for boto3's rds-data client, answering each batch with generated ids"""
+
+    def __init__(self):
+        self.batches = []
+
+    def batch_execute_statement(self, **kwargs):
+        start = sum(len(batch["parameterSets"]) for batch in self.batches)
+        self.batches.append(kwargs)
+        return {"updateResults": [
+            {"generatedFields": [{"longValue": start + i}]} for i in range(len(kwargs["parameterSets"]))
+        ]}
+
+
+def make_client():
+    db = DataAPIClient(cluster_arn="cluster", secret_arn="secret", database="alex")
+    db.client = RecordingRDSData()
+    return db
+
+
+def test_insert_many_chunks_by_row_count():
+    db = make_client()
+    rows = [{"symbol": f"S{i}", "quantity": i} for i in range(client_module.MAX_BATCH_PARAMETER_SETS * 2 + 5)]
+    ids = db.insert_many("positions", rows, returning="id")
+
+    sizes = [len(batch["parameterSets"]) for batch in db.client.batches]
+    assert sizes == [client_module.MAX_BATCH_PARAMETER_SETS] * 2 + [5]
+    # Every request runs the same statement, and results line up with the input rows
+    assert len({batch["sql"] for batch in db.client.batches}) == 1
+    assert ids == list(range(len(rows)))
+    first = db.client.batches[0]["parameterSets"][0]
+    assert {"name": "symbol", "value": {"stringValue": "S0"}} in first
+
+
+def test_execute_many_chunks_by_request_size():
+    db = make_client()
+    sql = "UPDATE jobs SET report_payload = :report::jsonb WHERE id = :id::uuid"
+    # Each parameter set is a third of the byte budget, so only two fit per request
+    report = "x" * (client_module.MAX_BATCH_REQUEST_BYTES // 3)
+    parameter_sets = [
+        [{"name": "report", "value": {"stringValue": report}}, {"name": "id", "value": {"stringValue": str(i)}}]
+        for i in range(5)
+    ]
+    results = db.execute_many(sql, parameter_sets)
+
+    assert [len(batch["parameterSets"]) for batch in db.client.batches] == [2, 2, 1]
+    for batch in db.client.batches:
+        assert len(sql) + len(json.dumps(batch["parameterSets"])) < client_module.MAX_BATCH_REQUEST_BYTES
+    assert len(results) == 5
+
+
+def test_batches_join_the_open_transaction():
+    db = make_client()
+    with db.use_transaction("tx-1"):
+        db.execute_many("DELETE FROM positions WHERE id = :id::uuid", [
+            [{"name": "id", "value": {"stringValue": "a"}}],
+        ])
+    assert db.client.batches[0]["transactionId"] == "tx-1"
+
+
+def test_empty_batches_make_no_requests():
+    db = make_client()
+    assert db.insert_many("positions", []) == []
+    assert db.update_many("positions", [], "id = :id::uuid") == []
+    assert db.client.batches == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
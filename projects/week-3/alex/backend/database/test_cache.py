@@ -0,0 +1,82 @@
+"""
+Test the query cache
+"""
+
+import time
+
+from src.cache import QueryCache
+
+
+def test_query_cache_ttl():
+    cache = QueryCache(ttl=0.05)
+    calls = []
+    load = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_load("instruments", "all", load) == 1
+    assert cache.get_or_load("instruments", "all", load) == 1
+    time.sleep(0.1)
+    assert cache.get_or_load("instruments", "all", load) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_query_cache_lru():
+    cache = QueryCache(maxsize=2, ttl=60)
+    cache.set("t", "a", 1)
+    cache.set("t", "b", 2)
+    cache.get_many("t", ["a"])  # a is now the most recently used
+    cache.set("t", "c", 3)
+    assert cache.get_many("t", ["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_query_cache_invalidation():
+    cache = QueryCache(ttl=60)
+    cache.set("instruments", "all", 1)
+    cache.set("users", "u1", 2)
+    cache.invalidate("instruments")
+    assert cache.get_many("instruments", ["all"]) == {}
+    assert cache.get_many("users", ["u1"]) == {"u1": 2}
+    cache.invalidate()
+    assert cache.get_many("users", ["u1"]) == {}
+
+
+def test_query_cache_drops_loads_across_invalidation():
+    cache = QueryCache(ttl=60)
+
+    def load_during_write():
+        cache.invalidate("instruments")  # a write commits while the load runs
+        return "stale"
+
+    assert cache.get_or_load("instruments", "all", load_during_write) == "stale"
+    assert cache.get_many("instruments", ["all"]) == {}
+
+    # Clearing every table counts too; other tables' writes don't
+    generation = cache.generation("instruments")
+    cache.invalidate("users")
+    cache.set("instruments", "all", "fresh", generation)
+    assert cache.get_many("instruments", ["all"]) == {"all": "fresh"}
+    cache.invalidate()
+    cache.set("instruments", "all", "stale", generation)
+    assert cache.get_many("instruments", ["all"]) == {}
+
+
+def test_query_cache_skips_misses():
+    cache = QueryCache(ttl=60)
+    found = []
+    load = lambda: found[0] if found else None
+    assert cache.get_or_load("instruments", "VTI", load, cache_none=False) is None
+    found.append({"symbol": "VTI"})  # created elsewhere; the miss must not stick
+    assert cache.get_or_load("instruments", "VTI", load, cache_none=False) == {"symbol": "VTI"}
+    assert cache.get_many("instruments", ["VTI"]) == {"VTI": {"symbol": "VTI"}}
+
+
+def test_query_cache_disabled():
+    cache = QueryCache(ttl=0)
+    cache.set("t", "a", 1)
+    assert cache.get_many("t", ["a"]) == {}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
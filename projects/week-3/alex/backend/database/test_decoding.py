@@ -0,0 +1,85 @@
+"""
+Test result decoding
+Values encoded for the Data API decode back to the same Python values
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from src.decoding import decode_columns, decode_formatted_records, decode_records
+from src.statements import encode_value
+
+# (Postgres type the column would have, value)
+ROUND_TRIP = [
+    ("int8", 42),
+    ("float8", 1.5),
+    ("bool", True),
+    ("varchar", "hello"),
+    ("uuid", "8ef460e1-4869-432c-ad5a-391e5aa41184"),
+    ("numeric", Decimal("1234.5678")),
+    ("date", date(2026, 1, 31)),
+    ("timestamp", datetime(2026, 1, 31, 12, 30, 5, 123456)),
+    ("jsonb", {"equity": 70, "nested": {"a": [1, 2]}}),
+    ("jsonb", [1, "two"]),
+    ("varchar", None),
+]
+
+
+def response_for(columns):
+    """A Data API response with one record holding each (type, value) encoded"""
+    return {
+        "columnMetadata": [{"name": f"c{i}", "typeName": type_name} for i, (type_name, _) in enumerate(columns)],
+        "records": [[encode_value(value) for _, value in columns]],
+    }
+
+
+def test_round_trip():
+    row = decode_records(response_for(ROUND_TRIP), numeric_type=Decimal)[0]
+    for i, (type_name, value) in enumerate(ROUND_TRIP):
+        assert row[f"c{i}"] == value, (type_name, row[f"c{i}"], value)
+        assert type(row[f"c{i}"]) is type(value), (type_name, type(row[f"c{i}"]))
+
+
+def test_numeric_type():
+    response = response_for([("numeric", Decimal("2.50"))])
+    assert decode_records(response)[0]["c0"] == 2.5
+    assert decode_records(response, numeric_type=Decimal)[0]["c0"] == Decimal("2.50")
+
+
+def test_decode_columns():
+    response = response_for(ROUND_TRIP)
+    response["records"].append(response["records"][0])
+    columns = decode_columns(response, numeric_type=Decimal)
+    assert columns["c0"] == [42, 42]
+    assert columns["c8"] == [ROUND_TRIP[8][1]] * 2
+
+
+def test_decode_formatted_records():
+    response = {
+        "columnMetadata": [
+            {"name": "price", "typeName": "numeric"},
+            {"name": "regions", "typeName": "jsonb"},
+            {"name": "created_at", "typeName": "timestamp"},
+        ],
+        "formattedRecords": json.dumps([{"price": 1.25, "regions": '{"na": 100}', "created_at": "2026-01-31 12:00:00"}]),
+    }
+    row = decode_formatted_records(response, numeric_type=Decimal)[0]
+    assert row == {"price": Decimal("1.25"), "regions": {"na": 100}, "created_at": datetime(2026, 1, 31, 12)}
+
+
+def test_decoded_rows_serialize():
+    # Rows hold datetimes and numbers now, not strings; writing one back into a
+    # JSONB column or a payload must still work
+    row = decode_records(response_for(ROUND_TRIP))[0]
+    assert isinstance(row["c7"], datetime) and isinstance(row["c5"], float)
+    encoded = json.loads(encode_value(row)["stringValue"])
+    assert encoded["c7"] == "2026-01-31 12:30:05.123456" and encoded["c6"] == "2026-01-31"
+    assert encoded["c5"] == 1234.5678 and encoded["c8"] == ROUND_TRIP[8][1]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,43 @@
+"""
+Test job event ordering
+"""
+
+import threading
+
+from src.events import COMPLETED, PRICING, STARTED, TAGGING, MemoryEventBroker
+
+
+def test_memory_broker_order():
+    broker = MemoryEventBroker()
+    for event in (STARTED, TAGGING, PRICING, COMPLETED):
+        broker.publish("j1", event, {"event": event})
+    broker.publish("j2", STARTED)
+
+    events = broker.read("j1")
+    assert [(e.seq, e.event) for e in events] == [(1, STARTED), (2, TAGGING), (3, PRICING), (4, COMPLETED)]
+    assert [e.event for e in broker.read("j1", after=2)] == [PRICING, COMPLETED]
+    assert [e.seq for e in broker.read("j1", after=1, limit=2)] == [2, 3]
+    assert broker.read("j1", after=4) == []
+    assert [e.seq for e in broker.read("j2")] == [1]
+    assert broker.read("unknown") == []
+
+
+def test_memory_broker_concurrent_publish():
+    broker = MemoryEventBroker()
+    threads = [
+        threading.Thread(target=lambda: [broker.publish("j1", TAGGING) for _ in range(50)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Gapless and unique however publishes interleave
+    assert [e.seq for e in broker.read("j1", limit=1000)] == list(range(1, 401))
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
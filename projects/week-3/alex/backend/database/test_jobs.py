@@ -0,0 +1,64 @@
+"""
+Test single-statement job updates with Jobs.patch
+"""
+
+import pytest
+
+from src.events import COMPLETED, REPORTER_DONE, STARTED, MemoryEventBroker
+from src.models import Jobs
+from testdb import fresh_database, needs_database, run_tests
+
+
+def test_preview():
+    assert Jobs.preview("# Report\n\n**Diversified** `portfolio`  | ok") == "Report Diversified portfolio ok"
+    assert len(Jobs.preview("word " * 100)) == Jobs.preview_length
+    # The planner summary wins over the report, merged or not
+    assert Jobs._preview_source({"report_payload": {"content": "report"}}, None) == "report"
+    assert Jobs._preview_source(
+        {"report_payload": {"content": "report"}}, {"summary_payload": {"summary": "summary"}}
+    ) == "summary"
+    assert Jobs._preview_source({"status": "running"}, {"report_payload": {"agent": "x"}}) is None
+
+
+def test_patch_rejects_unknown_columns():
+    # Checked before any statement runs, so no database is needed
+    jobs = Jobs(db=None)
+    with pytest.raises(ValueError, match="clerk_user_id"):
+        jobs.patch("j1", clerk_user_id="someone-else")
+    with pytest.raises(ValueError, match="status"):
+        jobs.patch("j1", merge={"status": {"x": 1}})
+
+
+@needs_database
+def test_patch():
+    events = MemoryEventBroker()
+    db = fresh_database(events=events)
+    try:
+        db.users.create_user("u1")
+        job_id = db.jobs.create_job("u1", "portfolio_analysis")
+
+        assert db.jobs.patch(job_id, status="running") == 1
+        job = db.jobs.find_by_id(job_id)
+        assert job["status"] == "running" and job["started_at"] and not job["completed_at"]
+
+        db.jobs.patch(job_id, report_payload={"content": "## Report\nAll **good**", "agent": "reporter"})
+        db.jobs.patch(
+            job_id, status="completed",
+            merge={"summary_payload": {"summary": "Done"}, "report_payload": {"turns": 3}},
+        )
+        job = db.jobs.find_by_id(job_id)
+        assert job["completed_at"] and job["summary_preview"] == "Done"
+        # Merged keys land next to the ones already stored
+        assert job["report_payload"] == {"content": "## Report\nAll **good**", "agent": "reporter", "turns": 3}
+        assert job["summary_payload"] == {"summary": "Done"}
+
+        assert [e.event for e in events.read(job_id)] == [STARTED, REPORTER_DONE, COMPLETED]
+        # A job that doesn't exist updates nothing and publishes nothing
+        missing = "00000000-0000-0000-0000-000000000000"
+        assert db.jobs.patch(missing, status="failed") == 0 and events.read(missing) == []
+    finally:
+        db.client.close()
+
+
+if __name__ == "__main__":
+    run_tests(globals())
@@ -0,0 +1,64 @@
+"""
+Test splitting migration files into Data API statements
+"""
+
+from src.migrations import discover, split_statements
+
+
+def test_split_simple():
+    assert split_statements("CREATE TABLE a (id INT);\nCREATE TABLE b (id INT);\n") == [
+        "CREATE TABLE a (id INT)",
+        "CREATE TABLE b (id INT)",
+    ]
+
+
+def test_split_skips_comments():
+    sql = """
+        -- a comment; with a semicolon
+        SELECT 1; /* block; comment */ SELECT 2;
+        /* unterminated; */
+        -- trailing comment
+    """
+    assert [" ".join(s.split()) for s in split_statements(sql)] == ["SELECT 1", "SELECT 2"]
+
+
+def test_split_keeps_quoted_semicolons():
+    sql = "INSERT INTO t VALUES ('a;b', 'it''s; fine'); SELECT ';'"
+    assert split_statements(sql) == ["INSERT INTO t VALUES ('a;b', 'it''s; fine')", "SELECT ';'"]
+
+
+def test_split_keeps_dollar_quoted_bodies():
+    sql = """
+        CREATE OR REPLACE FUNCTION touch() RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = NOW(); -- not a statement boundary
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DO $body$ BEGIN PERFORM 1; END $body$;
+        CREATE TRIGGER t BEFORE UPDATE ON users FOR EACH ROW EXECUTE FUNCTION touch();
+    """
+    statements = split_statements(sql)
+    assert len(statements) == 3
+    assert statements[0].startswith("CREATE OR REPLACE FUNCTION") and statements[0].endswith("LANGUAGE plpgsql")
+    assert "RETURN NEW;" in statements[0] and "-- not a statement boundary" in statements[0]
+    assert statements[1] == "DO $body$ BEGIN PERFORM 1; END $body$"
+    assert statements[2].startswith("CREATE TRIGGER")
+
+
+def test_shipped_migrations_split():
+    migrations = discover()
+    versions = [migration.version for migration in migrations]
+    assert versions == sorted(set(versions)), "migration versions must be unique and ordered"
+    for migration in migrations:
+        statements = migration.statements()
+        assert statements, migration.name
+        assert all(statement.strip() for statement in statements), migration.name
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
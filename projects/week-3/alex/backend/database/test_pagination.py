@@ -0,0 +1,92 @@
+"""
+Test keyset pagination cursors
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from src.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_parameters, keyset_sql
+
+ORDER = (("created_at", "timestamp"), ("id", "uuid"))
+
+
+def test_cursor_round_trip():
+    row = {"created_at": datetime(2026, 1, 31, 12, 30, 5, 123456), "id": "8ef460e1-4869-432c-ad5a-391e5aa41184", "name": "ignored"}
+    cursor = encode_cursor(row, ORDER)
+    # Opaque and URL-safe: no padding or characters that need escaping
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor, ORDER) == ["2026-01-31 12:30:05.123456", "8ef460e1-4869-432c-ad5a-391e5aa41184"]
+
+
+def test_cursor_rejects_tampering():
+    valid = encode_cursor({"created_at": datetime(2026, 1, 1), "id": "a"}, ORDER)
+    wrong_length = base64.urlsafe_b64encode(json.dumps(["2026-01-01"]).encode()).decode()
+    not_a_list = base64.urlsafe_b64encode(json.dumps({"id": "a"}).encode()).decode()
+    for cursor in ("garbage!", valid[:-3], "", wrong_length, not_a_list, "AAAA"):
+        try:
+            decode_cursor(cursor, ORDER)
+        except InvalidCursor:
+            continue
+        raise AssertionError(f"accepted {cursor!r}")
+
+
+def forged(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_cursor_rejects_values_of_the_wrong_type():
+    # Well-formed cursors whose values would fail the ::timestamp / ::uuid casts
+    for values in (
+        ["yesterday", "8ef460e1-4869-432c-ad5a-391e5aa41184"],
+        ["2026-13-01 00:00:00", "8ef460e1-4869-432c-ad5a-391e5aa41184"],
+        ["2026-01-01 00:00:00", "not-a-uuid"],
+        [1767225600, "8ef460e1-4869-432c-ad5a-391e5aa41184"],
+        ["2026-01-01 00:00:00", {"id": 1}],
+    ):
+        try:
+            decode_cursor(forged(values), ORDER)
+        except InvalidCursor:
+            continue
+        raise AssertionError(f"accepted {values!r}")
+    for values in ([["SPY"]], ["S\x00PY"]):
+        try:
+            decode_cursor(forged(values), (("symbol", ""),))
+        except InvalidCursor:
+            continue
+        raise AssertionError(f"accepted {values!r}")
+    valid = ["2026-01-01 00:00:00.5", "8ef460e1-4869-432c-ad5a-391e5aa41184"]
+    assert decode_cursor(forged(valid), ORDER) == valid
+
+
+def test_cursor_for_another_ordering():
+    cursor = encode_cursor({"symbol": "SPY"}, (("symbol", ""),))
+    try:
+        decode_cursor(cursor, ORDER)
+    except InvalidCursor:
+        return
+    raise AssertionError("accepted a cursor for another ordering")
+
+
+def test_keyset_sql():
+    first = keyset_sql("SELECT * FROM jobs", ORDER, descending=True, after=False)
+    assert first == "SELECT * FROM (SELECT * FROM jobs) AS page  ORDER BY page.created_at DESC, page.id DESC LIMIT :page_limit"
+    after = keyset_sql("SELECT * FROM jobs", ORDER, descending=True, after=True)
+    assert "WHERE (page.created_at, page.id) < (:after_0::timestamp, :after_1::uuid)" in after
+    ascending = keyset_sql("SELECT * FROM positions", (("symbol", ""),), descending=False, after=True)
+    assert "WHERE (page.symbol) > (:after_0)" in ascending and "page.symbol ASC" in ascending
+
+
+def test_keyset_parameters():
+    assert keyset_parameters(None, 21) == [{"name": "page_limit", "value": {"longValue": 21}}]
+    assert keyset_parameters(["2026-01-01 00:00:00", "a"], 5)[1:] == [
+        {"name": "after_0", "value": {"stringValue": "2026-01-01 00:00:00"}},
+        {"name": "after_1", "value": {"stringValue": "a"}},
+    ]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
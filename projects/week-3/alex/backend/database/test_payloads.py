@@ -0,0 +1,81 @@
+"""
+Test offloading large job payloads to a payload store
+"""
+
+import tempfile
+
+from src.payloads import POINTER_KEY, LocalPayloadStore, compress, decompress, is_pointer
+from src.schemas import JOB_COMPLETED
+from testdb import fresh_database, needs_database, run_tests
+
+REPORT = {"content": "# Portfolio report\n" + "Diversified across regions. " * 200}
+
+
+def make_store(**kwargs):
+    return LocalPayloadStore(tempfile.mkdtemp(), inline_max_bytes=256, encoding="gzip", **kwargs)
+
+
+def test_small_payloads_stay_inline():
+    store = make_store()
+    assert store.offload("j1", "charts_payload", {"a": 1}) == {"a": 1}
+    assert store.offload("j1", "charts_payload", None) is None
+    assert store.load({"a": 1}) == {"a": 1}
+
+
+def test_offload_round_trip():
+    store = make_store()
+    pointer = store.offload("j1", "report_payload", REPORT)
+    assert is_pointer(pointer) and pointer[POINTER_KEY]["stored_size"] < pointer[POINTER_KEY]["size"]
+    assert pointer[POINTER_KEY]["key"].startswith("jobs/j1/report_payload/")
+    assert store.load(pointer) == REPORT
+    # Offloading a pointer again is a no-op
+    assert store.offload("j1", "report_payload", pointer) is pointer
+
+
+def test_keys_merged_next_to_a_pointer_override_the_document():
+    store = make_store()
+    pointer = store.offload("j1", "report_payload", REPORT)
+    merged = {**pointer, "agent": "reporter", "content": "replaced"}
+    assert is_pointer(merged)
+    assert store.load(merged) == {"content": "replaced", "agent": "reporter"}
+
+
+def test_corrupt_payload_is_rejected():
+    store = make_store()
+    pointer = store.offload("j1", "report_payload", REPORT)
+    store.put(pointer[POINTER_KEY]["key"], compress(b'{"content": "tampered"}', "gzip"), "gzip")
+    try:
+        store.load(pointer)
+    except ValueError:
+        return
+    raise AssertionError("loaded a payload that doesn't match its checksum")
+
+
+def test_compression_round_trip():
+    assert decompress(compress(b"payload" * 100, "gzip"), "gzip") == b"payload" * 100
+
+
+@needs_database
+def test_patch_offloads_and_merges_without_reading_back():
+    store = make_store()
+    db = fresh_database(payloads=store)
+    try:
+        db.users.create_user("u1")
+        job_id = db.jobs.create_job("u1", "portfolio_analysis")
+        db.jobs.patch(job_id, report_payload=REPORT)
+        stored = db.jobs.find_by_id(job_id)
+        assert is_pointer(stored["report_payload"])
+        assert stored["summary_preview"].startswith("Portfolio report Diversified")
+
+        # Merging into the offloaded column is one UPDATE, no SELECT first
+        with db.instrumentation.scope() as stats:
+            db.jobs.patch(job_id, status=JOB_COMPLETED, merge={"report_payload": {"agent": "reporter"}})
+        assert [s["fingerprint"].split()[0] for s in stats.summary()["top"]] == ["UPDATE"]
+        assert db.jobs.find_payload(job_id, "report_payload") == {**REPORT, "agent": "reporter"}
+        assert db.jobs.find_with_payloads(job_id)["report_payload"] == {**REPORT, "agent": "reporter"}
+    finally:
+        db.client.close()
+
+
+if __name__ == "__main__":
+    run_tests(globals())
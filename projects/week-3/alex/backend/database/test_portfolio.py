@@ -0,0 +1,69 @@
+"""
+Test loading a user's whole portfolio in one round trip
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from src.schemas import InstrumentCreate
+from testdb import fresh_database, needs_database, run_tests
+
+
+def make_portfolio(db):
+    db.instruments.create_instrument(InstrumentCreate(
+        symbol="SPY", name="SPDR S&P 500 ETF Trust", instrument_type="etf",
+        allocation_regions={"north_america": 100}, allocation_sectors={"technology": 100},
+        allocation_asset_class={"equity": 100},
+    ))
+    db.client.update("instruments", {"current_price": Decimal("512.25")}, "symbol = :symbol", {"symbol": "SPY"})
+    db.users.create_user("u1", "User One", years_until_retirement=20, target_retirement_income=Decimal("90000"))
+    account_id = db.accounts.create_account("u1", "Main", cash_balance=Decimal("100.50"))
+    db.positions.add_position(account_id, "SPY", Decimal("10"))
+    db.accounts.create_account("u1", "Empty")
+    job_id = db.jobs.create_job("u1", "portfolio_analysis")
+    return account_id, job_id
+
+
+@needs_database
+def test_load_portfolio():
+    db = fresh_database()
+    try:
+        account_id, job_id = make_portfolio(db)
+        by_user = db.load_portfolio(clerk_user_id="u1")
+        by_job = db.load_portfolio(job_id=job_id)
+        assert by_job["job_id"] == job_id and by_job["accounts"] == by_user["accounts"]
+
+        assert by_user["user_id"] == "u1"
+        assert by_user["years_until_retirement"] == 20 and by_user["target_retirement_income"] == 90000.0
+        accounts = {account["name"]: account for account in by_user["accounts"]}
+        assert accounts["Empty"]["positions"] == []
+        main = accounts["Main"]
+        assert main["id"] == account_id and main["cash_balance"] == 100.5
+        [position] = main["positions"]
+        assert position["symbol"] == "SPY" and position["quantity"] == 10.0
+
+        # The instrument is decoded like any other read, not left as JSON strings
+        instrument = position["instrument"]
+        assert instrument == db.instruments.find_by_symbol("SPY")
+        assert instrument["current_price"] == 512.25
+        assert isinstance(instrument["updated_at"], datetime)
+        assert instrument["allocation_asset_class"] == {"equity": 100}
+    finally:
+        db.client.close()
+
+
+@needs_database
+def test_load_portfolio_unknown_user_or_job():
+    db = fresh_database()
+    try:
+        assert db.load_portfolio(clerk_user_id="nobody") is None
+        assert db.load_portfolio(job_id="00000000-0000-0000-0000-000000000000") is None
+        # A user without accounts still has a portfolio
+        db.users.create_user("u2")
+        assert db.load_portfolio(clerk_user_id="u2")["accounts"] == []
+    finally:
+        db.client.close()
+
+
+if __name__ == "__main__":
+    run_tests(globals())
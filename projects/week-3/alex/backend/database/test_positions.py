@@ -0,0 +1,66 @@
+"""
+Test writing positions, one at a time and in a single batched statement
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.schemas import InstrumentCreate
+from testdb import fresh_database, needs_database, run_tests
+
+
+def make_account(db):
+    for symbol in ("SPY", "QQQ"):
+        db.instruments.create_instrument(InstrumentCreate(
+            symbol=symbol, name=f"{symbol} ETF", instrument_type="etf",
+            allocation_regions={"north_america": 100}, allocation_sectors={"technology": 100},
+            allocation_asset_class={"equity": 100},
+        ))
+    db.users.create_user("u1")
+    return db.accounts.create_account("u1", "Main")
+
+
+def holdings(db, account_id):
+    return sorted((p["symbol"], p["quantity"]) for p in db.positions.find_by_account(account_id))
+
+
+@needs_database
+def test_upsert_many():
+    db = fresh_database()
+    try:
+        account_id = make_account(db)
+        ids = db.positions.upsert_many(account_id, [("SPY", Decimal("10.5")), ("QQQ", 2), ("SPY", 11)])
+        # IDs come back in input order, and a repeated symbol keeps its last quantity
+        assert ids[0] == ids[2] and ids[1] and ids[0] != ids[1]
+        assert holdings(db, account_id) == [("QQQ", 2.0), ("SPY", 11.0)]
+
+        # Existing positions are updated in place
+        assert db.positions.upsert_many(account_id, [("QQQ", 3)]) == [ids[1]]
+        assert holdings(db, account_id) == [("QQQ", 3.0), ("SPY", 11.0)]
+        assert db.positions.upsert_many(account_id, []) == []
+    finally:
+        db.client.close()
+
+
+@needs_database
+def test_unknown_symbols_are_rejected():
+    db = fresh_database()
+    try:
+        account_id = make_account(db)
+        db.positions.add_position(account_id, "SPY", Decimal("1"))
+
+        with pytest.raises(ValueError, match="Instruments not found: NOPE, ZZZ"):
+            db.positions.upsert_many(account_id, [("SPY", 5), ("ZZZ", 1), ("QQQ", 2), ("NOPE", 1)])
+        # Nothing in the batch was written, not even the known symbols
+        assert holdings(db, account_id) == [("SPY", 1.0)]
+
+        with pytest.raises(ValueError, match="Instrument not found: NOPE"):
+            db.positions.add_position(account_id, "NOPE", Decimal("1"))
+        assert holdings(db, account_id) == [("SPY", 1.0)]
+    finally:
+        db.client.close()
+
+
+if __name__ == "__main__":
+    run_tests(globals())
@@ -0,0 +1,108 @@
+"""
+Test the direct PostgreSQL backend
+Statements against a real server run only when TEST_DATABASE_URL points at a
+scratch database, e.g. postgresql://postgres@localhost/alex_test
+"""
+
+import os
+from decimal import Decimal
+
+import pytest
+
+from src.postgres import PostgresClient, encode_field, parameter_values, translate_sql
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+needs_database = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+def test_translate_sql():
+    assert translate_sql("SELECT * FROM users WHERE clerk_user_id = :clerk_user_id") == (
+        "SELECT * FROM users WHERE clerk_user_id = %(clerk_user_id)s"
+    )
+    # Casts stay casts, and a placeholder followed by a cast is still translated
+    assert translate_sql("SELECT :id::uuid, NOW()::date") == "SELECT %(id)s::uuid, NOW()::date"
+    # Literal percent signs are escaped for psycopg
+    assert translate_sql("SELECT 1 WHERE name LIKE 'S%' || :q") == "SELECT 1 WHERE name LIKE 'S%%' || %(q)s"
+    assert translate_sql("SELECT a_1 FROM t WHERE x=:a_1 AND y=:B2") == "SELECT a_1 FROM t WHERE x=%(a_1)s AND y=%(B2)s"
+
+
+def test_parameter_values():
+    parameters = [
+        {"name": "name", "value": {"stringValue": "SPY"}},
+        {"name": "quantity", "value": {"doubleValue": 1.5}},
+        {"name": "count", "value": {"longValue": 3}},
+        {"name": "missing", "value": {"isNull": True}},
+    ]
+    assert parameter_values(parameters) == {"name": "SPY", "quantity": 1.5, "count": 3, "missing": None}
+    assert parameter_values(None) == {}
+
+
+def test_encode_field():
+    assert encode_field(None) == {"isNull": True}
+    assert encode_field(True) == {"booleanValue": True}
+    assert encode_field(2) == {"longValue": 2}
+    assert encode_field(Decimal("1.25")) == {"stringValue": "1.25"}
+    assert encode_field({"a": 1}) == {"stringValue": '{"a": 1}'}
+
+
+def make_client():
+    client = PostgresClient(TEST_DATABASE_URL, min_size=1, max_size=2)
+    client.execute("DROP TABLE IF EXISTS postgres_client_test")
+    client.execute("CREATE TABLE postgres_client_test (id INT PRIMARY KEY, name TEXT)")
+    return client
+
+
+def names(client):
+    """Names visible to a fresh pooled connection, outside any transaction"""
+    return [row["name"] for row in client.query("SELECT name FROM postgres_client_test ORDER BY id")]
+
+
+@needs_database
+def test_transaction_commits_on_reserved_connection():
+    client = make_client()
+    try:
+        with client.transaction() as transaction_id:
+            client.execute("INSERT INTO postgres_client_test VALUES (1, :name)", [
+                {"name": "name", "value": {"stringValue": "inside"}},
+            ])
+            # Statements in the block share the reserved connection...
+            assert client.query_one("SELECT name FROM postgres_client_test")["name"] == "inside"
+            # ...while other connections don't see the row until it commits
+            with client.use_transaction(None):
+                assert names(client) == []
+            assert client.transaction_id == transaction_id
+        assert client.transaction_id is None
+        assert names(client) == ["inside"]
+    finally:
+        client.execute("DROP TABLE IF EXISTS postgres_client_test")
+        client.close()
+
+
+@needs_database
+def test_transaction_rolls_back_and_returns_connection():
+    client = make_client()
+    try:
+        # More transactions than pooled connections: each must hand its connection back
+        for i in range(3):
+            with pytest.raises(RuntimeError):
+                with client.transaction():
+                    client.execute(f"INSERT INTO postgres_client_test VALUES ({i}, 'rolled back')")
+                    raise RuntimeError("abort")
+        assert names(client) == []
+        assert client._transactions == {}
+        with client.pool.connection() as conn:
+            assert conn.autocommit
+    finally:
+        client.execute("DROP TABLE IF EXISTS postgres_client_test")
+        client.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            if not TEST_DATABASE_URL and getattr(test, "pytestmark", None):
+                print(f"⏭️  {name} (TEST_DATABASE_URL not set)")
+                continue
+            test()
+            print(f"✅ {name}")
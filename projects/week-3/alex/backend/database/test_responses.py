@@ -0,0 +1,80 @@
+"""
+Test the precomputed response cache, ETags and content encodings
+"""
+
+import asyncio
+import gzip
+import time
+
+from src.responses import CachedResponse, ResponseCache, choose_encoding, etag_matches, make_etag
+
+
+def test_response_cache_ttl_and_lru():
+    cache = ResponseCache(maxsize=2, ttl=0.05)
+    responses = [CachedResponse.build(b"x", make_etag("r", i)) for i in range(3)]
+    for i, response in enumerate(responses):
+        cache.set(i, response)
+    assert cache.get(0) is None and cache.get(2) is responses[2]
+    time.sleep(0.1)
+    assert cache.get(2) is None
+
+
+def test_response_cache_single_flight():
+    cache = ResponseCache(ttl=60)
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.05)
+        return CachedResponse.build(b"{}", make_etag("job", "j1"))
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_build("job", build) for _ in range(20)))
+
+    results = asyncio.run(run())
+    assert len(builds) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["coalesced"] == 19
+
+
+def test_response_cache_failed_build_is_not_cached():
+    cache = ResponseCache(ttl=60)
+
+    async def fail():
+        raise RuntimeError("Aurora unavailable")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_build("k", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+    assert cache.get("k") is None
+
+
+def test_etag_matching():
+    etag = make_etag("instruments", "v1")
+    assert etag.startswith('"') and etag != make_etag("instruments", "v2")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_encodings():
+    small = CachedResponse.build(b"{}", make_etag("small"))
+    assert small.encodings == {} and small.encoded("gzip") == (b"{}", None)
+
+    body = b'{"instruments": [' + b'{"symbol": "SPY"},' * 200 + b"]}"
+    response = CachedResponse.build(body, make_etag("big"))
+    encoded, encoding = response.encoded("gzip, deflate")
+    assert encoding == "gzip" and gzip.decompress(encoded) == body
+    assert response.encoded("identity") == (body, None)
+    assert response.encoded("gzip;q=0") == (body, None)
+    assert choose_encoding("*", {"gzip": b""}) == "gzip"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,58 @@
+"""
+Test the compact typed rows and their lazily parsed JSONB columns
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.decoding import decode_rows
+from src.rows import AccountRow, InstrumentRow
+from src.statements import encode_value
+
+
+def test_decode_rows():
+    response = {
+        "columnMetadata": [
+            {"name": "id", "typeName": "uuid"},
+            {"name": "account_name", "typeName": "varchar"},
+            {"name": "cash_balance", "typeName": "numeric"},
+            {"name": "unexpected", "typeName": "varchar"},
+        ],
+        "records": [[encode_value("a1"), encode_value("Main"), encode_value(Decimal("10.5")), encode_value("x")]],
+    }
+    row = decode_rows(response, AccountRow)[0]
+    assert row.id == "a1" and row["account_name"] == "Main" and row.cash_balance == 10.5
+    # Undeclared columns are dropped, missing ones are None
+    assert "unexpected" not in row and row.created_at is None
+
+
+def test_json_columns_parse_on_first_read():
+    row = InstrumentRow.from_dict({"symbol": "SPY", "allocation_regions": '{"north_america": 100}'})
+    # Still the raw text until someone reads it
+    assert row._allocation_regions == '{"north_america": 100}'
+    assert row.allocation_regions == {"north_america": 100}
+    assert row._allocation_regions == {"north_america": 100}
+    assert row["allocation_regions"] is row.allocation_regions
+    # Already-parsed values and NULLs are left alone
+    assert InstrumentRow.from_dict({"allocation_sectors": {"technology": 100}}).allocation_sectors == {"technology": 100}
+    assert InstrumentRow.from_dict({}).allocation_sectors is None
+
+
+def test_rows_read_like_dicts():
+    row = AccountRow.from_dict({"id": "a1", "account_name": "Main", "cash_balance": 10.5})
+    assert len(row) == len(AccountRow._fields) and list(row) == list(AccountRow._fields)
+    assert row.get("account_name") == "Main" and row.get("nope", "default") == "default"
+    assert row.to_dict() == dict(row.items()) and row.to_dict()["cash_balance"] == 10.5
+    assert row == AccountRow.from_dict(row.to_dict()) and row != AccountRow.from_dict({"id": "a2"})
+    with pytest.raises(KeyError):
+        row["nope"]
+    # Slotted: no per-row __dict__ to hold stray attributes
+    assert not hasattr(row, "__dict__")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
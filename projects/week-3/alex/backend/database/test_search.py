@@ -0,0 +1,56 @@
+"""
+Test the in-process instrument search index
+"""
+
+from src.search import InstrumentIndex
+
+
+INSTRUMENTS = [
+    {"symbol": "SPY", "name": "SPDR S&P 500 ETF Trust"},
+    {"symbol": "SPYG", "name": "SPDR Portfolio S&P 500 Growth ETF"},
+    {"symbol": "VTI", "name": "Vanguard Total Stock Market ETF"},
+    {"symbol": "BND", "name": "Vanguard Total Bond Market ETF"},
+    {"symbol": "XLSP", "name": "Special Situations Fund"},
+]
+
+
+def test_search_ranking():
+    index = InstrumentIndex(INSTRUMENTS)
+    # Symbol prefixes first, then name words, then any substring
+    assert [i["symbol"] for i in index.search("sp")] == ["SPY", "SPYG", "XLSP"]
+    assert [i["symbol"] for i in index.search("vanguard")] == ["BND", "VTI"]
+    assert [i["symbol"] for i in index.search("total bond")] == ["BND"]
+    assert [i["symbol"] for i in index.search("  SPY ")] == ["SPY", "SPYG"]
+    assert [i["symbol"] for i in index.search("market etf")] == ["BND", "VTI"]
+    assert index.search("") == [] and index.search("zzz") == []
+
+
+def test_search_paging():
+    index = InstrumentIndex(INSTRUMENTS)
+    everything = [i["symbol"] for i in index.search("s", limit=100)]
+    assert len(everything) == len(set(everything))
+    assert [i["symbol"] for i in index.search("s", limit=2)] == everything[:2]
+    assert [i["symbol"] for i in index.search("s", limit=2, offset=2)] == everything[2:4]
+
+
+def test_search_symbols_with_punctuation():
+    # '_', '^' and '[' sort between 'Z' and 'a', so only a lowercase sort keeps prefixes contiguous
+    index = InstrumentIndex([
+        {"symbol": "BRK_B", "name": "Berkshire Hathaway Class B"},
+        {"symbol": "BRKA", "name": "Berkshire Hathaway Class A"},
+        {"symbol": "^GSPC", "name": "S&P 500 Index"},
+        {"symbol": "BRK[W]", "name": "Berkshire Warrant"},
+        {"symbol": "brk.c", "name": "Lowercase Listing"},
+        {"symbol": "A", "name": "Agilent Technologies"},
+    ])
+    assert [i["symbol"] for i in index.search("brk")] == ["brk.c", "BRK[W]", "BRK_B", "BRKA"]
+    assert [i["symbol"] for i in index.search("brk_")] == ["BRK_B"]
+    assert [i["symbol"] for i in index.search("^gs")] == ["^GSPC"]
+    assert [i["symbol"] for i in index.search("a")][0] == "A"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,54 @@
+"""
+Test compiled insert/update statements and parameter encoding
+"""
+
+from decimal import Decimal
+
+from src.statements import compile_insert, compile_update, parameter_encoder, signature
+
+
+def test_parameter_encoder_falls_back_per_value():
+    data = {"price": 1.5, "name": "x"}
+    encode = parameter_encoder(("price", "name"), (float, str))
+    assert encode(data) == [
+        {"name": "price", "value": {"doubleValue": 1.5}},
+        {"name": "name", "value": {"stringValue": "x"}},
+    ]
+    # A NULL or an int in a float column is encoded by its own type
+    assert encode({"price": None, "name": "x"})[0]["value"] == {"isNull": True}
+    assert encode({"price": 2, "name": "x"})[0]["value"] == {"longValue": 2}
+
+
+def test_compile_insert():
+    data = {"clerk_user_id": "u1", "asset_class_targets": {"equity": 70}, "target_retirement_income": Decimal("1")}
+    statement = compile_insert("users", signature(data), "*", "(clerk_user_id) DO NOTHING")
+    sql = " ".join(statement.sql.split())
+    assert sql == (
+        "INSERT INTO users (clerk_user_id, asset_class_targets, target_retirement_income) "
+        "VALUES (:clerk_user_id, :asset_class_targets::jsonb, :target_retirement_income::numeric) "
+        "ON CONFLICT (clerk_user_id) DO NOTHING RETURNING *"
+    )
+    # The same signature reuses the compiled statement
+    assert compile_insert("users", signature(data), "*", "(clerk_user_id) DO NOTHING") is statement
+
+
+def test_compile_update():
+    statement = compile_update(
+        "jobs", signature({"status": "running"}), "id = :id::uuid", signature({"id": "j1"}),
+        "*", merge_columns=("summary_payload",)
+    )
+    sql = " ".join(statement.sql.split())
+    assert sql == (
+        "UPDATE jobs SET status = :status, "
+        "summary_payload = COALESCE(summary_payload, '{}'::jsonb) || :summary_payload_merge::jsonb "
+        "WHERE id = :id::uuid RETURNING *"
+    )
+    parameters = statement.encode({"status": "running", "summary_payload_merge": {"a": 1}, "id": "j1"})
+    assert [p["name"] for p in parameters] == ["status", "summary_payload_merge", "id"]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,210 @@
+"""
+Test transactions and retries on a client whose transport is scripted
+Runs without AWS or a database: statements are recorded, and errors are
+raised from a queue to stand in for a resuming cluster or a deadlock.
+"""
+
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.client import RETRY_MAX_ATTEMPTS, BaseClient
+from src.models import Database
+
+
+def client_error(code: str, message: str = "") -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message}}, "ExecuteStatement")
+
+
+def resuming():
+    return client_error("DatabaseResumingException", "Database is resuming")
+
+
+def deadlock():
+    return client_error("BadRequestException", "ERROR: deadlock detected")
+
+
+class ScriptedClient(BaseClient):
+    """Records every call; _execute raises the queued errors first"""
+
+    def __init__(self, errors=()):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = []
+        self.transactions = 0
+
+    def _execute(self, sql, parameters=None, format_records_as=None):
+        self.calls.append(("execute", sql, self.transaction_id))
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"records": [], "numberOfRecordsUpdated": 1}
+
+    def _batch_execute(self, sql, parameter_sets):
+        self.calls.append(("batch", sql, self.transaction_id))
+        return [{} for _ in parameter_sets]
+
+    def begin_transaction(self):
+        self.transactions += 1
+        transaction_id = f"tx-{self.transactions}"
+        self.calls.append(("begin", transaction_id))
+        return transaction_id
+
+    def commit_transaction(self, transaction_id):
+        self.calls.append(("commit", transaction_id))
+
+    def rollback_transaction(self, transaction_id):
+        self.calls.append(("rollback", transaction_id))
+
+
+def no_sleep():
+    return mock.patch("src.client.time.sleep")
+
+
+def test_transaction_commits():
+    db = ScriptedClient()
+    with db.transaction() as transaction_id:
+        db.execute("UPDATE a")
+        # Nested blocks join the outer transaction
+        with db.transaction() as nested:
+            assert nested == transaction_id
+            db.execute("UPDATE b")
+    assert db.transaction_id is None
+    assert db.calls == [
+        ("begin", "tx-1"),
+        ("execute", "UPDATE a", "tx-1"),
+        ("execute", "UPDATE b", "tx-1"),
+        ("commit", "tx-1"),
+    ]
+
+
+def test_transaction_rolls_back_on_error():
+    db = ScriptedClient()
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute("UPDATE a")
+            raise RuntimeError("boom")
+    assert db.calls[-1] == ("rollback", "tx-1")
+    assert ("commit", "tx-1") not in db.calls
+    assert db.transaction_id is None
+
+
+def test_transaction_writes_notify_again_when_finished():
+    db = ScriptedClient()
+    notified = []
+    db.on_write(notified.append)
+    with db.transaction():
+        db.notify_write("positions")
+        assert notified == ["positions"]
+    # Caches refilled mid-transaction are invalidated once the writes are visible
+    assert notified == ["positions", "positions"]
+
+
+def test_use_transaction_binds_statements():
+    db = ScriptedClient()
+    with db.use_transaction("tx-outer"):
+        db.execute("UPDATE a")
+        db.execute_many("UPDATE b", [[], []])
+    db.execute("UPDATE c")
+    assert [call[2] for call in db.calls] == ["tx-outer", "tx-outer", None]
+    # It only binds: beginning and ending the transaction is the caller's job
+    assert db.transactions == 0
+
+
+def test_statements_retry_while_resuming():
+    db = ScriptedClient([resuming(), resuming()])
+    with no_sleep() as sleep:
+        assert db.execute("SELECT 1")["numberOfRecordsUpdated"] == 1
+    assert len(db.calls) == 3 and sleep.call_count == 2
+
+
+def test_statements_in_a_transaction_are_not_retried():
+    db = ScriptedClient([resuming()])
+    with no_sleep() as sleep, pytest.raises(ClientError):
+        with db.transaction():
+            db.execute("UPDATE a")
+    # The statement ran once; resending it alone could apply half a unit of work
+    assert [call[0] for call in db.calls] == ["begin", "execute", "rollback"]
+    assert sleep.call_count == 0
+
+
+def test_other_errors_are_not_retried():
+    for error in (deadlock(), client_error("BadRequestException", "syntax error"), ValueError("bad")):
+        db = ScriptedClient([error])
+        with no_sleep() as sleep, pytest.raises(type(error)):
+            db.execute("SELECT 1")
+        assert len(db.calls) == 1 and sleep.call_count == 0
+
+
+def test_retries_stop_after_the_last_attempt():
+    db = ScriptedClient([resuming() for _ in range(RETRY_MAX_ATTEMPTS)])
+    db.retry_deadline = 3600
+    with no_sleep(), pytest.raises(ClientError):
+        db.execute("SELECT 1")
+    assert len(db.calls) == RETRY_MAX_ATTEMPTS
+
+
+def test_retries_stop_at_the_deadline():
+    db = ScriptedClient([resuming() for _ in range(RETRY_MAX_ATTEMPTS)])
+    with no_sleep() as sleep, pytest.raises(ClientError):
+        with db.deadline(0):
+            db.execute("SELECT 1")
+    assert len(db.calls) == 1 and sleep.call_count == 0
+
+
+def test_run_in_transaction_retries_the_whole_unit():
+    db = ScriptedClient([deadlock()])
+    with no_sleep():
+        result = db.run_in_transaction(lambda: db.execute("UPDATE a") and db.execute("UPDATE b") and "done")
+    assert result == "done"
+    assert db.calls == [
+        ("begin", "tx-1"),
+        ("execute", "UPDATE a", "tx-1"),
+        ("rollback", "tx-1"),
+        ("begin", "tx-2"),
+        ("execute", "UPDATE a", "tx-2"),
+        ("execute", "UPDATE b", "tx-2"),
+        ("commit", "tx-2"),
+    ]
+
+
+def test_run_in_transaction_gives_up():
+    db = ScriptedClient([deadlock() for _ in range(3)])
+    with no_sleep(), pytest.raises(ClientError):
+        db.run_in_transaction(lambda: db.execute("UPDATE a"), max_attempts=3)
+    assert db.transactions == 3
+
+    # Errors that aren't transient fail on the first attempt
+    db = ScriptedClient([client_error("BadRequestException", "syntax error")])
+    with no_sleep(), pytest.raises(ClientError):
+        db.run_in_transaction(lambda: db.execute("UPDATE a"))
+    assert db.transactions == 1
+
+
+def test_run_in_transaction_joins_an_open_transaction():
+    db = ScriptedClient()
+    with db.transaction():
+        db.run_in_transaction(lambda: db.execute("UPDATE a"))
+    assert db.transactions == 1 and db.calls[-1] == ("commit", "tx-1")
+
+
+def test_database_run_in_transaction_passes_itself():
+    client = ScriptedClient([deadlock()])
+    db = Database(client=client)
+    def unit(tx):
+        assert tx is db
+        tx.client.execute("UPDATE a")
+        return tx.client.transaction_id
+
+    with no_sleep():
+        assert db.run_in_transaction(unit) == "tx-2"
+    with db.transaction() as tx:
+        assert tx is db and client.transaction_id == "tx-3"
+    assert client.calls[-1] == ("commit", "tx-3")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
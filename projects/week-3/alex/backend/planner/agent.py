@@ -78,32 +78,25 @@ def handle_missing_instruments(job_id: str, db) -> None:
     """
     logger.info("Planner: Checking for instruments missing allocation data...")
 
-    # Get job and portfolio data
-    job = db.jobs.find_by_id(job_id)
-    if not job:
+    # Get job and portfolio data in one round trip
+    portfolio = db.load_portfolio(job_id=job_id)
+    if not portfolio:
         logger.error(f"Job {job_id} not found")
         return
 
-    user_id = job["clerk_user_id"]
-    accounts = db.accounts.find_by_user(user_id)
-
     missing = []
-    for account in accounts:
-        positions = db.positions.find_by_account(account["id"])
-        for position in positions:
-            instrument = db.instruments.find_by_symbol(position["symbol"])
-            if instrument:
-                has_allocations = bool(
-                    instrument.get("allocation_regions")
-                    and instrument.get("allocation_sectors")
-                    and instrument.get("allocation_asset_class")
+    for account in portfolio["accounts"]:
+        for position in account["positions"]:
+            instrument = position["instrument"]
+            has_allocations = bool(
+                instrument.get("allocation_regions")
+                and instrument.get("allocation_sectors")
+                and instrument.get("allocation_asset_class")
+            )
+            if not has_allocations:
+                missing.append(
+                    {"symbol": position["symbol"], "name": instrument.get("name", "")}
                 )
-                if not has_allocations:
-                    missing.append(
-                        {"symbol": position["symbol"], "name": instrument.get("name", "")}
-                    )
-            else:
-                missing.append({"symbol": position["symbol"], "name": ""})
 
     if missing:
         logger.info(
@@ -138,44 +131,20 @@ def handle_missing_instruments(job_id: str, db) -> None:
 def load_portfolio_summary(job_id: str, db) -> Dict[str, Any]:
     """Load basic portfolio summary statistics only."""
     try:
-        job = db.jobs.find_by_id(job_id)
-        if not job:
+        # One row kept current by the valuation triggers - no positions are loaded
+        valuation = db.valuations.find_by_job(job_id)
+        if not valuation:
             raise ValueError(f"Job {job_id} not found")
+        if not valuation["user_exists"]:
+            raise ValueError(f"User {valuation['clerk_user_id']} not found")
 
-        user_id = job["clerk_user_id"]
-        user = db.users.find_by_clerk_id(user_id)
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-
-        accounts = db.accounts.find_by_user(user_id)
-        
-        # Calculate simple summary statistics
-        total_value = 0.0
-        total_positions = 0
-        total_cash = 0.0
-        
-        for account in accounts:
-            total_cash += float(account.get("cash_balance", 0))
-            positions = db.positions.find_by_account(account["id"])
-            total_positions += len(positions)
-            
-            # Add position values
-            for position in positions:
-                instrument = db.instruments.find_by_symbol(position["symbol"])
-                if instrument and instrument.get("current_price"):
-                    price = float(instrument["current_price"])
-                    quantity = float(position["quantity"])
-                    total_value += price * quantity
-        
-        total_value += total_cash
-        
         # Return only summary statistics
         return {
-            "total_value": total_value,
-            "num_accounts": len(accounts),
-            "num_positions": total_positions,
-            "years_until_retirement": user.get("years_until_retirement", 30),
-            "target_retirement_income": float(user.get("target_retirement_income", 80000))
+            "total_value": float(valuation["total_value"] or 0),
+            "num_accounts": valuation["num_accounts"] or 0,
+            "num_positions": valuation["num_positions"] or 0,
+            "years_until_retirement": valuation["years_until_retirement"] if valuation["years_until_retirement"] is not None else 30,
+            "target_retirement_income": float(valuation["target_retirement_income"] if valuation["target_retirement_income"] is not None else 80000)
         }
 
     except Exception as e:
@@ -20,6 +20,7 @@ except ImportError:
 
 # Import database package
 from src import Database
+from src.events import ANALYZING, PRICING, TAGGING
 
 from templates import ORCHESTRATOR_INSTRUCTIONS
 from agent import create_agent, handle_missing_instruments, load_portfolio_summary
@@ -36,53 +37,76 @@ db = Database()
     retry=retry_if_exception_type(RateLimitError),
     stop=stop_after_attempt(5),
     wait=wait_exponential(multiplier=1, min=4, max=60),
+    reraise=True,
     before_sleep=lambda retry_state: logger.info(f"Planner: Rate limit hit, retrying in {retry_state.next_action.sleep} seconds...")
 )
+async def orchestrate(job_id: str) -> None:
+    """Run the orchestrator agent to coordinate portfolio analysis (retried on rate limits)."""
+    # Handle missing instruments first (non-agent pre-processing)
+    db.jobs.emit(job_id, TAGGING)
+    await asyncio.to_thread(handle_missing_instruments, job_id, db)
+
+    # Update instrument prices after tagging
+    logger.info("Planner: Updating instrument prices from market data")
+    db.jobs.emit(job_id, PRICING)
+    await asyncio.to_thread(update_instrument_prices, job_id, db)
+
+    # Load portfolio summary (just statistics, not full data)
+    portfolio_summary = await asyncio.to_thread(load_portfolio_summary, job_id, db)
+    
+    # Create agent with tools and context
+    model, tools, task, context = create_agent(job_id, portfolio_summary, db)
+    
+    # Run the orchestrator
+    db.jobs.emit(job_id, ANALYZING)
+    with trace("Planner Orchestrator"):
+        from agent import PlannerContext
+        agent = Agent[PlannerContext](
+            name="Financial Planner",
+            instructions=ORCHESTRATOR_INSTRUCTIONS,
+            model=model,
+            tools=tools
+        )
+        
+        result = await Runner.run(
+            agent,
+            input=task,
+            context=context,
+            max_turns=20
+        )
+
 async def run_orchestrator(job_id: str) -> None:
-    """Run the orchestrator agent to coordinate portfolio analysis."""
+    """
+    Run the orchestration and record the job's outcome.
+
+    The job is marked failed only once retries are exhausted: a failed status
+    ends the frontend's event stream, so it must be final.
+    """
     try:
         # Update job status to running
         db.jobs.update_status(job_id, 'running')
-        
-        # Handle missing instruments first (non-agent pre-processing)
-        await asyncio.to_thread(handle_missing_instruments, job_id, db)
 
-        # Update instrument prices after tagging
-        logger.info("Planner: Updating instrument prices from market data")
-        await asyncio.to_thread(update_instrument_prices, job_id, db)
+        await orchestrate(job_id)
 
-        # Load portfolio summary (just statistics, not full data)
-        portfolio_summary = await asyncio.to_thread(load_portfolio_summary, job_id, db)
-        
-        # Create agent with tools and context
-        model, tools, task, context = create_agent(job_id, portfolio_summary, db)
-        
-        # Run the orchestrator
-        with trace("Planner Orchestrator"):
-            from agent import PlannerContext
-            agent = Agent[PlannerContext](
-                name="Financial Planner",
-                instructions=ORCHESTRATOR_INSTRUCTIONS,
-                model=model,
-                tools=tools
-            )
-            
-            result = await Runner.run(
-                agent,
-                input=task,
-                context=context,
-                max_turns=20
-            )
-            
-            # Mark job as completed after all agents finish
-            db.jobs.update_status(job_id, "completed")
-            logger.info(f"Planner: Job {job_id} completed successfully")
+        # Mark job as completed after all agents finish
+        db.jobs.update_status(job_id, "completed")
+        logger.info(f"Planner: Job {job_id} completed successfully")
             
     except Exception as e:
         logger.error(f"Planner: Error in orchestration: {e}", exc_info=True)
         db.jobs.update_status(job_id, 'failed', error_message=str(e))
         raise
 
+def log_database_stats(job_id: str) -> None:
+    """Log Aurora time and repeated statements (likely N+1 queries) for this invocation"""
+    stats = db.stats(top=5)
+    logger.info(
+        f"Planner: Job {job_id} ran {stats['statements']} statements "
+        f"in {stats['total_ms']:.0f}ms ({stats['retries']} retries)"
+    )
+    for hotspot in stats['hotspots']:
+        logger.info(f"Planner: Repeated statement x{hotspot['calls']} ({hotspot['total_ms']:.0f}ms): {hotspot['fingerprint'][:200]}")
+
 def lambda_handler(event, context):
     """
     Lambda handler for SQS-triggered orchestration.
@@ -124,8 +148,12 @@ def lambda_handler(event, context):
 
             logger.info(f"Planner: Starting orchestration for job {job_id}")
 
-            # Run the orchestrator
-            asyncio.run(run_orchestrator(job_id))
+            # Run the orchestrator, collecting the statements it runs
+            with db.instrumentation.scope():
+                try:
+                    asyncio.run(run_orchestrator(job_id))
+                finally:
+                    log_database_stats(job_id)
 
             return {
                 'statusCode': 200,
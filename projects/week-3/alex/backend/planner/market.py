@@ -21,22 +21,17 @@ def update_instrument_prices(job_id: str, db) -> None:
     try:
         logger.info(f"Market: Fetching current prices for job {job_id}")
 
-        # Get the job to find the user
-        job = db.jobs.find_by_id(job_id)
-        if not job:
+        # Get all unique symbols from the user's positions in one round trip
+        portfolio = db.load_portfolio(job_id=job_id)
+        if not portfolio:
             logger.error(f"Market: Job {job_id} not found")
             return
 
-        user_id = job['clerk_user_id']
-
-        # Get all unique symbols from user's positions
-        accounts = db.accounts.find_by_user(user_id)
-        symbols = set()
-
-        for account in accounts:
-            positions = db.positions.find_by_account(account['id'])
-            for position in positions:
-                symbols.add(position['symbol'])
+        symbols = {
+            position['symbol']
+            for account in portfolio['accounts']
+            for position in account['positions']
+        }
 
         if not symbols:
             logger.info("Market: No symbols to update prices for")
@@ -83,26 +78,22 @@ def update_prices_for_symbols(symbols: Set[str], db) -> None:
 
     logger.info(f"Market: Retrieved prices for {len(price_map)}/{len(symbols_list)} symbols")
 
-    # Update database with fetched prices
-    for symbol, price in price_map.items():
+    # Update database with fetched prices in a single batch
+    if price_map:
         try:
-            instrument = db.instruments.find_by_symbol(symbol)
-            if instrument:
-                update_data = {'current_price': price}
-                success = db.client.update(
-                    'instruments',
-                    update_data,
-                    "symbol = :symbol",
-                    {'symbol': symbol}
-                )
-                if success:
+            updated = db.client.update_many(
+                'instruments',
+                [({'current_price': price}, {'symbol': symbol}) for symbol, price in price_map.items()],
+                "symbol = :symbol",
+                returning='symbol'
+            )
+            for (symbol, price), updated_symbol in zip(price_map.items(), updated):
+                if updated_symbol:
                     logger.info(f"Market: Updated {symbol} price to ${price:.2f}")
                 else:
-                    logger.warning(f"Market: Failed to update price for {symbol}")
-            else:
-                logger.warning(f"Market: Instrument {symbol} not found in database")
+                    logger.warning(f"Market: Instrument {symbol} not found in database")
         except Exception as e:
-            logger.error(f"Market: Error updating {symbol} in database: {e}")
+            logger.error(f"Market: Error updating prices in database: {e}")
 
     # Log symbols that didn't get prices
     missing = set(symbols_list) - set(price_map.keys())
@@ -124,14 +115,8 @@ def get_all_portfolio_symbols(db) -> Set[str]:
     symbols = set()
 
     try:
-        # Get all positions (this might need pagination for large datasets)
-        all_positions = db.db.execute(
-            "SELECT DISTINCT symbol FROM positions"
-        )
-
-        for position in all_positions:
-            if position['symbol']:
-                symbols.add(position['symbol'])
+        # Paged so any number of positions fits in bounded memory
+        symbols.update(db.positions.iter_symbols())
 
     except Exception as e:
         logger.error(f"Market: Error fetching all symbols: {e}")
@@ -144,6 +144,7 @@ def main():
         return 1
     
     # Display results
+    job = db.jobs.resolve_payloads(job)
     print("\n" + "=" * 70)
     print("📋 ANALYSIS RESULTS")
     print("=" * 70)
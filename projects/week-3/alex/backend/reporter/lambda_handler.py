@@ -133,41 +133,13 @@ def lambda_handler(event, context):
             if not portfolio_data:
                 # Try to load from database
                 try:
-                    job = db.jobs.find_by_id(job_id)
-                    if job:
-                        user_id = job["clerk_user_id"]
-
+                    # Accounts, positions and instruments in one round trip
+                    portfolio_data = db.load_portfolio(job_id=job_id)
+                    if portfolio_data:
                         if observability:
                             observability.create_event(
                                 name="Reporter Started!", status_message="OK"
                             )
-                        user = db.users.find_by_clerk_id(user_id)
-                        accounts = db.accounts.find_by_user(user_id)
-
-                        portfolio_data = {"user_id": user_id, "job_id": job_id, "accounts": []}
-
-                        for account in accounts:
-                            positions = db.positions.find_by_account(account["id"])
-                            account_data = {
-                                "id": account["id"],
-                                "name": account["account_name"],
-                                "type": account.get("account_type", "investment"),
-                                "cash_balance": float(account.get("cash_balance", 0)),
-                                "positions": [],
-                            }
-
-                            for position in positions:
-                                instrument = db.instruments.find_by_symbol(position["symbol"])
-                                if instrument:
-                                    account_data["positions"].append(
-                                        {
-                                            "symbol": position["symbol"],
-                                            "quantity": float(position["quantity"]),
-                                            "instrument": instrument,
-                                        }
-                                    )
-
-                            portfolio_data["accounts"].append(account_data)
                     else:
                         return {
                             "statusCode": 404,
@@ -181,6 +153,12 @@ def lambda_handler(event, context):
                     }
 
             user_data = event.get("user_data", {})
+            if not user_data and "target_retirement_income" in portfolio_data:
+                # Already loaded with the portfolio
+                user_data = {
+                    "years_until_retirement": portfolio_data["years_until_retirement"],
+                    "target_retirement_income": portfolio_data["target_retirement_income"],
+                }
             if not user_data:
                 # Try to load from database
                 try:
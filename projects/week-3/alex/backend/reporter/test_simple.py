@@ -70,7 +70,7 @@ def test_reporter():
         print("CHECKING DATABASE CONTENT")
         print("=" * 60)
         
-        job = db.jobs.find_by_id(job_id)
+        job = db.jobs.find_with_payloads(job_id)
         if job and job.get('report_payload'):
             payload = job['report_payload']
             print(f"✅ Report data found in database")
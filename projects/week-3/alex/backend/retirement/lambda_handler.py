@@ -68,8 +68,15 @@ def get_user_preferences(job_id: str) -> Dict[str, Any]:
 async def run_retirement_agent(job_id: str, portfolio_data: Dict[str, Any]) -> Dict[str, Any]:
     """Run the retirement specialist agent."""
     
-    # Get user preferences
-    user_preferences = get_user_preferences(job_id)
+    # Get user preferences (already there if the portfolio was loaded from the database)
+    if 'target_retirement_income' in portfolio_data:
+        user_preferences = {
+            'years_until_retirement': portfolio_data['years_until_retirement'],
+            'target_retirement_income': portfolio_data['target_retirement_income'],
+            'current_age': 40  # Default for now
+        }
+    else:
+        user_preferences = get_user_preferences(job_id)
     
     # Initialize database
     db = Database()
@@ -156,46 +163,13 @@ def lambda_handler(event, context):
                     from src import Database
 
                     db = Database()
-                    job = db.jobs.find_by_id(job_id)
-                    if job:
+                    # Accounts, positions and instruments in one round trip
+                    portfolio_data = db.load_portfolio(job_id=job_id)
+                    if portfolio_data:
                         if observability:
                             observability.create_event(
                                 name="Retirement Started!", status_message="OK"
                             )
-                        
-                        # portfolio_data = job.get('request_payload', {}).get('portfolio_data', {})
-                        user_id = job['clerk_user_id']
-                        user = db.users.find_by_clerk_id(user_id)
-                        accounts = db.accounts.find_by_user(user_id)
-
-                        portfolio_data = {
-                            'user_id': user_id,
-                            'job_id': job_id,
-                            'years_until_retirement': user.get('years_until_retirement', 30) if user else 30,
-                            'accounts': []
-                        }
-
-                        for account in accounts:
-                            account_data = {
-                                'id': account['id'],
-                                'name': account['account_name'],
-                                'type': account.get('account_type', 'investment'),
-                                'cash_balance': float(account.get('cash_balance', 0)),
-                                'positions': []
-                            }
-
-                            positions = db.positions.find_by_account(account['id'])
-                            for position in positions:
-                                instrument = db.instruments.find_by_symbol(position['symbol'])
-                                if instrument:
-                                    account_data['positions'].append({
-                                        'symbol': position['symbol'],
-                                        'quantity': float(position['quantity']),
-                                        'instrument': instrument
-                                    })
-
-                            portfolio_data['accounts'].append(account_data)
-
                         logger.info(f"Retirement: Loaded {len(portfolio_data['accounts'])} accounts with positions")
                     else:
                         logger.error(f"Retirement: Job {job_id} not found")
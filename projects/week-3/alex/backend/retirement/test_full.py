@@ -46,7 +46,7 @@ def test_retirement_lambda():
         
         # Check database for results
         time.sleep(2)  # Give it a moment
-        job = db.jobs.find_by_id(job_id)
+        job = db.jobs.find_with_payloads(job_id)
         
         if job and job.get('retirement_payload'):
             print("\n✅ Retirement analysis generated successfully!")
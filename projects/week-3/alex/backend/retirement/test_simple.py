@@ -67,7 +67,7 @@ def test_retirement():
         print("CHECKING DATABASE CONTENT")
         print("=" * 60)
         
-        job = db.jobs.find_by_id(job_id)
+        job = db.jobs.find_with_payloads(job_id)
         if job and job.get('retirement_payload'):
             payload = job['retirement_payload']
             print(f"✅ Retirement data found in database")
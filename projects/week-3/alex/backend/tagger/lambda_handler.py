@@ -38,34 +38,21 @@ async def process_instruments(instruments: List[Dict[str, str]]) -> Dict[str, An
     # Update database with classifications
     updated = []
     errors = []
+    to_update = []
+    to_create = []
+    
+    # Check which instruments already exist in one lookup
+    existing = db.instruments.find_by_symbols([c.symbol for c in classifications])
     
     for classification in classifications:
         try:
             # Convert to database format
             db_instrument = classification_to_db_format(classification)
             
-            # Check if instrument exists
-            existing = db.instruments.find_by_symbol(classification.symbol)
-            
-            if existing:
-                # Update existing instrument
-                update_data = db_instrument.model_dump()
-                # Remove symbol as it's the key
-                del update_data['symbol']
-                
-                rows = db.client.update(
-                    'instruments',
-                    update_data,
-                    "symbol = :symbol",
-                    {'symbol': classification.symbol}
-                )
-                logger.info(f"Updated {classification.symbol} in database ({rows} rows)")
+            if classification.symbol in existing:
+                to_update.append(db_instrument)
             else:
-                # Create new instrument
-                db.instruments.create_instrument(db_instrument)
-                logger.info(f"Created {classification.symbol} in database")
-            
-            updated.append(classification.symbol)
+                to_create.append(db_instrument)
             
         except Exception as e:
             logger.error(f"Error updating {classification.symbol}: {e}")
@@ -74,6 +61,32 @@ async def process_instruments(instruments: List[Dict[str, str]]) -> Dict[str, An
                 'error': str(e)
             })
     
+    # Write all classifications in batches instead of one call per instrument
+    if to_update:
+        try:
+            updates = []
+            for db_instrument in to_update:
+                update_data = db_instrument.model_dump()
+                # Remove symbol as it's the key
+                symbol = update_data.pop('symbol')
+                updates.append((update_data, {'symbol': symbol}))
+            
+            db.client.update_many('instruments', updates, "symbol = :symbol")
+            logger.info(f"Updated {len(updates)} instruments in database")
+            updated.extend(i.symbol for i in to_update)
+        except Exception as e:
+            logger.error(f"Error updating instruments: {e}")
+            errors.extend({'symbol': i.symbol, 'error': str(e)} for i in to_update)
+    
+    if to_create:
+        try:
+            db.instruments.create_instruments(to_create)
+            logger.info(f"Created {len(to_create)} instruments in database")
+            updated.extend(i.symbol for i in to_create)
+        except Exception as e:
+            logger.error(f"Error creating instruments: {e}")
+            errors.extend({'symbol': i.symbol, 'error': str(e)} for i in to_create)
+    
     # Prepare response (convert Pydantic models to dicts)
     return {
         'tagged': len(classifications),
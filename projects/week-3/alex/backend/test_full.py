@@ -142,6 +142,7 @@ def main():
             print("-" * 50)
             print("\n✅ Job completed successfully!")
             print("\n📊 Analysis Results:")
+            job = db.jobs.resolve_payloads(job)
             
             # Report
             if job.get('report_payload'):
@@ -63,13 +63,16 @@ async def create_test_user(user_num: int, num_accounts: int, num_positions: int)
         # Add positions (distribute across accounts)
         if num_positions > 0 and accounts_to_create > 0:
             positions_for_account = num_positions // accounts_to_create + (1 if acct_num <= (num_positions % accounts_to_create) else 0)
+            account_positions = []
             for i in range(positions_for_account):
                 if total_positions >= num_positions:
                     break
                 symbol = instruments[total_positions % len(instruments)]
                 qty = 10.0 * (total_positions + 1)
-                db.positions.add_position(account_id, symbol, qty)
+                account_positions.append((symbol, qty))
                 total_positions += 1
+            # Load the whole account in one statement
+            db.positions.upsert_many(account_id, account_positions)
     
     # Create job
     job_data = {
@@ -207,7 +210,7 @@ async def run_scale_test():
     print("\n📊 Detailed Results:")
     db = Database()
     for user in all_users:
-        job = db.jobs.find_by_id(user['job_id'])
+        job = db.jobs.find_with_payloads(user['job_id'])
         if job['status'] == 'completed':
             report_size = 0
             if job.get('report_payload'):
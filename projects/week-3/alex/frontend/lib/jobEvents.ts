@@ -0,0 +1,96 @@
+/**
+ * Live job progress from the API's server-sent event stream
+ * (GET /api/jobs/{id}/events). Read with fetch rather than EventSource so the
+ * Clerk token can be sent; each response is resumed with Last-Event-ID until
+ * the job completes or fails, so no event is delivered twice.
+ */
+
+import { API_URL } from './config';
+
+export interface JobEvent {
+  id: number | null;
+  event: string;
+  data: Record<string, any>;  // eslint-disable-line @typescript-eslint/no-explicit-any
+}
+
+const TERMINAL_EVENTS = ['completed', 'failed'];
+
+function parseEvent(block: string): { event: JobEvent | null; retry?: number } {
+  let id: number | null = null;
+  let event = '';
+  let data = '';
+  let retry: number | undefined;
+
+  for (const line of block.split('\n')) {
+    const separator = line.indexOf(':');
+    if (separator <= 0) continue;  // Comments (keepalives) start with ':'
+    const field = line.slice(0, separator);
+    const value = line.slice(separator + 1).replace(/^ /, '');
+    if (field === 'id') id = Number(value);
+    else if (field === 'event') event = value;
+    else if (field === 'data') data += value;
+    else if (field === 'retry') retry = Number(value);
+  }
+
+  if (!event) return { event: null, retry };
+  return { event: { id, event, data: data ? JSON.parse(data) : {} }, retry };
+}
+
+/**
+ * Deliver a job's events to onEvent until it completes or fails, or the
+ * signal is aborted
+ */
+export async function streamJobEvents(
+  jobId: string,
+  getToken: () => Promise<string | null>,
+  onEvent: (event: JobEvent) => void,
+  signal: AbortSignal
+): Promise<void> {
+  let lastEventId = 0;
+  let retryMs = 1000;
+
+  while (!signal.aborted) {
+    try {
+      const token = await getToken();
+      const response = await fetch(`${API_URL}/api/jobs/${jobId}/events`, {
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Accept': 'text/event-stream',
+          'Last-Event-ID': String(lastEventId)
+        },
+        signal
+      });
+      if (!response.ok || !response.body) {
+        throw new Error(`Job event stream returned ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary = buffer.indexOf('\n\n');
+        while (boundary !== -1) {
+          const { event, retry } = parseEvent(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          boundary = buffer.indexOf('\n\n');
+
+          if (retry) retryMs = retry;
+          if (!event) continue;
+          if (event.id !== null) lastEventId = event.id;
+          onEvent(event);
+          if (TERMINAL_EVENTS.includes(event.event)) return;
+        }
+      }
+    } catch (error) {
+      if (signal.aborted) return;
+      console.error('Error reading job events:', error);
+    }
+
+    // The response ended before the job did: reconnect after the server's retry delay
+    await new Promise(resolve => setTimeout(resolve, retryMs));
+  }
+}
@@ -4,6 +4,7 @@ import { useAuth } from '@clerk/nextjs';
 import Layout from '../components/Layout';
 import { API_URL } from '../lib/config';
 import { emitAnalysisCompleted, emitAnalysisFailed, emitAnalysisStarted } from '../lib/events';
+import { JobEvent, streamJobEvents } from '../lib/jobEvents';
 import Head from 'next/head';
 
 interface Agent {
@@ -75,7 +76,6 @@ export default function AdvisorTeam() {
     message: '',
     activeAgents: []
   });
-  const [pollInterval, setPollInterval] = useState<NodeJS.Timeout | null>(null);
 
   useEffect(() => {
     fetchJobs();
@@ -83,79 +83,81 @@ export default function AdvisorTeam() {
   }, []);
 
   useEffect(() => {
-    const checkJobStatusLocal = async (jobId: string) => {
-      try {
-        const token = await getToken();
-        const response = await fetch(`${API_URL}/api/jobs/${jobId}`, {
-          headers: {
-            'Authorization': `Bearer ${token}`
-          }
-        });
-
-        if (response.ok) {
-          const job = await response.json();
-
-          if (job.status === 'completed') {
-            setProgress({
-              stage: 'complete',
-              message: 'Analysis complete!',
-              activeAgents: []
-            });
-
-            if (pollInterval) {
-              clearInterval(pollInterval);
-              setPollInterval(null);
-            }
-
-            // Emit completion event so other components can refresh
-            emitAnalysisCompleted(jobId);
-
-            // Also refresh our own jobs list
-            fetchJobs();
-
-            setTimeout(() => {
-              router.push(`/analysis?job_id=${jobId}`);
-            }, 1500);
-          } else if (job.status === 'failed') {
-            setProgress({
-              stage: 'error',
-              message: 'Analysis failed',
-              activeAgents: [],
-              error: job.error || 'Analysis encountered an error'
-            });
-
-            if (pollInterval) {
-              clearInterval(pollInterval);
-              setPollInterval(null);
-            }
-
-            // Emit failure event
-            emitAnalysisFailed(jobId, job.error);
-
-            setIsAnalyzing(false);
-            setCurrentJobId(null);
-          }
-        }
-      } catch (error) {
-        console.error('Error checking job status:', error);
-      }
+    if (!currentJobId) return;
+    const jobId = currentJobId;
+    const controller = new AbortController();
+    const parallelAgents = ['Portfolio Analyst', 'Chart Specialist', 'Retirement Planner'];
+    const finishedAgents: Record<string, string> = {
+      reporter_done: 'Portfolio Analyst',
+      charter_done: 'Chart Specialist',
+      retirement_done: 'Retirement Planner'
     };
+    let remainingAgents = parallelAgents;
 
-    if (currentJobId && !pollInterval) {
-      const interval = setInterval(() => {
-        checkJobStatusLocal(currentJobId);
-      }, 2000);
-      setPollInterval(interval);
-    }
+    const handleEvent = (event: JobEvent) => {
+      switch (event.event) {
+        case 'started':
+        case 'tagging':
+        case 'pricing':
+          setProgress({
+            stage: 'planner',
+            message: event.event === 'tagging' ? 'Classifying new holdings...'
+              : event.event === 'pricing' ? 'Updating market prices...'
+              : 'Financial Planner coordinating analysis...',
+            activeAgents: ['Financial Planner']
+          });
+          break;
+        case 'analyzing':
+        case 'reporter_done':
+        case 'charter_done':
+        case 'retirement_done':
+          remainingAgents = remainingAgents.filter(name => name !== finishedAgents[event.event]);
+          setProgress({
+            stage: 'parallel',
+            message: 'Agents working in parallel...',
+            activeAgents: remainingAgents
+          });
+          break;
+        case 'completed':
+          setProgress({
+            stage: 'complete',
+            message: 'Analysis complete!',
+            activeAgents: []
+          });
 
-    return () => {
-      if (pollInterval) {
-        clearInterval(pollInterval);
-        setPollInterval(null);
+          // Emit completion event so other components can refresh
+          emitAnalysisCompleted(jobId);
+
+          // Also refresh our own jobs list
+          fetchJobs();
+
+          setTimeout(() => {
+            router.push(`/analysis?job_id=${jobId}`);
+          }, 1500);
+          break;
+        case 'failed':
+          setProgress({
+            stage: 'error',
+            message: 'Analysis failed',
+            activeAgents: [],
+            error: event.data.error || 'Analysis encountered an error'
+          });
+
+          // Emit failure event
+          emitAnalysisFailed(jobId, event.data.error);
+
+          setIsAnalyzing(false);
+          setCurrentJobId(null);
+          break;
       }
     };
+
+    // Progress is pushed by the job's event stream instead of polled
+    streamJobEvents(jobId, getToken, handleEvent, controller.signal);
+
+    return () => controller.abort();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [currentJobId, pollInterval, router]);
+  }, [currentJobId, router]);
 
   const fetchJobs = async () => {
     try {
@@ -209,14 +211,6 @@ export default function AdvisorTeam() {
           message: 'Financial Planner coordinating analysis...',
           activeAgents: ['Financial Planner']
         });
-
-        setTimeout(() => {
-          setProgress({
-            stage: 'parallel',
-            message: 'Agents working in parallel...',
-            activeAgents: ['Portfolio Analyst', 'Chart Specialist', 'Retirement Planner']
-          });
-        }, 5000);
       } else {
         throw new Error('Failed to start analysis');
       }
@@ -145,6 +145,15 @@ resource "aws_iam_role_policy" "lambda_agents_policy" {
           "arn:aws:s3:::${var.vector_bucket}/*"
         ]
       },
+      # Large job payloads (reports, charts, projections) offloaded from Aurora
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject"
+        ]
+        Resource = "${aws_s3_bucket.job_payloads.arn}/*"
+      },
       # S3 Vectors API access for all agents
       {
         Effect = "Allow"
@@ -198,6 +207,25 @@ resource "aws_s3_bucket" "lambda_packages" {
   }
 }
 
+# S3 bucket for job payloads too large to keep inline in the jobs table
+resource "aws_s3_bucket" "job_payloads" {
+  bucket = "alex-job-payloads-${data.aws_caller_identity.current.account_id}"
+
+  tags = {
+    Project = "alex"
+    Part    = "6"
+  }
+}
+
+resource "aws_s3_bucket_public_access_block" "job_payloads" {
+  bucket = aws_s3_bucket.job_payloads.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
 # Upload Lambda packages to S3
 resource "aws_s3_object" "lambda_packages" {
   for_each = toset(["planner", "tagger", "reporter", "charter", "retirement"])
@@ -242,6 +270,8 @@ resource "aws_lambda_function" "planner" {
       BEDROCK_MODEL_ID   = var.bedrock_model_id
       BEDROCK_REGION     = var.bedrock_region
       DEFAULT_AWS_REGION = var.aws_region
+      JOB_PAYLOAD_BUCKET = aws_s3_bucket.job_payloads.id
+      JOB_EVENTS_BROKER  = "database"
       SAGEMAKER_ENDPOINT = var.sagemaker_endpoint
       POLYGON_API_KEY    = var.polygon_api_key
       POLYGON_PLAN       = var.polygon_plan
@@ -332,6 +362,8 @@ resource "aws_lambda_function" "reporter" {
       BEDROCK_MODEL_ID   = var.bedrock_model_id
       BEDROCK_REGION     = var.bedrock_region
       DEFAULT_AWS_REGION = var.aws_region
+      JOB_PAYLOAD_BUCKET = aws_s3_bucket.job_payloads.id
+      JOB_EVENTS_BROKER  = "database"
       SAGEMAKER_ENDPOINT = var.sagemaker_endpoint
       # LangFuse observability (optional)
       LANGFUSE_PUBLIC_KEY = var.langfuse_public_key
@@ -373,6 +405,8 @@ resource "aws_lambda_function" "charter" {
       BEDROCK_MODEL_ID   = var.bedrock_model_id
       BEDROCK_REGION     = var.bedrock_region
       DEFAULT_AWS_REGION = var.aws_region
+      JOB_PAYLOAD_BUCKET = aws_s3_bucket.job_payloads.id
+      JOB_EVENTS_BROKER  = "database"
       # LangFuse observability (optional)
       LANGFUSE_PUBLIC_KEY = var.langfuse_public_key
       LANGFUSE_SECRET_KEY = var.langfuse_secret_key
@@ -413,6 +447,8 @@ resource "aws_lambda_function" "retirement" {
       BEDROCK_MODEL_ID   = var.bedrock_model_id
       BEDROCK_REGION     = var.bedrock_region
       DEFAULT_AWS_REGION = var.aws_region
+      JOB_PAYLOAD_BUCKET = aws_s3_bucket.job_payloads.id
+      JOB_EVENTS_BROKER  = "database"
       # LangFuse observability (optional)
       LANGFUSE_PUBLIC_KEY = var.langfuse_public_key
       LANGFUSE_SECRET_KEY = var.langfuse_secret_key
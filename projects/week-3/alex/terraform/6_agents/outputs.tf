@@ -8,6 +8,16 @@ output "sqs_queue_arn" {
   value       = aws_sqs_queue.analysis_jobs.arn
 }
 
+output "job_payload_bucket" {
+  description = "S3 bucket holding offloaded job payloads"
+  value       = aws_s3_bucket.job_payloads.id
+}
+
+output "job_payload_bucket_arn" {
+  description = "ARN of the job payload bucket"
+  value       = aws_s3_bucket.job_payloads.arn
+}
+
 output "lambda_functions" {
   description = "Names of deployed Lambda functions"
   value = {
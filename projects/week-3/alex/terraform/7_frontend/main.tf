@@ -166,6 +166,23 @@ resource "aws_iam_role_policy" "api_lambda_sqs" {
   })
 }
 
+# Policy for reading offloaded job payloads
+resource "aws_iam_role_policy" "api_lambda_payloads" {
+  name = "${local.name_prefix}-api-lambda-payloads"
+  role = aws_iam_role.api_lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = "s3:GetObject"
+        Resource = "${data.terraform_remote_state.agents.outputs.job_payload_bucket_arn}/*"
+      }
+    ]
+  })
+}
+
 # Policy for Lambda invoke (for testing agents directly)
 resource "aws_iam_role_policy" "api_lambda_invoke" {
   name = "${local.name_prefix}-api-lambda-invoke"
@@ -213,6 +230,12 @@ resource "aws_lambda_function" "api" {
       # SQS configuration from Part 6
       SQS_QUEUE_URL = data.terraform_remote_state.agents.outputs.sqs_queue_url
 
+      # Offloaded job payloads from Part 6
+      JOB_PAYLOAD_BUCKET = data.terraform_remote_state.agents.outputs.job_payload_bucket
+
+      # Job progress events written by the agents, streamed to the browser
+      JOB_EVENTS_BROKER = "database"
+
       # Clerk configuration for JWT validation
       CLERK_JWKS_URL = var.clerk_jwks_url
       CLERK_ISSUER   = var.clerk_issuer